@@ -33,7 +33,7 @@ form.addEventListener("submit", async (event) => {
   }
 
   try {
-    const url = `${API_BASE_URL}/ask`;
+    const url = `${API_BASE_URL}/ask/stream`;
     const response = await fetch(url, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
@@ -44,8 +44,7 @@ form.addEventListener("submit", async (event) => {
       throw new Error(body.detail || `Request failed (${response.status})`);
     }
 
-    const data = await response.json();
-    renderResult(data);
+    await readEventStream(response, handleStreamEvent);
   } catch (error) {
     showError(error.message || "Unexpected error while calling API.");
   } finally {
@@ -53,6 +52,47 @@ form.addEventListener("submit", async (event) => {
   }
 });
 
+// Server-sent events over fetch (EventSource cannot POST a JSON body).
+async function readEventStream(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const event = (frame.match(/^event: (.*)$/m) || [])[1];
+      const data = (frame.match(/^data: (.*)$/m) || [])[1];
+      if (event && data) {
+        onEvent(event, JSON.parse(data));
+      }
+      boundary = buffer.indexOf("\n\n");
+    }
+    if (done) {
+      return;
+    }
+  }
+}
+
+function handleStreamEvent(event, data) {
+  if (event === "plan") {
+    submitBtn.textContent = "Searching evidence...";
+  } else if (event === "evidence") {
+    submitBtn.textContent = `Writing answer (${data.reranked} sources)...`;
+  } else if (event === "token") {
+    answerEl.textContent += data.text;
+    resultPanel.classList.remove("hidden");
+  } else if (event === "result") {
+    // The final answer is authoritative (e.g. a guardrail block replaces streamed text).
+    renderResult(data);
+  } else if (event === "error") {
+    throw new Error(data.detail || "Unexpected error while calling API.");
+  }
+}
+
 function renderResult(data) {
   answerEl.textContent = data.answer || "";
   renderDetail(
@@ -85,6 +125,8 @@ fySelect.disabled = fyAll.checked;
 
 function hideOutputs() {
   resultPanel.classList.add("hidden");
+  answerEl.textContent = "";
+  confidenceEl.textContent = "-";
   applicabilityEl.classList.add("hidden");
   uncertaintyEl.classList.add("hidden");
 }
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark cascade rerank against the full cross-encoder reranker.
+
+Run from the repo root (needs the same env/artifacts as the API):
+    python -m scripts.benchmark_rerank_cascade [--top-n 8] [--repeats 3]
+
+For every demo query, both rerankers score the same retrieved candidates.
+The full reranker's ordering is the reference: its top-N hits get graded
+relevance (N for rank 1 down to 1 for rank N), and the cascade ordering is
+scored with nDCG@N against it. Latency is wall-clock rerank time. The rerank
+score cache is disabled, so every repeat pays for its cross-encoder pairs.
+"""
+
+import argparse
+import math
+import re
+import statistics
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from src.agents.core.config import AgentConfig
+from src.agents.specialists.service import Specialists
+
+DEMO_QUERIES = Path(__file__).resolve().parent / "demo_queries.md"
+
+
+def load_queries() -> list[str]:
+    return re.findall(r"^- `(.+)`$", DEMO_QUERIES.read_text(encoding="utf-8"), flags=re.MULTILINE)
+
+
+def ndcg_at_k(ranked_ids: list[str], reference_ids: list[str], k: int) -> float:
+    gains = {chunk_id: k - idx for idx, chunk_id in enumerate(reference_ids[:k])}
+    dcg = sum(gains.get(chunk_id, 0) / math.log2(idx + 2) for idx, chunk_id in enumerate(ranked_ids[:k]))
+    ideal = sum((k - idx) / math.log2(idx + 2) for idx in range(min(k, len(reference_ids))))
+    return dcg / ideal if ideal else 1.0
+
+
+def timed_rerank(specialists: Specialists, query: str, hits, top_n: int, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        reranked = specialists.rerank(query, hits, top_n)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return reranked, statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top-n", type=int, default=8, help="rerank depth compared by nDCG (synthesis evidence size)")
+    parser.add_argument("--repeats", type=int, default=3, help="reranks per query; median latency is reported")
+    args = parser.parse_args()
+
+    load_dotenv()
+    base = AgentConfig.from_env()
+    full = Specialists(base.model_copy(update={"cascade_rerank_enabled": False, "rerank_cache_enabled": False}))
+    cascade = Specialists(base.model_copy(update={"cascade_rerank_enabled": True, "rerank_cache_enabled": False}))
+    # Share loaded models so both rerankers see identical weights and warm caches.
+    cascade._collection = full._get_collection()
+    cascade._cross_encoder = full._get_cross_encoder()
+
+    rows = []
+    for query in load_queries():
+        hits = full.retrieve(query, base.top_k)
+        reference, full_ms = timed_rerank(full, query, hits, args.top_n, args.repeats)
+        candidate, cascade_ms = timed_rerank(cascade, query, hits, args.top_n, args.repeats)
+        ndcg = ndcg_at_k(candidate.chunk_ids, reference.chunk_ids, args.top_n)
+        rows.append((full_ms, cascade_ms, ndcg, candidate.rerank_cascade or {}))
+        print(
+            f"full={full_ms:7.1f}ms cascade={cascade_ms:7.1f}ms ndcg@{args.top_n}={ndcg:.3f} "
+            f"{candidate.rerank_cascade} | {query[:60]}"
+        )
+
+    if rows:
+        full_total = sum(row[0] for row in rows)
+        cascade_total = sum(row[1] for row in rows)
+        print(
+            f"\nqueries={len(rows)} full_median={statistics.median(row[0] for row in rows):.1f}ms "
+            f"cascade_median={statistics.median(row[1] for row in rows):.1f}ms "
+            f"speedup={full_total / cascade_total if cascade_total else float('nan'):.2f}x "
+            f"mean_ndcg@{args.top_n}={statistics.mean(row[2] for row in rows):.3f} "
+            f"early_exits={sum(bool(row[3].get('early_exit')) for row in rows)}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
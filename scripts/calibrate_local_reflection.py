@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Calibrate the local reflection band against LLM reflection confidences.
+
+Run from the repo root (needs OPENAI_API_KEY and a populated Milvus):
+    python -m scripts.calibrate_local_reflection [--queries FILE] [--output CSV]
+
+Each query is planned, retrieved, reranked and synthesized once. Then both
+the local scorer and the reflection LLM assess the same answer. The report
+sweeps the high/low thresholds. A local decision "agrees" when a local `ok`
+lands in the LLM's high band (>= AGENT_CONFIDENCE_STRONG), or a local
+`low_coverage` lands below AGENT_CONFIDENCE_LOW. Pick the widest band whose
+agreement you accept, then set AGENT_LOCAL_REFLECTION_HIGH_THRESHOLD / _LOW_THRESHOLD.
+"""
+
+import argparse
+import csv
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from src.agents.core.config import AgentConfig
+from src.agents.core.manager import Manager
+from src.agents.core.types import UserQuery
+from src.agents.planner.service import PlannerAI
+from src.agents.specialists.local_reflection import LocalReflectionScorer
+from src.agents.specialists.service import Specialists
+
+# Mirrors scripts/demo_queries.md plus narrower single-scheme questions, so both ends of the band are exercised.
+DEFAULT_QUERIES = [
+    "What are FY2025 productivity measures?",
+    "How did healthcare priorities change before vs after COVID?",
+    "I am a policy researcher. Show productivity-support trends since FY2020 and compare how measure design has shifted over time.",
+    "I am an unhappy citizen and I feel FY2025 benefits are unfair. Explain which productivity-related measures target ordinary workers versus businesses.",
+    "Someone earning 80k, no home ownership, staying in hdb (parents owned) - How much cash payout received over the years",
+    "GST Voucher U-Save for HDB households in FY2024",
+    "CDC vouchers FY2025",
+    "SkillsFuture credit top up for mid-career workers",
+    "Majulah Package for seniors",
+    "Carbon tax rate path from FY2024",
+    "Jobs Growth Incentive extension FY2023",
+    "Support for SMEs facing rising costs in FY2022",
+]
+HIGH_THRESHOLDS = (0.7, 0.75, 0.8, 0.85, 0.9)
+LOW_THRESHOLDS = (0.2, 0.25, 0.3, 0.35, 0.4)
+
+
+def collect(config: AgentConfig, queries: list[str]) -> list[dict]:
+    config = config.model_copy(update={"local_reflection_enabled": False})  # every answer also gets an LLM reflection
+    planner = PlannerAI(config)
+    specialists = Specialists(config)
+    manager = Manager(config)
+    scorer = LocalReflectionScorer(
+        support_overlap=config.local_reflection_support_overlap,
+        corpus_earliest_fy=config.corpus_earliest_fy,
+        corpus_latest_fy=config.corpus_latest_fy,
+    )
+    rows = []
+    for query in queries:
+        plan = planner.build_plan(UserQuery(query=query))
+        if plan.coherence == "incoherent":
+            continue
+        hits = manager._retrieve(plan, specialists, None)
+        reranked = specialists.rerank(plan.revised_query, hits, plan.top_n)
+        answer = specialists.synthesize(plan.original_query, plan.revised_query, reranked)
+        llm = specialists.reflect(plan.original_query, plan.revised_query, answer, reranked)
+        signals = scorer.signals(plan.original_query, plan.revised_query, answer, reranked)
+        rows.append(
+            {
+                "query": query,
+                "local_score": round(signals.score, 4),
+                "llm_confidence": llm.confidence,
+                "llm_reason": llm.reason,
+                "sentence_support": round(signals.sentence_support, 4),
+                "citation_grounding": round(signals.citation_grounding, 4),
+                "year_coverage": round(signals.year_coverage, 4),
+            }
+        )
+        print(f"local={signals.score:.2f} llm={llm.confidence:.2f} | {query[:70]}")
+    return rows
+
+
+def report(config: AgentConfig, rows: list[dict]) -> None:
+    if not rows:
+        print("no coherent samples")
+        return
+    local = [row["local_score"] for row in rows]
+    llm = [row["llm_confidence"] for row in rows]
+    mean_local, mean_llm = sum(local) / len(rows), sum(llm) / len(rows)
+    cov = sum((a - mean_local) * (b - mean_llm) for a, b in zip(local, llm))
+    var = (sum((a - mean_local) ** 2 for a in local) * sum((b - mean_llm) ** 2 for b in llm)) ** 0.5
+    print(f"\nsamples={len(rows)} pearson={cov / var if var else 0.0:.3f}")
+    print(f"{'high':>5} {'low':>5} {'skip_rate':>9} {'agreement':>9} {'mean_abs_err':>12}")
+    for high in HIGH_THRESHOLDS:
+        for low in LOW_THRESHOLDS:
+            decided = [
+                (row, row["llm_confidence"] >= config.confidence_strong)
+                for row in rows
+                if row["local_score"] >= high
+            ] + [
+                (row, row["llm_confidence"] < config.confidence_low)
+                for row in rows
+                if row["local_score"] <= low
+            ]
+            agree = sum(ok for _, ok in decided)
+            error = sum(abs(row["local_score"] - row["llm_confidence"]) for row, _ in decided)
+            print(
+                f"{high:>5.2f} {low:>5.2f} {len(decided) / len(rows):>9.2f} "
+                f"{agree / len(decided) if decided else 1.0:>9.2f} {error / len(decided) if decided else 0.0:>12.3f}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=Path, help="one query per line (default: built-in sample set)")
+    parser.add_argument("--output", type=Path, help="write per-query scores as CSV")
+    args = parser.parse_args()
+
+    load_dotenv()
+    config = AgentConfig.from_env()
+    queries = DEFAULT_QUERIES
+    if args.queries:
+        queries = [line.strip() for line in args.queries.read_text(encoding="utf-8").splitlines() if line.strip()]
+    rows = collect(config, queries)
+    if args.output and rows:
+        with args.output.open("w", encoding="utf-8", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    report(config, rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
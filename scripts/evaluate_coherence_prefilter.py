@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Evaluate the local coherence pre-filter on labelled sample queries.
+
+Run from the repo root (needs `artifacts/bm25_model.pkl`):
+    python -m scripts.evaluate_coherence_prefilter [--verbose]
+
+The pre-filter only makes one decision: reject locally as incoherent.
+Precision is therefore the number that matters, since a false reject turns
+a real question into a clarification reply. Recall is the share of gibberish
+that skips the planner LLM call. Everything else goes to the LLM as before.
+"""
+
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from src.agents.core.config import AgentConfig
+from src.agents.planner.prefilter import CoherencePrefilter
+
+BM25_ARTIFACT = Path("artifacts") / "bm25_model.pkl"
+
+# (query, is_gibberish). Coherent samples mix demo-style questions, acronyms,
+# typos, terse keyword queries and other languages; they must never be rejected locally.
+LABELLED_QUERIES = [
+    ("blorb flarq 2025 ???", True),
+    ("???", True),
+    ("!!! ... ???", True),
+    ("asdfghjkl qwerty", True),
+    ("xkcdqwrt zzzzz", True),
+    ("the blorb of flarq", True),
+    ("lorem ipsum dolor sit amet", True),
+    ("zorp glimmax vrrrrt 2023", True),
+    ("flibber jabberwock snorkel quux", True),
+    ("what is blorb flarq", True),  # ambiguous on purpose: expected to defer to the LLM
+    ("What are FY2025 productivity measures?", False),
+    ("How did healthcare priorities change before vs after COVID?", False),
+    ("GSTV U-Save", False),
+    ("CDC vouchers?", False),
+    ("SkillsFuture credit top up", False),
+    ("Jobs Growth Incentive", False),
+    ("wat r the budgt mesures 4 smes", False),
+    ("2025", False),
+    ("hello", False),
+    ("Assurance Package cash payout for seniors", False),
+    ("Someone earning 80k, no home ownership, staying in hdb (parents owned) - How much cash payout received over the years", False),
+    ("I am an unhappy citizen and I feel FY2025 benefits are unfair.", False),
+    ("Compare carbon tax revenue 2022 vs 2024", False),
+    ("Majulah Package", False),
+    # Non-English questions: the vocabulary is English-only, so these must always defer to the LLM.
+    ("预算措施", False),
+    ("2025年预算对老年人有什么援助？", False),
+    ("Bantuan untuk warga emas dalam Bajet 2025", False),
+    ("Apakah bantuan GST Voucher untuk isi rumah HDB?", False),
+    ("Quelles sont les mesures du budget 2025 pour les seniors ?", False),
+    ("Aide à l'emploi pour les PME en 2024", False),
+    ("வரவு செலவுத் திட்டம் 2025 உதவி", False),
+    # Latin-script questions without English words, and typo-heavy English: plausible letters, so deferred.
+    ("Bantuan warga emas Bajet 2025", False),
+    ("Bajet 2025 bantuan tunai", False),
+    ("Ayuda presupuesto jubilados 2025", False),
+    ("Hilfe Rentner Haushalt", False),
+    ("wat iz teh bugdet mesures", False),
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="print every verdict, not only mistakes")
+    args = parser.parse_args()
+
+    load_dotenv()
+    config = AgentConfig.from_env()
+    prefilter = CoherencePrefilter.from_artifact(
+        BM25_ARTIFACT,
+        min_vocab_ratio=config.coherence_prefilter_min_vocab_ratio,
+        min_idf_mass=config.coherence_prefilter_min_idf_mass,
+    )
+    if prefilter.bm25_encoder is None:
+        print(f"warning: {BM25_ARTIFACT} not found; character statistics only")
+
+    true_rejects = false_rejects = gibberish = 0
+    for query, is_gibberish in LABELLED_QUERIES:
+        verdict = prefilter.assess(query)
+        gibberish += is_gibberish
+        true_rejects += verdict.incoherent and is_gibberish
+        false_rejects += verdict.incoherent and not is_gibberish
+        mistake = verdict.incoherent and not is_gibberish
+        if args.verbose or mistake:
+            label = "FALSE REJECT" if mistake else ("reject" if verdict.incoherent else "defer")
+            signal = verdict.signal
+            print(
+                f"{label:12} reason={verdict.reason} vocab_ratio={signal.vocab_ratio:.2f} "
+                f"idf_mass={signal.idf_mass:.2f} | {query[:70]}"
+            )
+
+    rejects = true_rejects + false_rejects
+    print(
+        f"\nsamples={len(LABELLED_QUERIES)} gibberish={gibberish} rejected={rejects} "
+        f"precision={true_rejects / rejects if rejects else 1.0:.3f} "
+        f"recall={true_rejects / gibberish if gibberish else 0.0:.3f} "
+        f"llm_calls_saved={rejects}/{len(LABELLED_QUERIES)}"
+    )
+    return 1 if false_rejects else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
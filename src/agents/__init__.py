@@ -1,6 +1,7 @@
 """Public re-exports for convenient imports; __all__ defines the intended API."""
 
 from .core.config import AgentConfig
+from .core.hit_batch import HitBatch
 from .core.manager import Manager
 from .planner.service import PlannerAI
 from .specialists.service import MCPReadinessError, Specialists
@@ -20,6 +21,7 @@ __all__ = [
     "AgentConfig",
     "ExecutionPlan",
     "GuardrailsViolationError",
+    "HitBatch",
     "MCPReadinessError",
     "Manager",
     "ManagerAI",
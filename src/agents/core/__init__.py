@@ -1,6 +1,7 @@
 """Core orchestration contracts and manager state machine."""
 
 from .config import AgentConfig
+from .hit_batch import HitBatch
 from .manager import Manager
 from .types import (
     ExecutionPlan,
@@ -16,6 +17,7 @@ ManagerAI = Manager
 __all__ = [
     "AgentConfig",
     "ExecutionPlan",
+    "HitBatch",
     "Manager",
     "ManagerAI",
     "OrchestrationResult",
@@ -37,19 +37,43 @@ class AgentConfig(BaseSettings):
 
     Config usage map (selected):
     - top_k/top_n/rerank_candidate_limit: specialists/retrieval.py, specialists/rerank.py, core/manager.py
-    - recent_year_window: planner/service.py, specialists/retrieval.py, specialists/rerank.py
-    - corpus_latest_fy: specialists/retrieval.py, specialists/rerank.py
+    - recent_year_window: planner/service.py, specialists/retrieval.py, specialists/rerank.py, mcp/partitions.py
+    - corpus_latest_fy: specialists/retrieval.py, specialists/rerank.py, planner/analyzer.py
+    - corpus_earliest_fy/query_analyzer_enabled: planner/service.py, planner/analyzer.py, api/service.py (cache scope)
     - retrieve_recency_boost: specialists/retrieval.py
     - rerank_recency_boost: specialists/rerank.py
     - confidence_*: core/manager.py
     - planner_model/temperature: planner/service.py
+    - planner_cache_*: api/service.py, runtime.py, planner/cache.py (temperature 0 only)
+    - coherence_prefilter_*: api/service.py, runtime.py, planner/prefilter.py (local gibberish reject)
     - synthesis_model/temperature: specialists/service.py, specialists/synthesis.py
     - reflection_model/temperature: specialists/service.py, specialists/reflection.py
+    - local_reflection_*: specialists/service.py, specialists/local_reflection.py (skip clear-cut reflection LLM calls)
     - embedding_model: specialists/retrieval.py
     - cross_encoder_model: specialists/rerank.py
     - hybrid_merge_strategy/hybrid_rrf_k: specialists/retrieval.py
-    - mcp_*: specialists/service.py, mcp/tools.py
+    - fy_filtering_enabled/fy_partitions_*: specialists/service.py, specialists/retrieval.py
+    - mcp_*: specialists/service.py, mcp/tools.py (mcp_timeout_seconds also bounds Milvus pool waits and LLM calls)
+    - milvus_pool_size/milvus_max_in_flight/milvus_consistency_level: specialists/service.py, mcp/pool.py
+    - inference_*: specialists/service.py, mcp/inference.py (embed/score worker processes)
+    - llm_max_*: mcp/llm_clients.py (shared planner/synthesis/reflection HTTP pool; timeout is mcp_timeout_seconds)
+    - batch_*: core/manager.py (run_many), api/service.py (ask_batch)
+    - async_offload_workers: specialists/service.py (run_blocking for Manager.arun / async POST /ask, fan-out slices)
+    - speculative_*: core/manager.py, core/speculation.py
+    - request_deadline_*/deadline_*: core/manager.py, core/deadline.py (stage budgets and degradations)
+    - adaptive_*: specialists/service.py, specialists/adaptive.py
+    - compaction_*: specialists/service.py, specialists/compaction.py
+    - rerank_cache_*: specialists/service.py, specialists/rerank.py, specialists/score_cache.py
+    - cascade_*: specialists/service.py, specialists/rerank.py, specialists/cascade.py
+    - rerank_microbatch_*: specialists/service.py, specialists/microbatch.py
+    - rerank_pretokenize_*: specialists/service.py, specialists/pretokenized.py, mcp/inference.py
+    - docstore_*: specialists/service.py (text hydration), vector_db/docstore.py
+    - fanout_*: planner/service.py (year_slices), specialists/service.py (concurrent sub-retrievals)
+    - semantic_cache_*: api/service.py, api/cache.py
+    - corpus_version: specialists/service.py (answer and rerank cache scoping)
     - guardrails_*: guardrails/service.py
+    - evidence_*: specialists/service.py, specialists/evidence.py (synthesis prompt packing)
+    - stream_guard_window_chars: specialists/synthesis.py (POST /ask/stream output guard windows)
     - langsmith_*: tracing in runtime and langsmith hooks
     """
     model_config = SettingsConfigDict(extra="ignore", case_sensitive=False, populate_by_name=True)
@@ -60,6 +84,8 @@ class AgentConfig(BaseSettings):
     rerank_candidate_limit: int = Field(default=60, alias="AGENT_RERANK_CANDIDATE_LIMIT")  # cap candidates before rerank
     recent_year_window: int = Field(default=5, alias="AGENT_RECENT_YEAR_WINDOW")
     corpus_latest_fy: int = Field(default=2025, alias="AGENT_CORPUS_LATEST_FY")
+    corpus_earliest_fy: int = Field(default=2016, alias="AGENT_CORPUS_EARLIEST_FY")
+    query_analyzer_enabled: bool = Field(default=True, alias="AGENT_QUERY_ANALYZER_ENABLED")  # infer FY/doc_type scope from query text
     retrieve_recency_boost: float = Field(default=0.8, alias="AGENT_RETRIEVE_RECENCY_BOOST")  # multiplicative boost
     rerank_recency_boost: float = Field(default=0.8, alias="AGENT_RERANK_RECENCY_BOOST")  # multiplicative boost
     confidence_strong: float = Field(default=0.80, alias="AGENT_CONFIDENCE_STRONG")
@@ -74,13 +100,113 @@ class AgentConfig(BaseSettings):
     reflection_temperature: float = Field(default=0.0, alias="AGENT_REFLECTION_TEMPERATURE")
     planner_model: str = Field(default="gpt-4o-mini", alias="AGENT_PLANNER_MODEL")
     planner_temperature: float = Field(default=0.0, alias="AGENT_PLANNER_TEMPERATURE")
+    planner_cache_enabled: bool = Field(default=True, alias="AGENT_PLANNER_CACHE_ENABLED")
+    planner_cache_path: str = Field(default="artifacts/planner_cache.sqlite3", alias="AGENT_PLANNER_CACHE_PATH")
+    planner_cache_ttl_seconds: int = Field(default=86400, alias="AGENT_PLANNER_CACHE_TTL_SECONDS")
+    planner_cache_max_entries: int = Field(default=20000, alias="AGENT_PLANNER_CACHE_MAX_ENTRIES")
+    coherence_prefilter_enabled: bool = Field(default=True, alias="AGENT_COHERENCE_PREFILTER_ENABLED")
+    coherence_prefilter_min_vocab_ratio: float = Field(default=0.3, alias="AGENT_COHERENCE_PREFILTER_MIN_VOCAB_RATIO")
+    coherence_prefilter_min_idf_mass: float = Field(default=1.0, alias="AGENT_COHERENCE_PREFILTER_MIN_IDF_MASS")
     embedding_model: str = Field(default="BAAI/bge-base-en-v1.5", alias="AGENT_EMBEDDING_MODEL")
     cross_encoder_model: str = Field(
         default="cross-encoder/ms-marco-MiniLM-L-6-v2", alias="AGENT_CROSS_ENCODER_MODEL"
     )
 
+    # Synthesis evidence packing (query-relevant sentences within a token budget)
+    evidence_packing_enabled: bool = Field(default=True, alias="AGENT_EVIDENCE_PACKING_ENABLED")
+    evidence_token_budget: int = Field(default=2000, alias="AGENT_EVIDENCE_TOKEN_BUDGET")  # estimated prompt tokens
+    evidence_max_sentences_per_chunk: int = Field(default=4, alias="AGENT_EVIDENCE_MAX_SENTENCES_PER_CHUNK")
+
+    # Local reflection scoring (LLM reflection only in the uncertain band)
+    local_reflection_enabled: bool = Field(default=False, alias="AGENT_LOCAL_REFLECTION_ENABLED")
+    local_reflection_high_threshold: float = Field(default=0.8, alias="AGENT_LOCAL_REFLECTION_HIGH_THRESHOLD")
+    local_reflection_low_threshold: float = Field(default=0.3, alias="AGENT_LOCAL_REFLECTION_LOW_THRESHOLD")
+    local_reflection_support_overlap: float = Field(default=0.5, alias="AGENT_LOCAL_REFLECTION_SUPPORT_OVERLAP")  # term share
+
+    # End-to-end request deadline (per-stage budgets, degrade instead of overrunning)
+    request_deadline_enabled: bool = Field(default=False, alias="AGENT_REQUEST_DEADLINE_ENABLED")
+    request_deadline_seconds: float = Field(default=30.0, alias="AGENT_REQUEST_DEADLINE_SECONDS")
+    deadline_planner_seconds: float = Field(default=4.0, alias="AGENT_DEADLINE_PLANNER_SECONDS")
+    deadline_retrieve_seconds: float = Field(default=4.0, alias="AGENT_DEADLINE_RETRIEVE_SECONDS")
+    deadline_rerank_seconds: float = Field(default=3.0, alias="AGENT_DEADLINE_RERANK_SECONDS")
+    deadline_synthesis_seconds: float = Field(default=15.0, alias="AGENT_DEADLINE_SYNTHESIS_SECONDS")  # reserved, not a cap
+    deadline_reflection_seconds: float = Field(default=4.0, alias="AGENT_DEADLINE_REFLECTION_SECONDS")
+    deadline_top_k_shrink_ratio: float = Field(default=0.5, alias="AGENT_DEADLINE_TOP_K_SHRINK_RATIO")
+    deadline_stage_workers: int = Field(default=32, alias="AGENT_DEADLINE_STAGE_WORKERS")  # shared pool for sync stages
+
+    # Speculative retrieval on the original query, in parallel with the planner LLM call
+    speculative_retrieval_enabled: bool = Field(default=False, alias="AGENT_SPECULATIVE_RETRIEVAL_ENABLED")
+    speculative_reuse_similarity: float = Field(default=0.6, alias="AGENT_SPECULATIVE_REUSE_SIMILARITY")  # token Jaccard
+    speculative_max_workers: int = Field(default=8, alias="AGENT_SPECULATIVE_MAX_WORKERS")  # shared speculation pool
+    speculative_merge_diverged: bool = Field(
+        default=False, alias="AGENT_SPECULATIVE_MERGE_DIVERGED"
+    )  # merge finished speculative hits into a diverged revised query's candidates
+
+    # Per-period retrieval fan-out for comparison questions
+    fanout_enabled: bool = Field(default=True, alias="AGENT_FANOUT_ENABLED")
+    fanout_max_slices: int = Field(default=4, alias="AGENT_FANOUT_MAX_SLICES")  # concurrent sub-retrievals per query
+
+    # Local chunk docstore (text hydrated after compaction instead of returned by Milvus)
+    docstore_enabled: bool = Field(default=True, alias="AGENT_DOCSTORE_ENABLED")
+    docstore_path: str = Field(default="artifacts/chunk_docstore", alias="AGENT_DOCSTORE_PATH")
+
+    # Candidate compaction (overlapping neighbour chunks, before rerank)
+    compaction_enabled: bool = Field(default=True, alias="AGENT_COMPACTION_ENABLED")
+    compaction_merge_spans: bool = Field(default=False, alias="AGENT_COMPACTION_MERGE_SPANS")  # widen kept chunk to union span
+    compaction_max_span_words: int = Field(default=800, alias="AGENT_COMPACTION_MAX_SPAN_WORDS")  # cluster width cap
+
+    # Rerank score cache (raw cross-encoder scores per query/chunk pair)
+    rerank_cache_enabled: bool = Field(default=True, alias="AGENT_RERANK_CACHE_ENABLED")
+    rerank_cache_max_entries: int = Field(default=50000, alias="AGENT_RERANK_CACHE_MAX_ENTRIES")  # one float per pair
+
+    # Cross-request micro-batching of cross-encoder predict calls
+    rerank_microbatch_enabled: bool = Field(default=True, alias="AGENT_RERANK_MICROBATCH_ENABLED")
+    rerank_microbatch_max_wait_ms: float = Field(default=4.0, alias="AGENT_RERANK_MICROBATCH_MAX_WAIT_MS")  # batch window
+    rerank_microbatch_max_pairs: int = Field(default=256, alias="AGENT_RERANK_MICROBATCH_MAX_PAIRS")  # pairs per forward pass
+
+    # Passage token-id cache for the cross-encoder (only the query is tokenized per rerank)
+    rerank_pretokenize_enabled: bool = Field(default=True, alias="AGENT_RERANK_PRETOKENIZE_ENABLED")
+    rerank_pretokenize_max_entries: int = Field(default=20000, alias="AGENT_RERANK_PRETOKENIZE_MAX_ENTRIES")
+
+    # Cascade rerank (cheap pre-pruning, batched cross-encoder with early exit)
+    cascade_rerank_enabled: bool = Field(default=False, alias="AGENT_CASCADE_RERANK_ENABLED")
+    cascade_keep_ratio: float = Field(default=0.5, alias="AGENT_CASCADE_KEEP_RATIO")  # share surviving the cheap stage
+    cascade_min_keep: int = Field(default=16, alias="AGENT_CASCADE_MIN_KEEP")
+    cascade_batch_size: int = Field(default=8, alias="AGENT_CASCADE_BATCH_SIZE")  # cross-encoder pairs per step
+    cascade_stable_top_n: int = Field(default=8, alias="AGENT_CASCADE_STABLE_TOP_N")  # set that must be stable to stop
+    cascade_stability_margin: float = Field(default=0.5, alias="AGENT_CASCADE_STABILITY_MARGIN")  # raw score margin
+    cascade_prefilter_model: str = Field(default="", alias="AGENT_CASCADE_PREFILTER_MODEL")  # empty = retrieval scores
+
+    # Adaptive retrieval (skip/shrink the weaker search source per query)
+    adaptive_retrieval_enabled: bool = Field(default=False, alias="AGENT_ADAPTIVE_RETRIEVAL_ENABLED")
+    adaptive_sparse_min_coverage: float = Field(default=0.5, alias="AGENT_ADAPTIVE_SPARSE_MIN_COVERAGE")  # in-vocab term share
+    adaptive_sparse_min_mass: float = Field(default=1.0, alias="AGENT_ADAPTIVE_SPARSE_MIN_MASS")  # summed query idf
+    adaptive_sparse_decisive_idf: float = Field(default=0.8, alias="AGENT_ADAPTIVE_SPARSE_DECISIVE_IDF")  # rarest idf / max idf
+    adaptive_score_gap: float = Field(default=0.2, alias="AGENT_ADAPTIVE_SCORE_GAP")  # relative top-1 vs top-2 gap
+    adaptive_shrink_ratio: float = Field(default=0.5, alias="AGENT_ADAPTIVE_SHRINK_RATIO")  # share of top_k for shrunk source
+
+    # Semantic answer cache (API layer)
+    semantic_cache_enabled: bool = Field(default=True, alias="AGENT_SEMANTIC_CACHE_ENABLED")
+    semantic_cache_threshold: float = Field(default=0.95, alias="AGENT_SEMANTIC_CACHE_THRESHOLD")  # cosine similarity
+    semantic_cache_max_entries: int = Field(default=512, alias="AGENT_SEMANTIC_CACHE_MAX_ENTRIES")
+    semantic_cache_ttl_seconds: int = Field(default=3600, alias="AGENT_SEMANTIC_CACHE_TTL_SECONDS")
+    corpus_version: str = Field(default="", alias="AGENT_CORPUS_VERSION")  # empty = derive from BM25 artifact hash
+
     # Infra & guardrails (rarely tuned)
     milvus_collection: str = Field(default="sg_budget_evidence", alias="AGENT_MILVUS_COLLECTION")
+    milvus_pool_size: int = Field(default=4, alias="AGENT_MILVUS_POOL_SIZE")  # connection aliases (gRPC channels)
+    milvus_max_in_flight: int = Field(default=16, alias="AGENT_MILVUS_MAX_IN_FLIGHT")  # concurrent searches across the pool
+    milvus_consistency_level: str = Field(default="Bounded", alias="AGENT_MILVUS_CONSISTENCY_LEVEL")
+    inference_workers: int = Field(default=0, alias="AGENT_INFERENCE_WORKERS")  # 0 = embed/rerank in the API process
+    inference_threads_per_worker: int = Field(default=2, alias="AGENT_INFERENCE_THREADS_PER_WORKER")  # torch threads
+    inference_max_in_flight: int = Field(default=32, alias="AGENT_INFERENCE_MAX_IN_FLIGHT")  # backpressure limit
+    inference_acquire_timeout_seconds: float = Field(default=0.5, alias="AGENT_INFERENCE_ACQUIRE_TIMEOUT_SECONDS")
+    inference_score_batch_size: int = Field(default=32, alias="AGENT_INFERENCE_SCORE_BATCH_SIZE")  # pairs per forward pass
+    llm_max_connections: int = Field(default=20, alias="AGENT_LLM_MAX_CONNECTIONS")  # shared LLM HTTP pool
+    llm_max_keepalive_connections: int = Field(default=10, alias="AGENT_LLM_MAX_KEEPALIVE_CONNECTIONS")
+    async_offload_workers: int = Field(default=32, alias="AGENT_ASYNC_OFFLOAD_WORKERS")  # async /ask stages + fan-out
+    batch_max_queries: int = Field(default=32, alias="AGENT_BATCH_MAX_QUERIES")  # POST /ask/batch size cap
+    batch_max_concurrency: int = Field(default=4, alias="AGENT_BATCH_MAX_CONCURRENCY")  # parallel plan/synthesis per batch
     mcp_enabled: bool = Field(default=True, alias="AGENT_MCP_ENABLED")
     mcp_strict: bool = Field(default=True, alias="AGENT_MCP_STRICT")
     mcp_timeout_seconds: int = Field(default=60, alias="AGENT_MCP_TIMEOUT_SECONDS")
@@ -91,9 +217,14 @@ class AgentConfig(BaseSettings):
     hybrid_merge_strategy: str = Field(default="rrf", alias="AGENT_HYBRID_MERGE_STRATEGY")
     hybrid_rrf_k: int = Field(default=60, alias="AGENT_HYBRID_RRF_K")  # RRF k; higher flattens rank influence
     fy_filtering_enabled: bool = Field(default=True, alias="AGENT_FY_FILTERING_ENABLED")
+    fy_partitions_enabled: bool = Field(default=True, alias="AGENT_FY_PARTITIONS_ENABLED")  # hot/cold FY partition loading
+    fy_partitions_unscoped_load_all: bool = Field(
+        default=False, alias="AGENT_FY_PARTITIONS_UNSCOPED_LOAD_ALL"
+    )  # year-less queries load every cold partition instead of searching loaded ones
     guardrails_enabled: bool = Field(default=True, alias="AGENT_GUARDRAILS_ENABLED")
     guardrails_input_policy: str = Field(default="block_safe_reply", alias="AGENT_GUARDRAILS_INPUT_POLICY")
     guardrails_output_policy: str = Field(default="block_safe_reply", alias="AGENT_GUARDRAILS_OUTPUT_POLICY")
+    stream_guard_window_chars: int = Field(default=160, alias="AGENT_STREAM_GUARD_WINDOW_CHARS")  # streamed text per guard check
     langsmith_tracing: bool = Field(default=False, alias="LANGCHAIN_TRACING_V2")
     langsmith_project: str = Field(default="sg-budget-rag", alias="LANGCHAIN_PROJECT")
 
@@ -103,8 +234,42 @@ class AgentConfig(BaseSettings):
         "mcp_timeout_seconds",
         "recent_year_window",
         "corpus_latest_fy",
+        "corpus_earliest_fy",
         "rerank_candidate_limit",
         "hybrid_rrf_k",
+        "batch_max_queries",
+        "batch_max_concurrency",
+        "semantic_cache_max_entries",
+        "semantic_cache_ttl_seconds",
+        "planner_cache_ttl_seconds",
+        "planner_cache_max_entries",
+        "milvus_pool_size",
+        "compaction_max_span_words",
+        "fanout_max_slices",
+        "milvus_max_in_flight",
+        "rerank_cache_max_entries",
+        "cascade_min_keep",
+        "cascade_batch_size",
+        "cascade_stable_top_n",
+        "rerank_microbatch_max_pairs",
+        "rerank_pretokenize_max_entries",
+        "inference_threads_per_worker",
+        "inference_max_in_flight",
+        "inference_score_batch_size",
+        "llm_max_connections",
+        "llm_max_keepalive_connections",
+        "async_offload_workers",
+        "evidence_token_budget",
+        "evidence_max_sentences_per_chunk",
+        "stream_guard_window_chars",
+        "request_deadline_seconds",
+        "deadline_planner_seconds",
+        "deadline_retrieve_seconds",
+        "deadline_rerank_seconds",
+        "deadline_synthesis_seconds",
+        "deadline_reflection_seconds",
+        "deadline_stage_workers",
+        "speculative_max_workers",
     )
     @classmethod
     def _strictly_positive_ints(cls, value: int) -> int:
@@ -120,6 +285,15 @@ class AgentConfig(BaseSettings):
             raise ValueError("must be 'rrf'")
         return normalized
 
+    @field_validator("milvus_consistency_level")
+    @classmethod
+    def _valid_consistency_level(cls, value: str) -> str:
+        levels = {level.lower(): level for level in ("Strong", "Bounded", "Session", "Eventually")}
+        normalized = levels.get(value.strip().lower())
+        if normalized is None:
+            raise ValueError("must be one of: Strong, Bounded, Session, Eventually")
+        return normalized
+
     @field_validator(
         "confidence_strong",
         "confidence_medium",
@@ -127,6 +301,18 @@ class AgentConfig(BaseSettings):
         "confidence_very_low",
         "retrieve_recency_boost",
         "rerank_recency_boost",
+        "semantic_cache_threshold",
+        "adaptive_sparse_min_coverage",
+        "adaptive_sparse_decisive_idf",
+        "adaptive_score_gap",
+        "adaptive_shrink_ratio",
+        "cascade_keep_ratio",
+        "speculative_reuse_similarity",
+        "coherence_prefilter_min_vocab_ratio",
+        "local_reflection_high_threshold",
+        "local_reflection_low_threshold",
+        "local_reflection_support_overlap",
+        "deadline_top_k_shrink_ratio",
     )
     @classmethod
     def _valid_threshold(cls, value: float) -> float:
@@ -134,6 +320,20 @@ class AgentConfig(BaseSettings):
             raise ValueError("must be in [0, 1]")
         return value
 
+    @field_validator(
+        "cascade_stability_margin",
+        "rerank_microbatch_max_wait_ms",
+        "inference_workers",
+        "inference_acquire_timeout_seconds",
+        "adaptive_sparse_min_mass",
+        "coherence_prefilter_min_idf_mass",
+    )
+    @classmethod
+    def _non_negative(cls, value: float) -> float:
+        if value < 0:
+            raise ValueError("must be >= 0")
+        return value
+
     @field_validator("planner_temperature", "synthesis_temperature", "reflection_temperature")
     @classmethod
     def _valid_temperature(cls, value: float) -> float:
@@ -0,0 +1,116 @@
+"""End-to-end request deadline with per-stage budgets.
+
+Without a deadline, a slow planner, Milvus or OpenAI call makes `/ask` slow
+by however long that call takes. With `AGENT_REQUEST_DEADLINE_ENABLED`, the
+manager time-boxes every stage to `min(stage budget, time left)`. When a stage
+overruns, or the time left no longer covers the stages ahead, it applies a
+planned degradation instead:
+- `planner_timeout`: plan from the original query (no LLM rewrite).
+- `top_k_shrunk`: retrieve `top_k * AGENT_DEADLINE_TOP_K_SHRINK_RATIO` candidates.
+- `rerank_skipped` / `rerank_timeout`: keep retrieval order for the top_n hits.
+- `reflection_skipped` / `reflection_timeout`: confidence from the local
+  evidence-coverage estimate instead of the reflection LLM.
+Retrieval and synthesis cannot be degraded. If either overruns, the request
+ends with `final_reason="deadline_exceeded"`. Synthesis may use all the time
+left, not just its budget.
+
+Degradations show up as `degraded:<name>` entries in `state_history`, and as
+`trace["deadline"]`. Async LLM calls are cancelled on timeout. Sync stages run
+on one process-wide pool of `AGENT_DEADLINE_STAGE_WORKERS` threads. An
+overrunning stage keeps its worker until its client timeout
+(`AGENT_MCP_TIMEOUT_SECONDS`), and stages are cancelled if they time out
+while still queued. When every worker is busy, new stages degrade instead of
+spawning more threads.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_stage_executor: Optional[ThreadPoolExecutor] = None
+_stage_executor_lock = threading.Lock()
+
+
+def stage_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Process-wide pool for time-boxed sync stages; the first caller sizes it."""
+    global _stage_executor
+    with _stage_executor_lock:
+        if _stage_executor is None:
+            _stage_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deadline-stage")
+        return _stage_executor
+
+
+class StageDeadlineExceeded(TimeoutError):
+    def __init__(self, stage: str, timeout_seconds: float):
+        super().__init__(f"{stage} exceeded its {timeout_seconds:.2f}s deadline budget")
+        self.stage = stage
+        self.timeout_seconds = timeout_seconds
+
+
+class RequestDeadline:
+    """Time left for one request, and the degradations taken to stay within it."""
+
+    def __init__(
+        self,
+        total_seconds: float,
+        stage_budgets: Dict[str, float],
+        *,
+        executor: ThreadPoolExecutor,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.total_seconds = total_seconds
+        self.stage_budgets = stage_budgets
+        self.executor = executor
+        self._clock = clock
+        self._started = clock()
+        self.degradations: List[str] = []
+
+    def elapsed(self) -> float:
+        return self._clock() - self._started
+
+    def remaining(self) -> float:
+        return max(0.0, self.total_seconds - self.elapsed())
+
+    def has_time_for(self, *stages: str) -> bool:
+        """True when the time left covers the budgets of `stages`."""
+        return self.remaining() >= sum(self.stage_budgets[stage] for stage in stages)
+
+    def timeout(self, stage: str) -> float:
+        if stage == "synthesis":
+            return self.remaining()  # nothing after synthesis is worth more than the answer itself
+        return min(self.stage_budgets[stage], self.remaining())
+
+    def degrade(self, name: str) -> None:
+        self.degradations.append(name)
+
+    def run(self, stage: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking stage, raising `StageDeadlineExceeded` when it overruns."""
+        timeout = self.timeout(stage)
+        future = self.executor.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            if future.done():
+                raise  # the stage itself raised a TimeoutError
+            future.cancel()  # frees the slot if the stage never started; a running one finishes in the background
+            raise StageDeadlineExceeded(stage, timeout) from None
+
+    async def arun(self, stage: str, awaitable: Awaitable[T]) -> T:
+        """Await a stage, cancelling it and raising `StageDeadlineExceeded` when it overruns."""
+        timeout = self.timeout(stage)
+        try:
+            return await asyncio.wait_for(awaitable, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise StageDeadlineExceeded(stage, timeout) from None
+
+    def trace(self) -> Dict[str, Any]:
+        return {
+            "budget_seconds": self.total_seconds,
+            "elapsed_seconds": round(self.elapsed(), 4),
+            "degradations": list(self.degradations),
+        }
@@ -0,0 +1,346 @@
+"""Columnar hit container that flows through retrieve -> rerank -> synthesize.
+
+Why this exists:
+- Per-hit dataclasses with per-hit metadata dicts scale poorly with top_k.
+- Scores, ranks, and years live in NumPy arrays so RRF, recency boost, and
+  normalization can be vectorized.
+- `RetrievalHit` objects (and their metadata dicts) are only materialized at
+  the API/trace edge, via indexing, iteration, or `to_hits()`.
+"""
+
+import sys
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .types import RetrievalHit
+
+MISSING_YEAR = -1  # sentinel for hits without an integer financial_year
+MISSING_RANK = 0  # ranks are 1-based; 0 means "not returned by this source"
+MISSING_OFFSET = -1  # chunk_start/chunk_end sentinel for hits without word offsets
+
+
+def _intern(value: Any) -> str:
+    return sys.intern(str(value)) if value is not None else ""
+
+
+def _intern_optional(value: Any) -> Optional[str]:
+    return sys.intern(str(value)) if value is not None else None
+
+
+def _optional_rank(value: int) -> Optional[int]:
+    return int(value) if value != MISSING_RANK else None
+
+
+def _optional_score(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def _optional_offset(value: int) -> Optional[int]:
+    return int(value) if value != MISSING_OFFSET else None
+
+
+def _offset_or_missing(value: Any) -> int:
+    return int(value) if isinstance(value, (int, np.integer)) else MISSING_OFFSET
+
+
+@dataclass
+class HitBatch:
+    """Column-oriented batch of retrieval hits.
+
+    Row `i` across every column describes one chunk. Repeated strings
+    (source_path, doc_type) are interned so each distinct value is stored once.
+    """
+
+    chunk_ids: List[str]
+    source_paths: List[str]
+    texts: List[str]
+    doc_types: List[Optional[str]]
+    financial_years: np.ndarray  # int64, MISSING_YEAR when unknown
+    scores: np.ndarray  # float64, current stage score (merged or reranked)
+    merged_scores: np.ndarray  # float64, retrieval-stage RRF (+ recency) score
+    dense_ranks: np.ndarray  # int64, MISSING_RANK when absent
+    dense_scores: np.ndarray  # float64, NaN when absent
+    sparse_ranks: np.ndarray  # int64, MISSING_RANK when absent
+    sparse_scores: np.ndarray  # float64, NaN when absent
+    doc_ids: List[str]  # interned; "" when unknown
+    chunk_starts: np.ndarray  # int64 word offset, MISSING_OFFSET when unknown
+    chunk_ends: np.ndarray  # int64 word offset (exclusive), MISSING_OFFSET when unknown
+    tool: str = ""
+    provider: str = "mcp-local"
+    year_expr: Optional[str] = None
+    retrieval_path: Optional[str] = None  # adaptive retrieval path (specialists/adaptive.py), trace only
+    compacted_rows: int = 0  # overlapping neighbour chunks dropped (specialists/compaction.py), trace only
+    rerank_cached_pairs: int = 0  # pairs scored from the rerank score cache (specialists/score_cache.py), trace only
+    rerank_cascade: Optional[Dict[str, Any]] = None  # pruned/scored/early_exit (specialists/cascade.py), trace only
+    # Only populated when a batch is built from RetrievalHit objects whose metadata
+    # carries keys that have no dedicated column.
+    extra_metadata: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+
+    @classmethod
+    def empty(cls, tool: str = "", year_expr: Optional[str] = None) -> "HitBatch":
+        return cls.from_columns(
+            chunk_ids=[],
+            source_paths=[],
+            texts=[],
+            doc_types=[],
+            financial_years=[],
+            scores=[],
+            tool=tool,
+            year_expr=year_expr,
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        *,
+        chunk_ids: Sequence[str],
+        source_paths: Sequence[Any],
+        texts: Sequence[str],
+        doc_types: Sequence[Any],
+        financial_years: Sequence[Any],
+        scores: Sequence[float],
+        merged_scores: Optional[Sequence[float]] = None,
+        dense_ranks: Optional[Sequence[int]] = None,
+        dense_scores: Optional[Sequence[float]] = None,
+        sparse_ranks: Optional[Sequence[int]] = None,
+        sparse_scores: Optional[Sequence[float]] = None,
+        doc_ids: Optional[Sequence[Any]] = None,
+        chunk_starts: Optional[Sequence[Any]] = None,
+        chunk_ends: Optional[Sequence[Any]] = None,
+        tool: str = "",
+        provider: str = "mcp-local",
+        year_expr: Optional[str] = None,
+        extra_metadata: Optional[List[Dict[str, Any]]] = None,
+    ) -> "HitBatch":
+        size = len(chunk_ids)
+        score_array = np.asarray(scores, dtype=np.float64)
+
+        def ranks(values):
+            return np.zeros(size, dtype=np.int64) if values is None else np.asarray(values, dtype=np.int64)
+
+        def floats(values):
+            return np.full(size, np.nan) if values is None else np.asarray(values, dtype=np.float64)
+
+        def offsets(values):
+            if values is None:
+                return np.full(size, MISSING_OFFSET, dtype=np.int64)
+            return np.asarray([_offset_or_missing(value) for value in values], dtype=np.int64)
+
+        return cls(
+            chunk_ids=list(chunk_ids),
+            source_paths=[_intern(value) for value in source_paths],
+            texts=list(texts),
+            doc_types=[_intern_optional(value) for value in doc_types],
+            financial_years=np.asarray(
+                [year if isinstance(year, (int, np.integer)) else MISSING_YEAR for year in financial_years],
+                dtype=np.int64,
+            ),
+            scores=score_array,
+            merged_scores=score_array.copy() if merged_scores is None else np.asarray(merged_scores, dtype=np.float64),
+            dense_ranks=ranks(dense_ranks),
+            dense_scores=floats(dense_scores),
+            sparse_ranks=ranks(sparse_ranks),
+            sparse_scores=floats(sparse_scores),
+            doc_ids=[_intern(value) for value in doc_ids] if doc_ids is not None else [""] * size,
+            chunk_starts=offsets(chunk_starts),
+            chunk_ends=offsets(chunk_ends),
+            tool=tool,
+            provider=provider,
+            year_expr=year_expr,
+            extra_metadata=extra_metadata,
+        )
+
+    @classmethod
+    def from_hits(cls, hits: Sequence[RetrievalHit]) -> "HitBatch":
+        """Build a batch from RetrievalHit objects (tests, external callers)."""
+        known_keys = {
+            "provider",
+            "tool",
+            "doc_type",
+            "financial_year",
+            "year_expr",
+            "retrieval_sources",
+            "dense_rank",
+            "dense_score",
+            "sparse_rank",
+            "sparse_score",
+            "merged_score",
+            "doc_id",
+            "chunk_start",
+            "chunk_end",
+        }
+        metadata = [hit.metadata or {} for hit in hits]
+        extras = [{key: value for key, value in meta.items() if key not in known_keys} for meta in metadata]
+        first = metadata[0] if metadata else {}
+        return cls.from_columns(
+            chunk_ids=[hit.chunk_id for hit in hits],
+            source_paths=[hit.source_path for hit in hits],
+            texts=[hit.text for hit in hits],
+            doc_types=[meta.get("doc_type") for meta in metadata],
+            financial_years=[meta.get("financial_year") for meta in metadata],
+            scores=[float(hit.score) for hit in hits],
+            merged_scores=[float(meta.get("merged_score", hit.score)) for hit, meta in zip(hits, metadata)],
+            dense_ranks=[meta.get("dense_rank") or MISSING_RANK for meta in metadata],
+            dense_scores=[np.nan if meta.get("dense_score") is None else meta["dense_score"] for meta in metadata],
+            sparse_ranks=[meta.get("sparse_rank") or MISSING_RANK for meta in metadata],
+            sparse_scores=[np.nan if meta.get("sparse_score") is None else meta["sparse_score"] for meta in metadata],
+            doc_ids=[meta.get("doc_id") for meta in metadata],
+            chunk_starts=[meta.get("chunk_start") for meta in metadata],
+            chunk_ends=[meta.get("chunk_end") for meta in metadata],
+            tool=str(first.get("tool", "")),
+            provider=str(first.get("provider", "mcp-local")),
+            year_expr=first.get("year_expr"),
+            extra_metadata=extras if any(extras) else None,
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["HitBatch"], year_expr: Optional[str] = None) -> "HitBatch":
+        """Stack batches row-wise; scalar fields come from the first batch."""
+        if not batches:
+            return cls.empty(year_expr=year_expr)
+        first = batches[0]
+        has_extra = any(batch.extra_metadata is not None for batch in batches)
+        return cls(
+            chunk_ids=[value for batch in batches for value in batch.chunk_ids],
+            source_paths=[value for batch in batches for value in batch.source_paths],
+            texts=[value for batch in batches for value in batch.texts],
+            doc_types=[value for batch in batches for value in batch.doc_types],
+            financial_years=np.concatenate([batch.financial_years for batch in batches]),
+            scores=np.concatenate([batch.scores for batch in batches]),
+            merged_scores=np.concatenate([batch.merged_scores for batch in batches]),
+            dense_ranks=np.concatenate([batch.dense_ranks for batch in batches]),
+            dense_scores=np.concatenate([batch.dense_scores for batch in batches]),
+            sparse_ranks=np.concatenate([batch.sparse_ranks for batch in batches]),
+            sparse_scores=np.concatenate([batch.sparse_scores for batch in batches]),
+            doc_ids=[value for batch in batches for value in batch.doc_ids],
+            chunk_starts=np.concatenate([batch.chunk_starts for batch in batches]),
+            chunk_ends=np.concatenate([batch.chunk_ends for batch in batches]),
+            tool=first.tool,
+            provider=first.provider,
+            year_expr=year_expr if year_expr is not None else first.year_expr,
+            extra_metadata=(
+                [meta for batch in batches for meta in (batch.extra_metadata or [{} for _ in range(len(batch))])]
+                if has_extra
+                else None
+            ),
+        )
+
+    @classmethod
+    def coerce(cls, hits: Union["HitBatch", Sequence[RetrievalHit]]) -> "HitBatch":
+        return hits if isinstance(hits, HitBatch) else cls.from_hits(list(hits))
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def __iter__(self) -> Iterator[RetrievalHit]:
+        for idx in range(len(self)):
+            yield self.hit(idx)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[RetrievalHit, "HitBatch"]:
+        if isinstance(key, slice):
+            return self.take(np.arange(len(self))[key])
+        return self.hit(key)
+
+    def take(self, indices: Sequence[int]) -> "HitBatch":
+        """Return a new batch with rows reordered/selected by `indices`."""
+        order = np.asarray(indices, dtype=np.int64)
+        rows = order.tolist()
+        return replace(
+            self,
+            chunk_ids=[self.chunk_ids[idx] for idx in rows],
+            source_paths=[self.source_paths[idx] for idx in rows],
+            texts=[self.texts[idx] for idx in rows],
+            doc_types=[self.doc_types[idx] for idx in rows],
+            financial_years=self.financial_years[order],
+            scores=self.scores[order],
+            merged_scores=self.merged_scores[order],
+            dense_ranks=self.dense_ranks[order],
+            dense_scores=self.dense_scores[order],
+            sparse_ranks=self.sparse_ranks[order],
+            sparse_scores=self.sparse_scores[order],
+            doc_ids=[self.doc_ids[idx] for idx in rows],
+            chunk_starts=self.chunk_starts[order],
+            chunk_ends=self.chunk_ends[order],
+            extra_metadata=[self.extra_metadata[idx] for idx in rows] if self.extra_metadata is not None else None,
+        )
+
+    def with_scores(self, scores: np.ndarray, tool: Optional[str] = None) -> "HitBatch":
+        return replace(
+            self,
+            scores=np.asarray(scores, dtype=np.float64),
+            tool=self.tool if tool is None else tool,
+        )
+
+    def retrieval_sources(self, idx: int) -> List[str]:
+        sources = []
+        if self.dense_ranks[idx] != MISSING_RANK:
+            sources.append("dense")
+        if self.sparse_ranks[idx] != MISSING_RANK:
+            sources.append("sparse")
+        return sources
+
+    def metadata(self, idx: int) -> Dict[str, Any]:
+        """Materialize the per-hit metadata dict (trace/API edge only)."""
+        year = int(self.financial_years[idx])
+        metadata: Dict[str, Any] = {
+            "provider": self.provider,
+            "tool": self.tool,
+            "doc_type": self.doc_types[idx],
+            "financial_year": year if year != MISSING_YEAR else None,
+            "year_expr": self.year_expr,
+            "retrieval_sources": self.retrieval_sources(idx),
+            "dense_rank": _optional_rank(self.dense_ranks[idx]),
+            "dense_score": _optional_score(self.dense_scores[idx]),
+            "sparse_rank": _optional_rank(self.sparse_ranks[idx]),
+            "sparse_score": _optional_score(self.sparse_scores[idx]),
+            "merged_score": float(self.merged_scores[idx]),
+            "doc_id": self.doc_ids[idx] or None,
+            "chunk_start": _optional_offset(self.chunk_starts[idx]),
+            "chunk_end": _optional_offset(self.chunk_ends[idx]),
+        }
+        if self.extra_metadata is not None:
+            metadata.update(self.extra_metadata[idx])
+        return metadata
+
+    def hit(self, idx: int) -> RetrievalHit:
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError("HitBatch index out of range")
+        return RetrievalHit(
+            chunk_id=self.chunk_ids[idx],
+            source_path=self.source_paths[idx],
+            text=self.texts[idx],
+            score=float(self.scores[idx]),
+            metadata=self.metadata(idx),
+        )
+
+    def to_hits(self) -> List[RetrievalHit]:
+        return [self.hit(idx) for idx in range(len(self))]
+
+
+def trace_hit_outputs(outputs: Any) -> Dict[str, Any]:
+    """LangSmith `process_outputs` hook: serialize batches as plain hit dicts."""
+    if isinstance(outputs, HitBatch):
+        payload: Dict[str, Any] = {"hits": [asdict(hit) for hit in outputs.to_hits()]}
+        if outputs.retrieval_path is not None:
+            payload["retrieval_path"] = outputs.retrieval_path
+        if outputs.compacted_rows:
+            payload["compacted_rows"] = outputs.compacted_rows
+        if outputs.rerank_cached_pairs:
+            payload["rerank_cached_pairs"] = outputs.rerank_cached_pairs
+        if outputs.rerank_cascade is not None:
+            payload["rerank_cascade"] = outputs.rerank_cascade
+        return payload
+    if isinstance(outputs, list):
+        return {
+            "batches": [
+                [asdict(hit) for hit in item.to_hits()] if isinstance(item, HitBatch) else repr(item)
+                for item in outputs
+            ]
+        }
+    if isinstance(outputs, dict):
+        return outputs
+    return {"output": outputs}
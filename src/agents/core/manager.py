@@ -1,13 +1,18 @@
 """Manager state machine orchestration for planner and specialist execution."""
 
-from typing import Dict, Literal, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from typing import Any, Iterator, Literal, Optional, Sequence, Union
 
 from langsmith.run_helpers import traceable
 
 from .config import AgentConfig
+from .deadline import RequestDeadline, StageDeadlineExceeded, stage_executor
+from .hit_batch import HitBatch
+from .speculation import SpeculativeRetrieval, speculation_executor
 from ..planner.service import PlannerAI
 from ..specialists.service import GuardrailsViolationError, Specialists
-from .types import OrchestrationResult, ReflectionResult, RetrievalHit, RetrieveContextPayload, UserQuery
+from .types import ExecutionPlan, OrchestrationResult, ReflectionResult, RetrieveContextPayload, UserQuery
 
 
 class Manager:
@@ -18,51 +23,378 @@ class Manager:
 
     @traceable(name="manager.run", run_type="chain")
     def run(self, user_query: UserQuery, planner: PlannerAI, specialists: Specialists) -> OrchestrationResult:
-        plan = planner.build_plan(user_query)
+        deadline = self._start_deadline()
+        plan, speculation = self._build_plan(user_query, planner, specialists, deadline)
         if plan.coherence == "incoherent":
-            return self._build_incoherent_reject(plan)
-        state_history = ["execute_plan"]
+            return self._with_trace(self._build_incoherent_reject(plan), speculation, deadline)
+        try:
+            plan = self._budget_top_k(plan, deadline)
+            hits = self._call(deadline, "retrieve", self._retrieve, plan, specialists, speculation)
+            reranked_hits = self._rerank(plan, specialists, hits, deadline)
+            result = self._synthesize_and_reflect(plan, specialists, reranked_hits, deadline)
+        except GuardrailsViolationError as exc:
+            return self._with_trace(self._build_guardrail_result(exc), speculation, deadline)
+        except StageDeadlineExceeded as exc:
+            return self._with_trace(self._build_deadline_result(exc, deadline), speculation, deadline)
+        return self._with_trace(result, speculation, deadline)
+
+    @traceable(name="manager.arun", run_type="chain")
+    async def arun(self, user_query: UserQuery, planner: PlannerAI, specialists: Specialists) -> OrchestrationResult:
+        """`run` for async callers: LLM calls are awaited, blocking stages run via `specialists.run_blocking`."""
+        deadline = self._start_deadline()
+        plan, speculation = await self._abuild_plan(user_query, planner, specialists, deadline)
+        if plan.coherence == "incoherent":
+            return self._with_trace(self._build_incoherent_reject(plan), speculation, deadline)
+        try:
+            plan = self._budget_top_k(plan, deadline)
+            hits = await self._acall(
+                deadline, "retrieve", specialists.run_blocking(self._retrieve, plan, specialists, speculation)
+            )
+            reranked_hits = await self._arerank(plan, specialists, hits, deadline)
+            answer = await self._acall(
+                deadline,
+                "synthesis",
+                specialists.asynthesize(
+                    original_query=plan.original_query,
+                    revised_query=plan.revised_query,
+                    hits=reranked_hits,
+                ),
+            )
+            reflection = await self._areflect(plan, specialists, answer, reranked_hits, deadline)
+        except GuardrailsViolationError as exc:
+            return self._with_trace(self._build_guardrail_result(exc), speculation, deadline)
+        except StageDeadlineExceeded as exc:
+            return self._with_trace(self._build_deadline_result(exc, deadline), speculation, deadline)
+        return self._with_trace(self._build_success_result(answer, reflection), speculation, deadline)
+
+    @traceable(name="manager.run_stream", run_type="chain")
+    def run_stream(
+        self,
+        user_query: UserQuery,
+        planner: PlannerAI,
+        specialists: Specialists,
+    ) -> Iterator[tuple[str, Any]]:
+        """Single-query orchestration as stage events, for `POST /ask/stream`.
+
+        Yields `("plan", dict)`, `("evidence", dict)`, one `("token", str)` per
+        output-guarded answer window, and always ends with
+        `("result", OrchestrationResult)`. Early exits (incoherent query,
+        guardrail block) go straight to the result event.
+        """
+        plan, speculation = self._build_plan(user_query, planner, specialists)
+        if plan.coherence == "incoherent":
+            yield "result", self._with_trace(self._build_incoherent_reject(plan), speculation)
+            return
+        retrieve_params = self._retrieve_params(plan)
+        yield "plan", {
+            "revised_query": plan.revised_query,
+            "year_mode": retrieve_params.get("year_mode"),
+            "requested_years": retrieve_params.get("requested_years", []),
+            "doc_types": retrieve_params.get("doc_types", []),
+        }
         revised_query = plan.revised_query
-        latest_answer = ""
-        latest_confidence = 0.0
-        latest_reflection = ReflectionResult(reason="low_coverage", confidence=0.0, comments="not_started")
-        original_query = plan.original_query
         try:
-            # Plan steps are retained as a potential extension point; current execution is a fixed pipeline.
-            retrieve_params = next((dict(step.params) for step in plan.steps if step.name == "retrieve"), {})
-            hits = specialists.retrieve(revised_query, plan.top_k, retrieve_context=retrieve_params)
+            hits = self._retrieve(plan, specialists, speculation)
             reranked_hits = specialists.rerank(revised_query, hits, plan.top_n)
-            latest_answer = specialists.synthesize(
-                original_query=original_query,
+            yield "evidence", {"retrieved": len(hits), "reranked": len(reranked_hits)}
+            windows: list[str] = []
+            for window in specialists.synthesize_stream(
+                original_query=plan.original_query,
                 revised_query=revised_query,
                 hits=reranked_hits,
+            ):
+                windows.append(window)
+                yield "token", window
+            answer = "".join(windows)
+            reflection = specialists.reflect(plan.original_query, revised_query, answer, reranked_hits)
+        except GuardrailsViolationError as exc:
+            yield "result", self._with_trace(self._build_guardrail_result(exc), speculation)
+            return
+        yield "result", self._with_trace(self._build_success_result(answer, reflection), speculation)
+
+    def run_many(
+        self,
+        user_queries: Sequence[UserQuery],
+        planner: PlannerAI,
+        specialists: Specialists,
+    ) -> Iterator[tuple[int, Union[OrchestrationResult, Exception]]]:
+        """Batch orchestration that yields `(index, result)` as each query finishes.
+
+        Planning and synthesis/reflection run concurrently per query; retrieval and
+        rerank are shared batched calls. Unexpected per-query failures are yielded
+        as the exception instance so one bad query does not abort the batch.
+        """
+        plans: dict[int, ExecutionPlan] = {}
+        with ThreadPoolExecutor(max_workers=max(1, self.config.batch_max_concurrency)) as pool:
+            plan_futures = {pool.submit(planner.build_plan, query): idx for idx, query in enumerate(user_queries)}
+            for future in as_completed(plan_futures):
+                idx = plan_futures[future]
+                try:
+                    plan = future.result()
+                except Exception as exc:
+                    yield idx, exc
+                    continue
+                if plan.coherence == "incoherent":
+                    yield idx, self._build_incoherent_reject(plan)
+                    continue
+                plans[idx] = plan
+            if not plans:
+                return
+
+            order = sorted(plans)
+            retrieved = specialists.retrieve_many(
+                [plans[idx].revised_query for idx in order],
+                plans[order[0]].top_k,
+                retrieve_contexts=[self._retrieve_params(plans[idx]) for idx in order],
+            )
+            ready: list[tuple[int, HitBatch]] = []
+            for idx, hits in zip(order, retrieved):
+                if isinstance(hits, GuardrailsViolationError):
+                    yield idx, self._build_guardrail_result(hits)
+                    continue
+                ready.append((idx, hits))
+            if not ready:
+                return
+
+            reranked = specialists.rerank_many(
+                [plans[idx].revised_query for idx, _ in ready],
+                [hits for _, hits in ready],
+                plans[ready[0][0]].top_n,
             )
-            latest_reflection = specialists.reflect(original_query, revised_query, latest_answer, reranked_hits)
-            latest_confidence = latest_reflection.confidence
-            transition_reason = self._transition_reason(latest_reflection)
-            state = "success"
+            finish_futures = {
+                pool.submit(self._synthesize_and_reflect, plans[idx], specialists, hits): idx
+                for (idx, _), hits in zip(ready, reranked)
+            }
+            for future in as_completed(finish_futures):
+                idx = finish_futures[future]
+                try:
+                    yield idx, future.result()
+                except Exception as exc:
+                    yield idx, exc
+
+    def _start_speculation(
+        self, user_query: UserQuery, planner: PlannerAI, specialists: Specialists
+    ) -> Optional[SpeculativeRetrieval]:
+        """Start retrieval for the original query so it overlaps the planner LLM call."""
+        if not self.config.speculative_retrieval_enabled:
+            return None
+        retrieve_context = planner.speculative_retrieve_params(user_query)
+        return SpeculativeRetrieval(
+            specialists=specialists,
+            query=retrieve_context["original_query"],
+            top_k=self.config.top_k,
+            retrieve_context=retrieve_context,
+            reuse_similarity=self.config.speculative_reuse_similarity,
+            executor=speculation_executor(self.config.speculative_max_workers),
+            merge_diverged=self.config.speculative_merge_diverged,
+        )
+
+    def _build_plan(
+        self,
+        user_query: UserQuery,
+        planner: PlannerAI,
+        specialists: Specialists,
+        deadline: Optional[RequestDeadline] = None,
+    ) -> tuple[ExecutionPlan, Optional[SpeculativeRetrieval]]:
+        """Local plan when possible; otherwise the planner LLM call, with speculative retrieval alongside."""
+        plan = planner.local_plan(user_query)
+        if plan is not None:
+            return plan, None  # pre-filter rejects and cache hits never pay for a speculative retrieval
+        speculation = self._start_speculation(user_query, planner, specialists)
+        try:
+            plan = self._call(deadline, "planner", planner.llm_plan, user_query)
+        except StageDeadlineExceeded:
+            deadline.degrade("planner_timeout")
+            plan = planner.fallback_plan(user_query)
+        finally:
+            self._settle_speculation(speculation, plan)
+        return plan, speculation
+
+    async def _abuild_plan(
+        self,
+        user_query: UserQuery,
+        planner: PlannerAI,
+        specialists: Specialists,
+        deadline: Optional[RequestDeadline] = None,
+    ) -> tuple[ExecutionPlan, Optional[SpeculativeRetrieval]]:
+        plan = planner.local_plan(user_query)
+        if plan is not None:
+            return plan, None
+        speculation = self._start_speculation(user_query, planner, specialists)
+        try:
+            plan = await self._acall(deadline, "planner", planner.allm_plan(user_query))
+        except StageDeadlineExceeded:
+            deadline.degrade("planner_timeout")
+            plan = planner.fallback_plan(user_query)
+        finally:
+            self._settle_speculation(speculation, plan)
+        return plan, speculation
+
+    def _start_deadline(self) -> Optional[RequestDeadline]:
+        if not self.config.request_deadline_enabled:
+            return None
+        return RequestDeadline(
+            self.config.request_deadline_seconds,
+            {
+                "planner": self.config.deadline_planner_seconds,
+                "retrieve": self.config.deadline_retrieve_seconds,
+                "rerank": self.config.deadline_rerank_seconds,
+                "synthesis": self.config.deadline_synthesis_seconds,
+                "reflection": self.config.deadline_reflection_seconds,
+            },
+            executor=stage_executor(self.config.deadline_stage_workers),
+        )
+
+    def _call(self, deadline: Optional[RequestDeadline], stage: str, fn, *args, **kwargs):
+        if deadline is None:
+            return fn(*args, **kwargs)
+        return deadline.run(stage, fn, *args, **kwargs)
+
+    async def _acall(self, deadline: Optional[RequestDeadline], stage: str, awaitable):
+        if deadline is None:
+            return await awaitable
+        return await deadline.arun(stage, awaitable)
+
+    def _budget_top_k(self, plan: ExecutionPlan, deadline: Optional[RequestDeadline]) -> ExecutionPlan:
+        """Shrink retrieval when the time left no longer covers every remaining stage."""
+        if deadline is None or deadline.has_time_for("retrieve", "rerank", "synthesis", "reflection"):
+            return plan
+        deadline.degrade("top_k_shrunk")
+        return replace(plan, top_k=max(plan.top_n, int(plan.top_k * self.config.deadline_top_k_shrink_ratio)))
+
+    def _rerank(self, plan: ExecutionPlan, specialists: Specialists, hits, deadline: Optional[RequestDeadline]):
+        if deadline is None:
+            return specialists.rerank(plan.revised_query, hits, plan.top_n)
+        if not deadline.has_time_for("rerank", "synthesis"):
+            deadline.degrade("rerank_skipped")
+            return specialists.prepare_without_rerank(hits, plan.top_n)
+        try:
+            return deadline.run("rerank", specialists.rerank, plan.revised_query, hits, plan.top_n)
+        except StageDeadlineExceeded:
+            deadline.degrade("rerank_timeout")
+            return specialists.prepare_without_rerank(hits, plan.top_n)
+
+    async def _arerank(self, plan: ExecutionPlan, specialists: Specialists, hits, deadline: Optional[RequestDeadline]):
+        if deadline is not None and not deadline.has_time_for("rerank", "synthesis"):
+            deadline.degrade("rerank_skipped")
+            return await specialists.run_blocking(specialists.prepare_without_rerank, hits, plan.top_n)
+        try:
+            return await self._acall(
+                deadline, "rerank", specialists.run_blocking(specialists.rerank, plan.revised_query, hits, plan.top_n)
+            )
+        except StageDeadlineExceeded:
+            deadline.degrade("rerank_timeout")
+            return await specialists.run_blocking(specialists.prepare_without_rerank, hits, plan.top_n)
+
+    def _reflect(
+        self, plan: ExecutionPlan, specialists: Specialists, answer: str, hits, deadline: Optional[RequestDeadline]
+    ) -> ReflectionResult:
+        if deadline is None:
+            return specialists.reflect(plan.original_query, plan.revised_query, answer, hits)
+        if not deadline.has_time_for("reflection"):
+            deadline.degrade("reflection_skipped")
+            return specialists.estimate_reflection(plan.original_query, plan.revised_query, answer, hits)
+        try:
+            return deadline.run("reflection", specialists.reflect, plan.original_query, plan.revised_query, answer, hits)
+        except StageDeadlineExceeded:
+            deadline.degrade("reflection_timeout")
+            return specialists.estimate_reflection(plan.original_query, plan.revised_query, answer, hits)
+
+    async def _areflect(
+        self, plan: ExecutionPlan, specialists: Specialists, answer: str, hits, deadline: Optional[RequestDeadline]
+    ) -> ReflectionResult:
+        if deadline is not None and not deadline.has_time_for("reflection"):
+            deadline.degrade("reflection_skipped")
+            return specialists.estimate_reflection(plan.original_query, plan.revised_query, answer, hits)
+        try:
+            return await self._acall(
+                deadline, "reflection", specialists.areflect(plan.original_query, plan.revised_query, answer, hits)
+            )
+        except StageDeadlineExceeded:
+            deadline.degrade("reflection_timeout")
+            return specialists.estimate_reflection(plan.original_query, plan.revised_query, answer, hits)
+
+    def _settle_speculation(
+        self, speculation: Optional[SpeculativeRetrieval], plan: Optional[ExecutionPlan]
+    ) -> None:
+        """Discard the speculation when planning failed or rejected the query."""
+        if speculation is not None and (plan is None or plan.coherence == "incoherent"):
+            speculation.discard()
+
+    def _retrieve(self, plan: ExecutionPlan, specialists: Specialists, speculation: Optional[SpeculativeRetrieval]):
+        retrieve_params = self._retrieve_params(plan)
+        if speculation is None:
+            return specialists.retrieve(plan.revised_query, plan.top_k, retrieve_context=retrieve_params)
+        return speculation.resolve(plan.revised_query, plan.top_k, retrieve_params)
+
+    def _with_trace(
+        self,
+        result: OrchestrationResult,
+        speculation: Optional[SpeculativeRetrieval],
+        deadline: Optional[RequestDeadline] = None,
+    ) -> OrchestrationResult:
+        if speculation is not None:
+            result.trace = {**(result.trace or {}), "speculative_retrieval": speculation.trace}
+        if deadline is not None:
+            result.trace = {**(result.trace or {}), "deadline": deadline.trace()}
+            # Degradations sit before the terminal state: ["execute_plan", "degraded:rerank_skipped", "success"].
+            degraded = [f"degraded:{name}" for name in deadline.degradations]
+            result.state_history = [*result.state_history[:-1], *degraded, *result.state_history[-1:]]
+        return result
+
+    def _retrieve_params(self, plan: ExecutionPlan) -> RetrieveContextPayload:
+        # Plan steps are retained as a potential extension point; current execution is a fixed pipeline.
+        return next((dict(step.params) for step in plan.steps if step.name == "retrieve"), {})
+
+    def _synthesize_and_reflect(
+        self,
+        plan: ExecutionPlan,
+        specialists: Specialists,
+        reranked_hits,
+        deadline: Optional[RequestDeadline] = None,
+    ) -> OrchestrationResult:
+        try:
+            latest_answer = self._call(
+                deadline,
+                "synthesis",
+                specialists.synthesize,
+                original_query=plan.original_query,
+                revised_query=plan.revised_query,
+                hits=reranked_hits,
+            )
+            latest_reflection = self._reflect(plan, specialists, latest_answer, reranked_hits, deadline)
         except GuardrailsViolationError as exc:
-            latest_answer = exc.safe_reply
-            latest_confidence = 0.0
-            latest_reflection = ReflectionResult(reason="low_coverage", confidence=0.0, comments=exc.reason)
-            state = "fail"
-            transition_reason = "guardrail_block"
-            guardrail_event = {"stage": exc.stage, "reason": exc.reason}
-        else:
-            guardrail_event = None
-        state_history.append(state)
-
-        final_reason = transition_reason
-        if not guardrail_event and state == "fail":
-            latest_answer = self._build_polite_fallback(final_reason, latest_reflection)
+            return self._build_guardrail_result(exc)
+        return self._build_success_result(latest_answer, latest_reflection)
 
+    def _build_success_result(self, answer: str, reflection: ReflectionResult) -> OrchestrationResult:
         return OrchestrationResult(
-            answer=latest_answer,
-            confidence=latest_confidence,
-            state_history=state_history,
-            final_reason=final_reason,
-            reflection=latest_reflection,
-            guardrail_event=guardrail_event,
+            answer=answer,
+            confidence=reflection.confidence,
+            state_history=["execute_plan", "success"],
+            final_reason=self._transition_reason(reflection),
+            reflection=reflection,
+        )
+
+    def _build_guardrail_result(self, exc: GuardrailsViolationError) -> OrchestrationResult:
+        return OrchestrationResult(
+            answer=exc.safe_reply,
+            confidence=0.0,
+            state_history=["execute_plan", "fail"],
+            final_reason="guardrail_block",
+            reflection=ReflectionResult(reason="low_coverage", confidence=0.0, comments=exc.reason),
+            guardrail_event={"stage": exc.stage, "reason": exc.reason},
+        )
+
+    def _build_deadline_result(self, exc: StageDeadlineExceeded, deadline: RequestDeadline) -> OrchestrationResult:
+        deadline.degrade(f"{exc.stage}_timeout")
+        reflection = ReflectionResult(reason="low_coverage", confidence=0.0, comments=str(exc))
+        return OrchestrationResult(
+            answer=self._build_polite_fallback("deadline_exceeded", reflection),
+            confidence=0.0,
+            state_history=["execute_plan", "fail"],
+            final_reason="deadline_exceeded",
+            reflection=reflection,
         )
 
     def _build_incoherent_reject(self, plan) -> OrchestrationResult:
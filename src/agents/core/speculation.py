@@ -0,0 +1,164 @@
+"""Speculative retrieval on the original query while the planner LLM call runs.
+
+The planner's revised query usually overlaps heavily with the original, and
+retrieval scope (years, doc types, year slices) never depends on the LLM
+output. Retrieval for the original query therefore starts as soon as the
+planner needs its LLM call (pre-filter rejects and cache hits never pay for
+it), on one process-wide pool of `AGENT_SPECULATIVE_MAX_WORKERS` threads:
+- `reused`: the revised query is similar enough (token Jaccard >= threshold)
+  and the scope matches, so the speculative hits are used as-is.
+- `re_retrieved`: the revised query diverged, the scope differs, or the
+  speculation failed or never left the pool queue. The revised query is
+  retrieved again and the speculative hits are dropped.
+- `merged`: as `re_retrieved`, but with `AGENT_SPECULATIVE_MERGE_DIVERGED` the
+  speculative hits, if already finished, join the candidates (deduped by
+  chunk_id, ordered by merged retrieval score, capped at top_k).
+- `discarded`: the plan rejected the query before retrieval.
+
+The outcome, similarity, and estimated saved latency go into
+`OrchestrationResult.trace["speculative_retrieval"]`.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ..guardrails.service import GuardrailsViolationError
+from .hit_batch import HitBatch
+
+_TOKEN = re.compile(r"\w+")
+# Keys that name the query rather than scope it; they may differ between speculation and plan.
+_QUERY_KEYS = {"original_query", "revised_query"}
+MERGE_WAIT_SECONDS = 0.05  # a speculation still running after the revised retrieval is not worth waiting for
+
+_speculation_executor: Optional[ThreadPoolExecutor] = None
+_speculation_executor_lock = threading.Lock()
+
+
+def speculation_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Process-wide pool for speculative retrievals; the first caller sizes it."""
+    global _speculation_executor
+    with _speculation_executor_lock:
+        if _speculation_executor is None:
+            _speculation_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative-retrieve")
+        return _speculation_executor
+
+
+def query_similarity(left: str, right: str) -> float:
+    """Jaccard similarity of lowercased word sets."""
+    left_tokens = set(_TOKEN.findall(left.lower()))
+    right_tokens = set(_TOKEN.findall(right.lower()))
+    if not left_tokens and not right_tokens:
+        return 1.0
+    return len(left_tokens & right_tokens) / len(left_tokens | right_tokens)
+
+
+def merge_hit_batches(primary: HitBatch, extra: HitBatch, top_k: int) -> HitBatch:
+    """Union of two retrieval batches by chunk_id (primary rows win), best merged score first."""
+    combined = HitBatch.concat([primary, extra], year_expr=primary.year_expr)
+    seen: set[str] = set()
+    rows = []
+    for row, chunk_id in enumerate(combined.chunk_ids):
+        if chunk_id not in seen:
+            seen.add(chunk_id)
+            rows.append(row)
+    rows = np.asarray(rows, dtype=np.int64)
+    order = rows[np.argsort(-combined.scores[rows], kind="stable")][: max(1, top_k)]
+    merged = combined.take(order)
+    merged.retrieval_path = primary.retrieval_path
+    return merged
+
+
+class SpeculativeRetrieval:
+    """One background retrieval for the original query, resolved against the plan."""
+
+    def __init__(
+        self,
+        *,
+        specialists,
+        query: str,
+        top_k: int,
+        retrieve_context: Dict[str, Any],
+        reuse_similarity: float,
+        executor: ThreadPoolExecutor,
+        merge_diverged: bool = False,
+    ):
+        self.specialists = specialists
+        self.query = query
+        self.top_k = top_k
+        self.retrieve_context = retrieve_context
+        self.reuse_similarity = reuse_similarity
+        self.merge_diverged = merge_diverged
+        self.trace: Dict[str, Any] = {}
+        self._retrieve_ms: Optional[float] = None
+        self._future: Future = executor.submit(self._retrieve)
+
+    def _retrieve(self) -> HitBatch:
+        started = time.perf_counter()
+        hits = self.specialists.retrieve(self.query, self.top_k, retrieve_context=self.retrieve_context)
+        self._retrieve_ms = (time.perf_counter() - started) * 1000.0
+        return HitBatch.coerce(hits)
+
+    def resolve(self, revised_query: str, top_k: int, retrieve_context: Dict[str, Any]) -> HitBatch:
+        """Hits for the plan: reuse the speculation, or retrieve the revised query."""
+        similarity = query_similarity(self.query, revised_query)
+        same_scope = top_k == self.top_k and self._scope(retrieve_context) == self._scope(self.retrieve_context)
+        # cancel() succeeds only while the speculation is still queued behind a saturated pool.
+        if same_scope and similarity >= self.reuse_similarity and not self._future.cancel():
+            wait_started = time.perf_counter()
+            try:
+                hits = self._future.result()
+            except GuardrailsViolationError:
+                raise  # same input guard as a normal retrieval
+            except Exception as exc:
+                self.trace = {"outcome": "failed", "hit": False, "similarity": similarity, "error": type(exc).__name__}
+                return HitBatch.coerce(self.specialists.retrieve(revised_query, top_k, retrieve_context=retrieve_context))
+            wait_ms = (time.perf_counter() - wait_started) * 1000.0
+            self.trace = {
+                "outcome": "reused",
+                "hit": True,
+                "similarity": similarity,
+                "speculative_retrieve_ms": self._retrieve_ms,
+                "wait_ms": wait_ms,
+                # The retrieval the plan would have started now, minus what it still had to wait.
+                "saved_ms": max(0.0, (self._retrieve_ms or 0.0) - wait_ms),
+            }
+            return hits
+
+        merge = same_scope and self.merge_diverged
+        if not merge:
+            self._future.cancel()  # frees the pool slot if the speculation is still queued
+        hits = HitBatch.coerce(self.specialists.retrieve(revised_query, top_k, retrieve_context=retrieve_context))
+        speculative = self._completed_hits() if merge else None
+        self.trace = {
+            "outcome": "merged" if speculative is not None else "re_retrieved",
+            "hit": False,
+            "similarity": similarity,
+            "saved_ms": 0.0,
+        }
+        if speculative is None:
+            return hits
+        return merge_hit_batches(hits, speculative, top_k)
+
+    def discard(self) -> None:
+        self._future.cancel()
+        self.trace = {"outcome": "discarded", "hit": False, "saved_ms": 0.0}
+
+    def _completed_hits(self) -> Optional[HitBatch]:
+        # The speculation started before the planner call, so it has normally finished by now.
+        try:
+            return self._future.result(timeout=MERGE_WAIT_SECONDS)
+        except FutureTimeoutError:
+            self._future.cancel()
+            return None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _scope(retrieve_context: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in retrieve_context.items() if key not in _QUERY_KEYS}
@@ -6,7 +6,7 @@ from typing import Any, Dict, List, Literal, Optional, TypedDict
 
 PlanStepName = Literal["retrieve", "rerank", "synthesize", "reflect"]
 ReflectionReason = Literal["low_coverage", "ok"]
-YearMode = Literal["explicit", "none"]
+YearMode = Literal["explicit", "inferred", "none"]
 CoherenceLabel = Literal["coherent", "incoherent"]
 
 
@@ -56,6 +56,8 @@ class RetrieveContextPayload(TypedDict, total=False):
     revised_query: str
     year_mode: YearMode
     requested_years: list[int]
+    doc_types: list[str]
+    year_slices: list[list[int]]  # per-period sub-retrievals (comparison questions)
     recent_year_window: int
 
 
@@ -70,3 +72,4 @@ class OrchestrationResult:
     reflection: Optional[ReflectionResult] = None
     guardrail_event: Optional[Dict[str, Any]] = None
     coherence: Optional[Dict[str, Any]] = None
+    trace: Optional[Dict[str, Any]] = None  # per-request execution details (e.g. speculative retrieval), trace only
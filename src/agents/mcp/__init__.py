@@ -1,6 +1,40 @@
 """MCP helper utilities for tool resolution and client wrappers."""
 
 from .contracts import MCPToolNames
+from .inference import (
+    InferencePoolSaturatedError,
+    InferenceWorkerPool,
+    RemoteCrossEncoder,
+    RemoteEmbedder,
+)
+from .llm_clients import (
+    LLMClientRegistry,
+    LLMUsageStats,
+    StageChatModel,
+    get_llm_client_registry,
+    llm_client_stats,
+    llm_usage_stats,
+)
+from .partitions import YearPartitionLoader, partition_name_for_year
+from .pool import MilvusConnectionPool, MilvusPoolSaturatedError
 from .tools import missing_tool_names, resolve_tool_names
 
-__all__ = ["MCPToolNames", "missing_tool_names", "resolve_tool_names"]
+__all__ = [
+    "InferencePoolSaturatedError",
+    "InferenceWorkerPool",
+    "LLMClientRegistry",
+    "LLMUsageStats",
+    "MCPToolNames",
+    "MilvusConnectionPool",
+    "MilvusPoolSaturatedError",
+    "RemoteCrossEncoder",
+    "RemoteEmbedder",
+    "StageChatModel",
+    "YearPartitionLoader",
+    "get_llm_client_registry",
+    "llm_client_stats",
+    "llm_usage_stats",
+    "missing_tool_names",
+    "partition_name_for_year",
+    "resolve_tool_names",
+]
@@ -1,26 +1,116 @@
 """Lightweight MCP/Milvus client wrappers used by specialist services."""
 
-from typing import Any, Optional
+import json
+from typing import Any, Optional, Sequence
 
 
-def _search_kwargs(anns_field: str, data: list[object], top_k: int, year_expr: Optional[str]) -> dict[str, Any]:
+def _search_kwargs(
+    anns_field: str,
+    data: list[object],
+    top_k: int,
+    year_expr: Optional[str],
+    partition_names: Optional[list[str]] = None,
+    output_text: bool = True,
+) -> dict[str, Any]:
+    output_fields = ["chunk_id", "doc_id", "source_path", "doc_type", "financial_year", "chunk_start", "chunk_end"]
+    if output_text:
+        # Skipped when the API hydrates text from the local docstore (src/vector_db/docstore.py).
+        output_fields.insert(3, "text")
     kwargs: dict[str, Any] = {
         "data": data,
         "anns_field": anns_field,
         "param": {"metric_type": "IP", "params": {"ef": 64}},
         "limit": top_k,
-        "output_fields": ["chunk_id", "source_path", "text", "doc_type", "financial_year"],
+        "output_fields": output_fields,
     }
     if year_expr:
         kwargs["expr"] = year_expr
+    if partition_names:
+        kwargs["partition_names"] = partition_names
     return kwargs
 
 
-def search_collection_dense(collection, query_vector: list[float], top_k: int, year_expr: Optional[str]):
-    kwargs = _search_kwargs(anns_field="dense_vector", data=[query_vector], top_k=top_k, year_expr=year_expr)
+def search_collection_dense_many(
+    collection,
+    query_vectors: list[list[float]],
+    top_k: int,
+    year_expr: Optional[str],
+    partition_names: Optional[list[str]] = None,
+    output_text: bool = True,
+):
+    """Multi-query (nq > 1) dense search; returns one result list per query vector."""
+    kwargs = _search_kwargs(
+        anns_field="dense_vector",
+        data=list(query_vectors),
+        top_k=top_k,
+        year_expr=year_expr,
+        partition_names=partition_names,
+        output_text=output_text,
+    )
     return collection.search(**kwargs)
 
 
-def search_collection_sparse(collection, sparse_query_vector: dict[int, float], top_k: int, year_expr: Optional[str]):
-    kwargs = _search_kwargs(anns_field="sparse_vector", data=[sparse_query_vector], top_k=top_k, year_expr=year_expr)
+def search_collection_sparse_many(
+    collection,
+    sparse_query_vectors: list[dict[int, float]],
+    top_k: int,
+    year_expr: Optional[str],
+    partition_names: Optional[list[str]] = None,
+    output_text: bool = True,
+):
+    """Multi-query (nq > 1) sparse search; returns one result list per query vector."""
+    kwargs = _search_kwargs(
+        anns_field="sparse_vector",
+        data=list(sparse_query_vectors),
+        top_k=top_k,
+        year_expr=year_expr,
+        partition_names=partition_names,
+        output_text=output_text,
+    )
     return collection.search(**kwargs)
+
+
+def search_collection_dense(
+    collection,
+    query_vector: list[float],
+    top_k: int,
+    year_expr: Optional[str],
+    partition_names: Optional[list[str]] = None,
+    output_text: bool = True,
+):
+    kwargs = _search_kwargs(
+        anns_field="dense_vector",
+        data=[query_vector],
+        top_k=top_k,
+        year_expr=year_expr,
+        partition_names=partition_names,
+        output_text=output_text,
+    )
+    return collection.search(**kwargs)
+
+
+def search_collection_sparse(
+    collection,
+    sparse_query_vector: dict[int, float],
+    top_k: int,
+    year_expr: Optional[str],
+    partition_names: Optional[list[str]] = None,
+    output_text: bool = True,
+):
+    kwargs = _search_kwargs(
+        anns_field="sparse_vector",
+        data=[sparse_query_vector],
+        top_k=top_k,
+        year_expr=year_expr,
+        partition_names=partition_names,
+        output_text=output_text,
+    )
+    return collection.search(**kwargs)
+
+
+def fetch_chunk_texts(collection, chunk_ids: Sequence[str]) -> dict[str, str]:
+    """chunk_id -> text straight from Milvus, for chunks the local docstore cannot serve."""
+    if not chunk_ids:
+        return {}
+    rows = collection.query(expr=f"chunk_id in {json.dumps(list(chunk_ids))}", output_fields=["chunk_id", "text"])
+    return {row["chunk_id"]: row.get("text") or "" for row in rows}
@@ -0,0 +1,294 @@
+"""Out-of-process inference workers for query embedding and cross-encoder scoring.
+
+Why this exists:
+- The embedder and cross-encoder used to run on uvicorn request threads, so
+  torch intra-op threads fought each other and the event loop. One heavy
+  rerank could stall `/health`.
+- GIL contention capped throughput no matter how many request threads ran.
+
+Each worker is a separate process with a pinned torch thread count. It loads
+both models once and serves `embed` and `score` calls from its own request
+queue. Results come back on one shared queue that a collector thread routes
+to per-call futures. Callers go through `RemoteEmbedder` / `RemoteCrossEncoder`,
+which expose the `encode` / `predict` surface the specialists already use.
+Backpressure is a bounded in-flight semaphore. Callers wait at most
+`acquire_timeout_seconds` for a slot, then fail fast with
+`InferencePoolSaturatedError` instead of queueing without limit. Cross-encoder
+scoring runs in forward passes of at most `score_batch_size` pairs.
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+_SHUTDOWN = None  # request-queue sentinel
+
+
+class InferencePoolSaturatedError(RuntimeError):
+    pass
+
+
+def load_sentence_transformer_models(embedding_model: str, cross_encoder_model: str, pretokenize_max_entries: int = 0):
+    """Default worker model loader (runs inside the worker process)."""
+    from sentence_transformers import CrossEncoder, SentenceTransformer
+
+    cross_encoder = CrossEncoder(cross_encoder_model, device="cpu")
+    if pretokenize_max_entries:
+        from ..specialists.pretokenized import PretokenizedCrossEncoder
+
+        cross_encoder = PretokenizedCrossEncoder(cross_encoder, max_entries=pretokenize_max_entries)
+    return SentenceTransformer(embedding_model, device="cpu"), cross_encoder
+
+
+def _worker_main(
+    worker_idx: int, requests, results, threads: int, score_batch_size: int, load_models: Callable[[], tuple]
+) -> None:
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    embedder, cross_encoder = load_models()
+    while True:
+        request = requests.get()
+        if request is _SHUTDOWN:
+            return
+        call_id, op, payload = request
+        started = time.perf_counter()
+        try:
+            if op == "embed":
+                output = np.asarray(embedder.encode(payload, normalize_embeddings=True), dtype=np.float32)
+            elif op == "score":
+                output = np.asarray(cross_encoder.predict(payload, batch_size=score_batch_size), dtype=np.float64)
+            else:
+                raise ValueError(f"unknown inference op: {op}")
+            results.put((call_id, worker_idx, True, output, (time.perf_counter() - started) * 1000.0))
+        except Exception as exc:  # surfaced to the caller, the worker keeps serving
+            results.put((call_id, worker_idx, False, f"{type(exc).__name__}: {exc}", (time.perf_counter() - started) * 1000.0))
+
+
+class _Worker:
+    def __init__(self, idx: int):
+        self.idx = idx
+        self.process = None
+        self.requests = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_ms = 0.0
+        self.started_at = time.monotonic()
+        self.restarts = 0
+        self.alive = True  # False while a restart is in progress
+        self.calls: set[int] = set()  # pending call ids routed to the current process
+
+
+class InferenceWorkerPool:
+    """N inference processes behind a bounded in-flight limit, least-busy routing."""
+
+    def __init__(
+        self,
+        *,
+        embedding_model: str = "",
+        cross_encoder_model: str = "",
+        workers: int = 2,
+        threads_per_worker: int = 2,
+        max_in_flight: int = 32,
+        timeout_seconds: float = 60.0,
+        acquire_timeout_seconds: float = 0.5,
+        score_batch_size: int = 32,
+        pretokenize_max_entries: int = 0,
+        load_models: Optional[Callable[[], tuple]] = None,
+        start_method: str = "spawn",
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.acquire_timeout_seconds = acquire_timeout_seconds
+        self.score_batch_size = max(1, score_batch_size)
+        self.threads_per_worker = threads_per_worker
+        self.max_in_flight = max_in_flight
+        self._load_models = load_models or partial(
+            load_sentence_transformer_models, embedding_model, cross_encoder_model, pretokenize_max_entries
+        )
+        # spawn by default: forking a process that already runs torch threads can deadlock.
+        self._context = multiprocessing.get_context(start_method)
+        self._results = self._context.Queue()
+        self._workers = [_Worker(idx) for idx in range(workers)]
+        self._pending: dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(max_in_flight)
+        self._rejections = 0
+        self._closed = False
+        for worker in self._workers:
+            worker.requests = self._context.Queue()
+            self._start_worker(worker)
+        self._collector = threading.Thread(target=self._collect, name="inference-results", daemon=True)
+        self._collector.start()
+
+    def _start_worker(self, worker: _Worker) -> None:
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(
+                worker.idx,
+                worker.requests,
+                self._results,
+                self.threads_per_worker,
+                self.score_batch_size,
+                self._load_models,
+            ),
+            name=f"inference-worker-{worker.idx}",
+            daemon=True,
+        )
+        worker.process.start()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self._call("embed", list(texts))
+
+    def score(self, pairs: Sequence[Any]) -> np.ndarray:
+        if not pairs:
+            return np.empty(0)
+        return self._call("score", [tuple(pair) for pair in pairs])
+
+    def _call(self, op: str, payload: list) -> np.ndarray:
+        if not self._semaphore.acquire(timeout=self.acquire_timeout_seconds):
+            with self._lock:
+                self._rejections += 1
+            raise InferencePoolSaturatedError(
+                f"Inference pool saturated: no slot among {self.max_in_flight} within {self.acquire_timeout_seconds:.1f}s."
+            )
+        try:
+            self._restart_dead_workers()
+            future: Future = Future()
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Inference pool is closed.")
+                call_id = next(self._ids)
+                worker = min(self._workers, key=lambda worker: worker.in_flight if worker.alive else float("inf"))
+                worker.in_flight += 1
+                worker.calls.add(call_id)
+                self._pending[call_id] = future
+                requests = worker.requests
+            requests.put((call_id, op, payload))
+            try:
+                return future.result(timeout=self.timeout_seconds)
+            finally:
+                with self._lock:
+                    if self._pending.pop(call_id, None) is not None:
+                        worker.in_flight -= 1  # timed out; the collector will drop the late result
+                        worker.calls.discard(call_id)
+        finally:
+            self._semaphore.release()
+
+    def _restart_dead_workers(self) -> None:
+        # Dead workers are claimed under the lock and respawned outside it, so a slow spawn never blocks
+        # other callers. Their pending calls fail now instead of waiting out the call timeout, and the
+        # fresh request queue is swapped in first, so calls routed during the respawn are not orphaned.
+        orphaned: list[Future] = []
+        with self._lock:
+            dead = [worker for worker in self._workers if worker.alive and not worker.process.is_alive()]
+            for worker in dead:
+                worker.alive = False
+                worker.restarts += 1
+                worker.failed += len(worker.calls)
+                orphaned.extend(self._pending.pop(call_id) for call_id in worker.calls)
+                worker.calls.clear()
+                worker.in_flight = 0
+                worker.requests = self._context.Queue()
+        for future in orphaned:
+            future.set_exception(RuntimeError("Inference worker crashed before answering."))
+        for worker in dead:
+            self._start_worker(worker)
+            with self._lock:
+                worker.alive = True
+
+    def _collect(self) -> None:
+        while True:
+            try:
+                message = self._results.get(timeout=0.5)
+            except queue.Empty:
+                if self._closed:
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+            call_id, worker_idx, ok, output, busy_ms = message
+            with self._lock:
+                worker = self._workers[worker_idx]
+                worker.busy_ms += busy_ms
+                future = self._pending.pop(call_id, None)
+                if future is None:
+                    continue
+                worker.in_flight -= 1
+                worker.calls.discard(call_id)
+                if ok:
+                    worker.completed += 1
+                else:
+                    worker.failed += 1
+            if ok:
+                future.set_result(output)
+            else:
+                future.set_exception(RuntimeError(f"Inference worker {worker_idx} failed: {output}"))
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "workers": [
+                    {
+                        "worker": worker.idx,
+                        "pid": worker.process.pid,
+                        "alive": worker.process.is_alive(),
+                        "in_flight": worker.in_flight,
+                        "completed": worker.completed,
+                        "failed": worker.failed,
+                        "restarts": worker.restarts,
+                        "utilisation": min(1.0, worker.busy_ms / max(1.0, (now - worker.started_at) * 1000.0)),
+                    }
+                    for worker in self._workers
+                ],
+                "in_flight": sum(worker.in_flight for worker in self._workers),
+                "max_in_flight": self.max_in_flight,
+                "threads_per_worker": self.threads_per_worker,
+                "rejections": self._rejections,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        for worker in self._workers:
+            if worker.process.is_alive():
+                worker.requests.put(_SHUTDOWN)
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+
+class RemoteEmbedder:
+    """`SentenceTransformer.encode` surface backed by the worker pool (always L2-normalized)."""
+
+    def __init__(self, pool: InferenceWorkerPool):
+        self.pool = pool
+
+    def encode(self, texts: Sequence[str], normalize_embeddings: bool = True, **_ignored) -> np.ndarray:
+        return self.pool.embed(texts)
+
+
+class RemoteCrossEncoder:
+    """`CrossEncoder.predict` surface backed by the worker pool."""
+
+    def __init__(self, pool: InferenceWorkerPool):
+        self.pool = pool
+
+    def predict(self, pairs: Sequence[Any], **_ignored) -> np.ndarray:
+        return self.pool.score(pairs)
@@ -0,0 +1,257 @@
+"""Process-wide LLM chat clients over one shared keep-alive HTTP pool.
+
+`PlannerAI` is constructed per request, so `_get_planner_model` used to build
+a fresh `ChatOpenAI`, and with it a fresh HTTP client, on every call. That
+meant a new TCP + TLS handshake per planner call and no connection reuse.
+Synthesis and reflection each had their own client again.
+
+`LLMClientRegistry` owns one `httpx.Client` (plus an `httpx.AsyncClient` for
+`ainvoke` on the async request path) with bounded keep-alive connections. It
+hands out chat models cached per (model, temperature, stage), all backed by those
+clients. Connection reuse is measured through httpcore trace
+events: a request that opens a TCP connection counts as new, any other
+request reused a pooled one.
+
+Models requested for a stage (planner, synthesis, reflection) also send
+that stage's `prompt_cache_key`. They come back wrapped in
+`StageChatModel`, which records prompt, cached and completion token usage
+from every response. This shows per stage whether provider prefix caching
+actually hits.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from ..prompts.caching import estimated_prefix_tokens, prompt_cache_key
+
+
+def _default_chat_model_factory(
+    *,
+    model: str,
+    temperature: float,
+    http_client: httpx.Client,
+    http_async_client: httpx.AsyncClient,
+    timeout: float,
+    model_kwargs: Dict[str, Any],
+):
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        timeout=timeout,
+        model_kwargs=model_kwargs,
+        stream_usage=True,  # usage arrives on the final streamed chunk
+    )
+
+
+def response_usage(response) -> Optional[Tuple[int, int, int]]:
+    """(prompt, cached prompt, completion) tokens from a chat response or chunk, if reported."""
+    metadata = getattr(response, "usage_metadata", None) or {}
+    token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+    if not metadata and not token_usage:
+        return None
+    prompt = metadata.get("input_tokens", token_usage.get("prompt_tokens", 0)) or 0
+    completion = metadata.get("output_tokens", token_usage.get("completion_tokens", 0)) or 0
+    cached = (metadata.get("input_token_details") or {}).get("cache_read")
+    if cached is None:
+        cached = (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+    return int(prompt), int(cached or 0), int(completion)
+
+
+class LLMUsageStats:
+    """Per-stage token usage, including provider prefix-cache reads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, int]] = {}
+
+    def record(self, stage: str, response) -> None:
+        usage = response_usage(response)
+        if usage is None:
+            return
+        prompt, cached, completion = usage
+        with self._lock:
+            counters = self._stages.setdefault(
+                stage,
+                {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "cache_hit_calls": 0},
+            )
+            counters["calls"] += 1
+            counters["prompt_tokens"] += prompt
+            counters["cached_tokens"] += cached
+            counters["completion_tokens"] += completion
+            counters["cache_hit_calls"] += 1 if cached else 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                stage: {
+                    **counters,
+                    "cached_token_share": (
+                        counters["cached_tokens"] / counters["prompt_tokens"] if counters["prompt_tokens"] else 0.0
+                    ),
+                    "prompt_cache_key": prompt_cache_key(stage),
+                    "estimated_prefix_tokens": estimated_prefix_tokens(stage),
+                }
+                for stage, counters in self._stages.items()
+            }
+
+
+class StageChatModel:
+    """Chat model proxy that records usage for one prompt stage."""
+
+    def __init__(self, model, stage: str, usage: LLMUsageStats):
+        self.model = model
+        self.stage = stage
+        self.usage = usage
+
+    def invoke(self, *args, **kwargs):
+        response = self.model.invoke(*args, **kwargs)
+        self.usage.record(self.stage, response)
+        return response
+
+    async def ainvoke(self, *args, **kwargs):
+        response = await self.model.ainvoke(*args, **kwargs)
+        self.usage.record(self.stage, response)
+        return response
+
+    def stream(self, *args, **kwargs):
+        for chunk in self.model.stream(*args, **kwargs):
+            self.usage.record(self.stage, chunk)
+            yield chunk
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+
+class LLMClientRegistry:
+    """Chat models per (model, temperature, stage) sharing one pooled HTTP client."""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout_seconds: float = 60.0,
+        chat_model_factory: Optional[Callable[..., Any]] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.timeout_seconds = timeout_seconds
+        self._chat_model_factory = chat_model_factory or _default_chat_model_factory
+        self._models: Dict[Tuple[str, float, Optional[str]], Any] = {}
+        self.usage = LLMUsageStats()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+        self._tls_handshakes = 0
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        self.http_client = httpx.Client(
+            limits=limits,
+            timeout=httpx.Timeout(timeout_seconds),
+            transport=transport,
+            event_hooks={"request": [self._on_request]},
+        )
+        self.async_http_client = httpx.AsyncClient(
+            limits=limits,
+            timeout=httpx.Timeout(timeout_seconds),
+            event_hooks={"request": [self._aon_request]},
+        )
+
+    def chat_model(self, model: str, temperature: float, stage: Optional[str] = None):
+        """Shared chat model for (model, temperature, stage); built once per process.
+
+        With a `stage`, requests carry its `prompt_cache_key` and usage is recorded.
+        """
+        key = (model, float(temperature), stage)
+        with self._lock:
+            chat_model = self._models.get(key)
+            if chat_model is None:
+                chat_model = self._chat_model_factory(
+                    model=model,
+                    temperature=temperature,
+                    http_client=self.http_client,
+                    http_async_client=self.async_http_client,
+                    timeout=self.timeout_seconds,
+                    model_kwargs={"prompt_cache_key": prompt_cache_key(stage)} if stage else {},
+                )
+                if stage:
+                    chat_model = StageChatModel(chat_model, stage, self.usage)
+                self._models[key] = chat_model
+        return chat_model
+
+    def _on_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self._requests += 1
+        request.extensions["trace"] = self._on_trace
+
+    async def _aon_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self._requests += 1
+        request.extensions["trace"] = self._aon_trace
+
+    def _on_trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._new_connections += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self._tls_handshakes += 1
+
+    async def _aon_trace(self, event_name: str, info: dict) -> None:
+        self._on_trace(event_name, info)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            reused = max(0, self._requests - self._new_connections)
+            return {
+                "models": sorted(
+                    f"{stage + ':' if stage else ''}{model}@{temperature:g}" for model, temperature, stage in self._models
+                ),
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "requests": self._requests,
+                "new_connections": self._new_connections,
+                "tls_handshakes": self._tls_handshakes,
+                "reused_connections": reused,
+                "reuse_rate": (reused / self._requests) if self._requests else 0.0,
+            }
+
+    def close(self) -> None:
+        self.http_client.close()
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_client_registry(config) -> LLMClientRegistry:
+    """Process-wide registry; the first caller's config sizes the pool."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry(
+                max_connections=config.llm_max_connections,
+                max_keepalive_connections=config.llm_max_keepalive_connections,
+                timeout_seconds=float(config.mcp_timeout_seconds),
+            )
+        return _registry
+
+
+def llm_client_stats() -> Optional[Dict[str, Any]]:
+    """Registry stats for `GET /stats`; None until the first LLM client is requested."""
+    with _registry_lock:
+        registry = _registry
+    return registry.stats() if registry is not None else None
+
+
+def llm_usage_stats() -> Optional[Dict[str, Any]]:
+    """Per-stage token usage for `GET /stats`; None until the first LLM client is requested."""
+    with _registry_lock:
+        registry = _registry
+    return registry.usage.stats() if registry is not None else None
@@ -0,0 +1,85 @@
+"""Financial-year partition helpers with hot/cold loading.
+
+Ingestion (src/vector_db/load_data.py) places each chunk in a `fy<YYYY>`
+partition. At runtime, recent ("hot") years are loaded eagerly and older
+("cold") years are loaded on first use, so searches touch only the requested
+partitions and resident memory grows only with the years actually queried.
+Queries that name no year search the partitions already loaded (hot plus any
+cold years loaded earlier) rather than loading every cold partition; set
+`AGENT_FY_PARTITIONS_UNSCOPED_LOAD_ALL` to load and search all years instead.
+"""
+
+import re
+import threading
+from typing import Iterable, Optional
+
+# Ingestion (src/vector_db/load_data.py) imports partition_name_for_year, so both sides share this template.
+FY_PARTITION_TEMPLATE = "fy{year}"
+_FY_PARTITION_PATTERN = re.compile(r"^fy(\d{4})$")
+
+
+def partition_name_for_year(year: int) -> str:
+    return FY_PARTITION_TEMPLATE.format(year=int(year))
+
+
+class YearPartitionLoader:
+    """Tracks which FY partitions exist/are loaded and loads cold ones on demand."""
+
+    def __init__(self, collection, *, load_all_when_unscoped: bool = False):
+        self._collection = collection
+        self.load_all_when_unscoped = load_all_when_unscoped
+        self._lock = threading.Lock()
+        self._loaded: set[int] = set()
+        self.available_years: list[int] = sorted(
+            int(match.group(1))
+            for match in (_FY_PARTITION_PATTERN.match(partition.name) for partition in collection.partitions)
+            if match
+        )
+
+    @property
+    def partitioned(self) -> bool:
+        """False for legacy collections ingested without FY partitions."""
+        return bool(self.available_years)
+
+    @property
+    def loaded_years(self) -> list[int]:
+        return sorted(self._loaded)
+
+    def load_hot(self, *, corpus_latest_fy: int, recent_year_window: int) -> list[int]:
+        window = max(1, int(recent_year_window))
+        hot_years = [year for year in self.available_years if 0 <= corpus_latest_fy - year < window]
+        self.ensure_loaded(hot_years)
+        return hot_years
+
+    def ensure_loaded(self, years: Iterable[int]) -> None:
+        wanted = {int(year) for year in years if int(year) in self.available_years}
+        if wanted <= self._loaded:
+            return
+        with self._lock:
+            missing = sorted(wanted - self._loaded)
+            if not missing:
+                return
+            self._collection.load(partition_names=[partition_name_for_year(year) for year in missing])
+            self._loaded.update(missing)
+
+    def resolve(self, requested_years: Optional[Iterable[int]]) -> Optional[list[str]]:
+        """Partitions to search, loading cold ones first.
+
+        No requested years means the loaded partitions (all years, loading cold ones,
+        when `load_all_when_unscoped` is set or nothing is loaded yet). None means "no
+        partition scoping": the collection is not partitioned, or no requested year has
+        a partition (callers then keep the scalar FY filter, which matches nothing
+        instead of searching every partition).
+        """
+        if not self.partitioned:
+            return None
+        years = sorted({int(year) for year in requested_years or []})
+        if not years:
+            years = self.loaded_years
+            if self.load_all_when_unscoped or not years:
+                years = list(self.available_years)
+        present = [year for year in years if year in self.available_years]
+        if not present:
+            return None
+        self.ensure_loaded(present)
+        return [partition_name_for_year(year) for year in present]
@@ -0,0 +1,221 @@
+"""Thread-safe Milvus connection pool shared by concurrent `/ask` requests.
+
+Why this exists:
+- FastAPI runs sync handlers in a thread pool; one `connections.connect` alias
+  funnels every search through a single gRPC channel.
+- A dropped channel used to fail every in-flight request until restart.
+
+The pool opens N aliases (one channel each), caps in-flight searches with a
+semaphore, routes each call to the least-busy alias, and reconnects + retries
+once when a channel is unavailable. Concurrent failures on one alias reconnect it
+once, under that alias's own lock. It exposes the small `Collection` surface the
+specialists use (`search`, `query`, `load`, `partitions`), so callers stay unchanged.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Callable, Optional
+
+POOL_ALIAS_PREFIX = "sg_budget_pool"
+
+
+def _default_connect(alias: str, uri: Optional[str], token: Optional[str], timeout: float) -> None:
+    from pymilvus import connections
+
+    # keep_alive enables gRPC keepalive pings so idle channels are not silently dropped.
+    connections.connect(alias=alias, uri=uri, token=token, timeout=timeout, keep_alive=True)
+
+
+def _default_disconnect(alias: str) -> None:
+    from pymilvus import connections
+
+    connections.disconnect(alias)
+
+
+def _default_collection_factory(name: str, alias: str):
+    from pymilvus import Collection
+
+    return Collection(name, using=alias)
+
+
+def _default_retryable_errors() -> tuple[type[BaseException], ...]:
+    errors: list[type[BaseException]] = [ConnectionError]
+    try:
+        from pymilvus.exceptions import ConnectionNotExistException, MilvusUnavailableException
+
+        errors.extend([ConnectionNotExistException, MilvusUnavailableException])
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+class MilvusPoolSaturatedError(RuntimeError):
+    pass
+
+
+class _Slot:
+    def __init__(self, alias: str):
+        self.alias = alias
+        self.collection = None
+        self.in_flight = 0
+        self.generation = 0  # bumped on every reconnect
+        self.reconnect_lock = threading.Lock()
+
+
+class MilvusConnectionPool:
+    """N Milvus aliases behind a bounded in-flight limit, with reconnect on channel loss."""
+
+    def __init__(
+        self,
+        *,
+        collection_name: str,
+        uri: Optional[str],
+        token: Optional[str],
+        size: int = 4,
+        max_in_flight: int = 16,
+        acquire_timeout_seconds: float = 30.0,
+        consistency_level: str = "Bounded",
+        connect: Callable[[str, Optional[str], Optional[str], float], None] = _default_connect,
+        disconnect: Callable[[str], None] = _default_disconnect,
+        collection_factory: Callable[[str, str], Any] = _default_collection_factory,
+        retryable_errors: Optional[tuple[type[BaseException], ...]] = None,
+    ):
+        self.collection_name = collection_name
+        self.size = max(1, int(size))
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.acquire_timeout_seconds = float(acquire_timeout_seconds)
+        self.consistency_level = consistency_level
+        self._uri = uri
+        self._token = token
+        self._connect = connect
+        self._disconnect = disconnect
+        self._collection_factory = collection_factory
+        self._retryable_errors = retryable_errors if retryable_errors is not None else _default_retryable_errors()
+        self._slots = [_Slot(f"{POOL_ALIAS_PREFIX}_{idx}") for idx in range(self.size)]
+        self._semaphore = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._waiting = 0
+        self._peak_in_flight = 0
+        self._searches = 0
+        self._retries = 0
+        self._reconnects = 0
+        self._failures = 0
+        self._rejections = 0
+        self._total_wait_seconds = 0.0
+        for slot in self._slots:
+            self._open(slot)
+
+    # Collection-compatible surface -------------------------------------------------
+
+    @property
+    def partitions(self):
+        return self._run(lambda collection: collection.partitions)
+
+    def load(self, *args, **kwargs):
+        # Loading is server-side state; any channel can issue it.
+        return self._run(lambda collection: collection.load(*args, **kwargs))
+
+    def search(self, **kwargs):
+        """Run `Collection.search` on the least-busy alias, retrying once after a reconnect."""
+        kwargs.setdefault("consistency_level", self.consistency_level)
+        return self._run(lambda collection: collection.search(**kwargs))
+
+    def query(self, **kwargs):
+        """Run `Collection.query` (scalar lookups) the same way as `search`."""
+        kwargs.setdefault("consistency_level", self.consistency_level)
+        return self._run(lambda collection: collection.query(**kwargs))
+
+    def _run(self, call: Callable[[Any], Any]):
+        slot = self._acquire()
+        try:
+            generation = slot.generation
+            try:
+                return call(slot.collection)
+            except self._retryable_errors:
+                with self._lock:
+                    self._retries += 1
+                self._reconnect(slot, generation)
+                return call(slot.collection)
+        except Exception:
+            with self._lock:
+                self._failures += 1
+            raise
+        finally:
+            self._release(slot)
+
+    # Pool management ---------------------------------------------------------------
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            in_flight = sum(slot.in_flight for slot in self._slots)
+            return {
+                "size": self.size,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": in_flight,
+                "in_flight_per_alias": {slot.alias: slot.in_flight for slot in self._slots},
+                "peak_in_flight": self._peak_in_flight,
+                "waiting": self._waiting,
+                "saturation": in_flight / self.max_in_flight,
+                "searches": self._searches,
+                "avg_wait_ms": (1000.0 * self._total_wait_seconds / self._searches) if self._searches else 0.0,
+                "retries": self._retries,
+                "reconnects": self._reconnects,
+                "failures": self._failures,
+                "rejections": self._rejections,
+                "consistency_level": self.consistency_level,
+            }
+
+    def close(self) -> None:
+        for slot in self._slots:
+            try:
+                self._disconnect(slot.alias)
+            except Exception:
+                pass
+            slot.collection = None
+
+    def _open(self, slot: _Slot) -> None:
+        self._connect(slot.alias, self._uri, self._token, self.acquire_timeout_seconds)
+        slot.collection = self._collection_factory(self.collection_name, slot.alias)
+
+    def _reconnect(self, slot: _Slot, generation: int) -> None:
+        with slot.reconnect_lock:
+            if slot.generation != generation:
+                return  # another caller already reconnected this alias after our call failed
+            try:
+                self._disconnect(slot.alias)
+            except Exception:
+                pass
+            self._open(slot)
+            slot.generation += 1
+        with self._lock:
+            self._reconnects += 1
+
+    def _acquire(self) -> _Slot:
+        started = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+        acquired = self._semaphore.acquire(timeout=self.acquire_timeout_seconds)
+        waited = time.monotonic() - started
+        with self._lock:
+            self._waiting -= 1
+            if not acquired:
+                self._rejections += 1
+                raise MilvusPoolSaturatedError(
+                    f"Milvus pool saturated: no search slot within {self.acquire_timeout_seconds:.1f}s."
+                )
+            # Least in-flight alias; round-robin start breaks ties so idle aliases share load.
+            start = next(self._round_robin) % self.size
+            rotated = self._slots[start:] + self._slots[:start]
+            slot = min(rotated, key=lambda candidate: candidate.in_flight)
+            slot.in_flight += 1
+            self._searches += 1
+            self._total_wait_seconds += waited
+            self._peak_in_flight = max(self._peak_in_flight, sum(item.in_flight for item in self._slots))
+        return slot
+
+    def _release(self, slot: _Slot) -> None:
+        with self._lock:
+            slot.in_flight -= 1
+        self._semaphore.release()
@@ -3,6 +3,17 @@
 Re-exports here provide a shorter import path; __all__ documents the public API.
 """
 
+from .analyzer import QueryScope, analyze_query
+from .cache import PlannerOutputCache, planner_prompt_version
+from .prefilter import CoherencePrefilter, CoherenceVerdict
 from .service import PlannerAI
 
-__all__ = ["PlannerAI"]
+__all__ = [
+    "CoherencePrefilter",
+    "CoherenceVerdict",
+    "PlannerAI",
+    "PlannerOutputCache",
+    "QueryScope",
+    "analyze_query",
+    "planner_prompt_version",
+]
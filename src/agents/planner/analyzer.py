@@ -0,0 +1,131 @@
+"""Deterministic query analyzer for FY and doc-type scope (no LLM call).
+
+Runs inside `PlannerAI.build_plan` when the client did not send
+`requested_years`. It recognizes:
+- FY mentions: "FY2025", "FY 25", "Budget 2024", bare corpus years ("in 2023")
+- ranges: "FY2020-FY2022", "2019 to 2021", "between 2018 and 2020"
+- open spans: "since 2022", "after 2020", "before 2019", "last 3 years"
+- COVID spans: "pre-COVID", "during COVID", "post-COVID", "before vs after COVID"
+- comparison cues ("compare", "vs", "how did ... change"), used for per-period fan-out
+- doc-type hints: annex, budget statement, (debate) round-up speech
+
+Anything it cannot parse is left unscoped, so retrieval falls back to the
+full corpus plus the recency boost.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+# Corpus doc types, matching the top-level folders under data/ (see vector_db/load_data.py).
+DOC_TYPE_ANNEX = "annex"
+DOC_TYPE_BUDGET_STATEMENT = "budgets_statements"
+DOC_TYPE_ROUND_UP_SPEECH = "round_up_speech"
+
+# Budgets with COVID-19 support packages.
+COVID_YEARS = (2020, 2021)
+
+# Four-digit years may be bare; two-digit years need an FY prefix ("FY25", "FY'25").
+_YEAR = r"(fy\s*'?\d{2}(?!\d)|(?:fy\s*|budget\s+)?(?:19|20)\d{2}(?!\d))"
+_FY_MENTION = re.compile(rf"\b{_YEAR}", re.IGNORECASE)
+# "and" is only a range separator after "between" ("FY2019 and FY2023" means two years).
+_RANGE = re.compile(
+    rf"\b(?:between\s+{_YEAR}\s*and\s*{_YEAR}|(?:from\s+)?{_YEAR}\s*(?:-|–|to|until|through)\s*{_YEAR})",
+    re.IGNORECASE,
+)
+_SINCE = re.compile(rf"\b(since|after|post|from)\s+{_YEAR}", re.IGNORECASE)
+_BEFORE = re.compile(rf"\b(before|prior\s+to|pre)\s+{_YEAR}", re.IGNORECASE)
+_LAST_N = re.compile(r"\b(?:last|past|previous)\s+(\d{1,2}|two|three|four|five)\s+(?:financial\s+)?years?\b", re.IGNORECASE)
+_PRE_VS_POST_COVID = re.compile(
+    r"\bbefore\s+(?:and|vs\.?|versus|or)\s+after\s+(?:the\s+)?(?:covid|pandemic)\b", re.IGNORECASE
+)
+_PRE_COVID = re.compile(r"\b(?:pre[-\s]?covid|before\s+(?:the\s+)?(?:covid|pandemic))\b", re.IGNORECASE)
+_DURING_COVID = re.compile(r"\b(?:during|amid)\s+(?:the\s+)?(?:covid|pandemic)\b", re.IGNORECASE)
+_POST_COVID = re.compile(r"\b(?:post[-\s]?covid|after\s+(?:the\s+)?(?:covid|pandemic))\b", re.IGNORECASE)
+
+_DOC_TYPE_PATTERNS = (
+    (DOC_TYPE_ANNEX, re.compile(r"\bannex(?:es)?\b", re.IGNORECASE)),
+    (DOC_TYPE_BUDGET_STATEMENT, re.compile(r"\bbudget\s+statements?\b", re.IGNORECASE)),
+    (DOC_TYPE_ROUND_UP_SPEECH, re.compile(r"\bround[-\s]?up(?:\s+speech(?:es)?)?\b|\bbudget\s+debate\b", re.IGNORECASE)),
+)
+_COMPARATIVE = re.compile(
+    r"\b(?:compare[sd]?|comparing|comparison|vs\.?|versus|chang(?:e|es|ed|ing)|differ(?:s|ed|ence|ences)?|"
+    r"evolv(?:e|ed|ing)|trends?|shift(?:s|ed)?|over\s+the\s+years)\b",
+    re.IGNORECASE,
+)
+_NUMBER_WORDS = {"two": 2, "three": 3, "four": 4, "five": 5}
+
+
+@dataclass
+class QueryScope:
+    """Inferred retrieval scope; empty lists mean "no constraint"."""
+
+    years: List[int] = field(default_factory=list)
+    doc_types: List[str] = field(default_factory=list)
+    matched: List[str] = field(default_factory=list)  # rule names, for traces
+    periods: List[List[int]] = field(default_factory=list)  # one year list per matched span, in query order
+    comparative: bool = False  # query asks to compare/contrast periods
+
+
+def _to_year(token: str) -> int:
+    digits = re.sub(r"\D", "", token)
+    return int(digits) if len(digits) == 4 else 2000 + int(digits)
+
+
+def analyze_query(query: str, *, corpus_earliest_fy: int, corpus_latest_fy: int) -> QueryScope:
+    """Extract FY and doc-type scope from query text, clipped to the corpus year range."""
+    text = query or ""
+    years: set[int] = set()
+    matched: list[str] = []
+    periods: list[tuple[int, list[int]]] = []  # (match start, years) so periods keep query order
+    consumed: list[tuple[int, int]] = []
+
+    def matches(pattern: re.Pattern):
+        # Earlier (more specific) rules win; later rules skip text they already covered.
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if not any(start < used_end and used_start < end for used_start, used_end in consumed):
+                consumed.append((start, end))
+                yield match
+
+    def add_span(start_year: int, end_year: int, rule: str, match: re.Match) -> None:
+        span = range(max(start_year, corpus_earliest_fy), min(end_year, corpus_latest_fy) + 1)
+        if span:
+            years.update(span)
+            matched.append(rule)
+            periods.append((match.start(), list(span)))
+
+    for match in matches(_PRE_VS_POST_COVID):
+        add_span(corpus_earliest_fy, COVID_YEARS[0] - 1, "pre_covid", match)
+        add_span(COVID_YEARS[-1] + 1, corpus_latest_fy, "post_covid", match)
+    for match in matches(_RANGE):
+        bounds = [_to_year(token) for token in match.groups() if token]
+        add_span(min(bounds), max(bounds), "year_range", match)
+    for match in matches(_PRE_COVID):
+        add_span(corpus_earliest_fy, COVID_YEARS[0] - 1, "pre_covid", match)
+    for match in matches(_DURING_COVID):
+        add_span(COVID_YEARS[0], COVID_YEARS[-1], "during_covid", match)
+    for match in matches(_POST_COVID):
+        add_span(COVID_YEARS[-1] + 1, corpus_latest_fy, "post_covid", match)
+    for match in matches(_SINCE):
+        start = _to_year(match.group(2))
+        add_span(start if match.group(1).lower() in {"since", "from"} else start + 1, corpus_latest_fy, "year_since", match)
+    for match in matches(_BEFORE):
+        add_span(corpus_earliest_fy, _to_year(match.group(2)) - 1, "year_before", match)
+    for match in matches(_LAST_N):
+        token = match.group(1).lower()
+        count = _NUMBER_WORDS.get(token) or int(token)
+        add_span(corpus_latest_fy - count + 1, corpus_latest_fy, "last_n_years", match)
+    for match in matches(_FY_MENTION):
+        year = _to_year(match.group(1))
+        add_span(year, year, "fy_mention", match)
+
+    doc_types = [doc_type for doc_type, pattern in _DOC_TYPE_PATTERNS if pattern.search(text)]
+    matched.extend(f"doc_type:{doc_type}" for doc_type in doc_types)
+    return QueryScope(
+        years=sorted(years),
+        doc_types=doc_types,
+        matched=matched,
+        periods=[span for _, span in sorted(periods, key=lambda item: item[0])],
+        comparative=bool(_COMPARATIVE.search(text)),
+    )
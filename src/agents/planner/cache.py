@@ -0,0 +1,120 @@
+"""Persistent cache of planner LLM outputs.
+
+At temperature 0, the planner output (revised_query, coherence) depends only
+on the model, the prompt text, and the payload (original query plus current
+revised query). Repeat traffic can therefore skip the planner round trip.
+Entries live in a small SQLite file, so they survive restarts and are shared
+by the API's worker threads. Each entry has a TTL, and the table is capped by
+evicting the least recently used rows.
+
+Invalidation is versioned. `planner_prompt_version()` hashes the planner
+prompt templates, so editing `prompts/planner.py` changes every key. Rows
+from other prompt versions are purged when the cache opens.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..prompts import planner as planner_prompts
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS planner_outputs (
+    key TEXT PRIMARY KEY,
+    prompt_version TEXT NOT NULL,
+    output TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+)
+"""
+
+
+def planner_prompt_version() -> str:
+    """Short hash of the planner prompt templates."""
+    text = planner_prompts.PLANNER_SYSTEM_PROMPT + "\0" + planner_prompts.PLANNER_USER_PROMPT_TEMPLATE
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def normalize_planner_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class PlannerOutputCache:
+    """SQLite-backed planner output cache with TTL and LRU row cap."""
+
+    def __init__(self, path: str, *, ttl_seconds: int, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.prompt_version = planner_prompt_version()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        with self._lock:
+            self._conn.execute(_SCHEMA)
+            purged = self._conn.execute(
+                "DELETE FROM planner_outputs WHERE prompt_version != ?", (self.prompt_version,)
+            ).rowcount
+        self._purged_stale_rows = max(0, purged)
+
+    def key(self, model: str, original_query: str, current_revised_query: str) -> str:
+        payload = [
+            model,
+            self.prompt_version,
+            normalize_planner_query(original_query),
+            normalize_planner_query(current_revised_query),
+        ]
+        return hashlib.sha1(json.dumps(payload).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output, created_at FROM planner_outputs WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM planner_outputs WHERE key = ?", (key,))
+                self._misses += 1
+                return None
+            self._conn.execute("UPDATE planner_outputs SET last_used_at = ? WHERE key = ?", (now, key))
+            self._hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, output: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO planner_outputs VALUES (?, ?, ?, ?, ?)",
+                (key, self.prompt_version, json.dumps(output), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM planner_outputs WHERE key IN ("
+                "SELECT key FROM planner_outputs ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM planner_outputs").fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "prompt_version": self.prompt_version,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "purged_stale_rows": self._purged_stale_rows,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
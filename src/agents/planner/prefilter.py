@@ -0,0 +1,141 @@
+"""Local coherence pre-filter in front of the planner LLM call.
+
+Gibberish such as "blorb flarq 2025 ???" used to cost a planner round trip
+just to be labelled `incoherent`. The pre-filter rejects only clear garbage.
+It uses the BM25 vocabulary shipped in `artifacts/bm25_model.pkl` and cheap
+character statistics:
+- `no_terms`: no letters or digits at all ("???").
+- `out_of_vocabulary`: two or more words, too few of them in the corpus
+  vocabulary, and at least one unknown word is implausible.
+- `low_idf_mass`: several unknown words, one of them implausible, and the
+  known ones are only stopwords (tiny IDF mass), as in "the blorb of flarq".
+- `keyboard_mash`: most words are implausible ("xkcdqwrt"), and the
+  vocabulary does not vouch for them.
+
+An unknown word is implausible when its letters are: a keyboard run
+("asdf"), no vowels ("xkcd"), a long consonant run, a character repeated
+four times ("zzzz"), or a "q" not followed by "u" ("flarq").
+
+Anything else is deferred to the planner LLM. Vocabulary coverage alone never
+rejects: the vocabulary is English, so Malay, Spanish or German questions
+("Bajet 2025 bantuan tunai") and typo-heavy English ("wat iz teh bugdet")
+cover it as poorly as gibberish does, but their letters look like words.
+Queries with non-ASCII letters ("预算措施", "aide à l'emploi") are always
+deferred. Numbers are ignored when measuring vocabulary coverage: "2025" is
+in the corpus but says nothing about whether the words around it mean anything.
+"""
+
+import pickle
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+_WORD = re.compile(r"[a-z]+")
+_TERM = re.compile(r"[a-z0-9]+")
+_CONSONANT_RUN = re.compile(r"[b-df-hj-np-tv-xz]{6,}")
+_REPEATED_CHAR = re.compile(r"(.)\1{3,}")
+_Q_WITHOUT_U = re.compile(r"q(?!u)")
+_VOWEL = re.compile(r"[aeiouy]")
+_ANY_WORD_CHAR = re.compile(r"\w")
+_KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+_KEYBOARD_RUN = 4  # adjacent keys in a row, either direction
+
+
+def _has_non_ascii_letters(text: str) -> bool:
+    return any(char.isalpha() and not char.isascii() for char in text)
+
+
+def _is_keyboard_run(word: str) -> bool:
+    return any(
+        word[start : start + _KEYBOARD_RUN] in row or word[start : start + _KEYBOARD_RUN] in row[::-1]
+        for start in range(len(word) - _KEYBOARD_RUN + 1)
+        for row in _KEYBOARD_ROWS
+    )
+
+
+def _is_implausible(word: str) -> bool:
+    """Letters no language the users write in would produce."""
+    return bool(
+        _CONSONANT_RUN.search(word)
+        or _REPEATED_CHAR.search(word)
+        or _Q_WITHOUT_U.search(word)
+        or (len(word) >= 4 and not _VOWEL.search(word))
+        or _is_keyboard_run(word)
+    )
+
+
+@dataclass(frozen=True)
+class CoherenceSignal:
+    terms: int  # alphanumeric tokens
+    words: int  # alphabetic tokens
+    in_vocab_words: int
+    idf_mass: float  # summed idf of in-vocabulary words
+    implausible_words: int  # unknown words with implausible letters (see module docstring)
+    non_ascii_letters: bool = False  # outside the ASCII vocabulary rules; always deferred
+    word_chars: bool = True  # any \w character (letters or digits in any script)
+
+    @property
+    def vocab_ratio(self) -> float:
+        return self.in_vocab_words / self.words if self.words else 0.0
+
+
+@dataclass(frozen=True)
+class CoherenceVerdict:
+    incoherent: bool
+    reason: Optional[str]  # None when deferred to the LLM
+    signal: CoherenceSignal
+
+
+class CoherencePrefilter:
+    """Rejects clear gibberish locally; defers everything else to the planner LLM."""
+
+    def __init__(self, bm25_encoder=None, *, min_vocab_ratio: float = 0.3, min_idf_mass: float = 1.0):
+        self.bm25_encoder = bm25_encoder  # None = character statistics only
+        self.min_vocab_ratio = min_vocab_ratio
+        self.min_idf_mass = min_idf_mass
+
+    @classmethod
+    def from_artifact(cls, path: Path, **thresholds) -> "CoherencePrefilter":
+        """Load the shipped BM25 vocabulary; falls back to character statistics when it is missing."""
+        encoder = None
+        if path.exists():
+            with path.open("rb") as handle:
+                encoder = pickle.load(handle)
+        return cls(encoder, **thresholds)
+
+    def signal(self, query: str) -> CoherenceSignal:
+        text = query.lower()
+        words = _WORD.findall(text)
+        vocab = getattr(self.bm25_encoder, "vocab", None) or {}
+        matched = [vocab[word] for word in words if word in vocab]
+        return CoherenceSignal(
+            terms=len(_TERM.findall(text)),
+            words=len(words),
+            in_vocab_words=len(matched),
+            idf_mass=float(sum(self.bm25_encoder.idf[idx] for idx in matched)) if matched else 0.0,
+            implausible_words=sum(1 for word in words if word not in vocab and _is_implausible(word)),
+            non_ascii_letters=_has_non_ascii_letters(query),
+            word_chars=bool(_ANY_WORD_CHAR.search(query)),
+        )
+
+    def assess(self, query: str) -> CoherenceVerdict:
+        signal = self.signal(query)
+        reason = self._reason(signal)
+        return CoherenceVerdict(incoherent=reason is not None, reason=reason, signal=signal)
+
+    def _reason(self, signal: CoherenceSignal) -> Optional[str]:
+        if not signal.word_chars:
+            return "no_terms"
+        if signal.non_ascii_letters or signal.terms == 0:
+            return None  # another language (or only underscores): the LLM decides
+        if signal.words and signal.implausible_words * 2 > signal.words and signal.vocab_ratio < 0.5:
+            return "keyboard_mash"
+        if self.bm25_encoder is None or not signal.implausible_words:
+            return None  # plausible letters: another language or typos, not gibberish
+        # A single unknown word may be a typo or a scheme name newer than the corpus.
+        if signal.words >= 2 and signal.vocab_ratio < self.min_vocab_ratio:
+            return "out_of_vocabulary"
+        if signal.words - signal.in_vocab_words >= 2 and signal.idf_mass < self.min_idf_mass:
+            return "low_idf_mass"
+        return None
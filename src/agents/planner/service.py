@@ -1,29 +1,81 @@
 """Planner implementation for query revision and execution-plan construction."""
 
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from langsmith.run_helpers import traceable
 
 from ..core.config import AgentConfig
+from ..mcp.llm_clients import get_llm_client_registry
 from ..prompts import planner as planner_prompts
 from ..core.types import CoherenceLabel, ExecutionPlan, PlanStep, UserQuery
+from .analyzer import QueryScope, analyze_query
+from .cache import PlannerOutputCache
+from .prefilter import CoherencePrefilter
 
 
 class PlannerAI:
     """Interprets query intent and builds execution payloads for manager orchestration."""
 
-    def __init__(self, config: AgentConfig):
-        """Initialize the planner with configuration and lazy model cache."""
+    def __init__(
+        self,
+        config: AgentConfig,
+        output_cache: Optional[PlannerOutputCache] = None,
+        coherence_prefilter: Optional[CoherencePrefilter] = None,
+    ):
+        """Initialize the planner with configuration, lazy model cache, and optional cache/pre-filter."""
         self.config = config
+        self.output_cache = output_cache
+        self.coherence_prefilter = coherence_prefilter
         self._planner_model = None
 
     @traceable(name="planner.build_plan", run_type="chain")
     def build_plan(self, user_query: UserQuery) -> ExecutionPlan:
         """Create an ExecutionPlan with retrieval, rerank, synthesis, and reflection steps."""
+        return self.local_plan(user_query) or self.llm_plan(user_query)
+
+    @traceable(name="planner.abuild_plan", run_type="chain")
+    async def abuild_plan(self, user_query: UserQuery) -> ExecutionPlan:
+        """`build_plan` with a non-blocking planner LLM call."""
+        return self.local_plan(user_query) or await self.allm_plan(user_query)
+
+    def local_plan(self, user_query: UserQuery) -> Optional[ExecutionPlan]:
+        """Plan without the planner LLM (pre-filter reject or cache hit), else None."""
+        context = user_query.context or {}
+        original_query = str(context.get("original_query") or user_query.query).strip()
+        planner_output = self._local_planner_output(original_query, context)
+        if planner_output is None:
+            return None
+        return self._plan_from_output(original_query, context, planner_output)
+
+    @traceable(name="planner.llm_plan", run_type="chain")
+    def llm_plan(self, user_query: UserQuery) -> ExecutionPlan:
+        """Plan from the planner LLM, skipping the local checks (callers ran `local_plan` first)."""
         context = user_query.context or {}
         original_query = str(context.get("original_query") or user_query.query).strip()
         planner_output = self._generate_planner_output(original_query=original_query, context=context)
+        self._store_planner_output(original_query, context, planner_output)
+        return self._plan_from_output(original_query, context, planner_output)
+
+    @traceable(name="planner.allm_plan", run_type="chain")
+    async def allm_plan(self, user_query: UserQuery) -> ExecutionPlan:
+        """`llm_plan` with a non-blocking planner LLM call."""
+        context = user_query.context or {}
+        original_query = str(context.get("original_query") or user_query.query).strip()
+        planner_output = await self._agenerate_planner_output(original_query=original_query, context=context)
+        self._store_planner_output(original_query, context, planner_output)
+        return self._plan_from_output(original_query, context, planner_output)
+
+    def fallback_plan(self, user_query: UserQuery, reason: str = "planner_deadline") -> ExecutionPlan:
+        """Plan from the original query without the planner LLM (used when the planner overruns its budget)."""
+        context = user_query.context or {}
+        original_query = str(context.get("original_query") or user_query.query).strip()
+        planner_output = {"revised_query": original_query, "coherence": "coherent", "coherence_reason": reason}
+        return self._plan_from_output(original_query, context, planner_output)
+
+    def _plan_from_output(
+        self, original_query: str, context: Dict[str, Any], planner_output: Dict[str, Any]
+    ) -> ExecutionPlan:
         revised_query = planner_output["revised_query"].strip()
         coherence = planner_output["coherence"]
         coherence_reason = planner_output["coherence_reason"]
@@ -32,16 +84,7 @@ class PlannerAI:
         if not revised_query and coherence == "incoherent":
             revised_query = original_query
 
-        requested_years = [int(year) for year in context.get("requested_years", []) if str(year).isdigit()]
-        year_mode = "explicit" if requested_years else "none"
-
-        retrieve_params: Dict[str, Any] = {
-            "original_query": original_query,
-            "revised_query": revised_query,
-            "year_mode": year_mode,
-            "requested_years": requested_years,
-            "recent_year_window": self.config.recent_year_window,
-        }
+        retrieve_params = self._retrieve_params(original_query, revised_query, context)
         shared_query_params = {"original_query": original_query, "revised_query": revised_query}
         # Steps are kept as a potential extension point and trace-friendly plan contract.
         steps: List[PlanStep] = [
@@ -60,15 +103,118 @@ class PlannerAI:
             coherence_reason=coherence_reason,
         )
 
+    def speculative_retrieve_params(self, user_query: UserQuery) -> Dict[str, Any]:
+        """Retrieve params for the original query, available before the planner LLM call.
+
+        Scope (years, doc types, year slices) only depends on the original query and
+        client context, so these match the plan's params except `revised_query`.
+        """
+        context = user_query.context or {}
+        original_query = str(context.get("original_query") or user_query.query).strip()
+        return self._retrieve_params(original_query, original_query, context)
+
+    def _retrieve_params(self, original_query: str, revised_query: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        requested_years = [int(year) for year in context.get("requested_years", []) if str(year).isdigit()]
+        scope = self.analyze_scope(original_query)
+        if requested_years:
+            year_mode = "explicit"
+        elif scope.years:
+            # Client-sent years always win; inferred years only fill the gap.
+            requested_years, year_mode = scope.years, "inferred"
+        else:
+            year_mode = "none"
+
+        retrieve_params: Dict[str, Any] = {
+            "original_query": original_query,
+            "revised_query": revised_query,
+            "year_mode": year_mode,
+            "requested_years": requested_years,
+            "doc_types": scope.doc_types,
+            "recent_year_window": self.config.recent_year_window,
+        }
+        year_slices = self._year_slices(scope, requested_years, year_mode)
+        if year_slices:
+            retrieve_params["year_slices"] = year_slices
+        return retrieve_params
+
+    def analyze_scope(self, query: str) -> QueryScope:
+        """Deterministic FY/doc-type scope from query text (empty when the analyzer is disabled)."""
+        if not self.config.query_analyzer_enabled:
+            return QueryScope()
+        return analyze_query(
+            query,
+            corpus_earliest_fy=self.config.corpus_earliest_fy,
+            corpus_latest_fy=self.config.corpus_latest_fy,
+        )
+
+    def _year_slices(self, scope: QueryScope, requested_years: List[int], year_mode: str) -> List[List[int]]:
+        """Per-period retrieval slices for comparison questions (empty = single retrieval).
+
+        Inferred periods ("before vs after COVID") become one slice each; otherwise
+        each requested year is a slice. More slices than AGENT_FANOUT_MAX_SLICES are
+        grouped into contiguous periods so per-slice quotas stay meaningful.
+        """
+        if not self.config.fanout_enabled or not scope.comparative or len(requested_years) < 2:
+            return []
+        if year_mode == "inferred" and len(scope.periods) >= 2:
+            slices = [sorted(set(period)) for period in scope.periods]
+        else:
+            slices = [[year] for year in sorted(set(requested_years))]
+        if len(slices) > self.config.fanout_max_slices:
+            years = sorted({year for period in slices for year in period})
+            size, remainder = divmod(len(years), self.config.fanout_max_slices)
+            slices, start = [], 0
+            for idx in range(self.config.fanout_max_slices):
+                end = start + size + (1 if idx < remainder else 0)
+                slices.append(years[start:end])
+                start = end
+        return slices
+
+    def _local_planner_output(self, original_query: str, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Planner output without an LLM call (pre-filter reject or cache hit), else None."""
+        if self.coherence_prefilter is not None:
+            verdict = self.coherence_prefilter.assess(original_query)
+            if verdict.incoherent:
+                return {
+                    "revised_query": original_query,
+                    "coherence": "incoherent",
+                    "coherence_reason": f"prefilter:{verdict.reason}",
+                }
+        cache_key = self._output_cache_key(original_query, context)
+        return self.output_cache.get(cache_key) if cache_key is not None else None
+
+    def _store_planner_output(self, original_query: str, context: Dict[str, Any], planner_output: Dict[str, Any]) -> None:
+        cache_key = self._output_cache_key(original_query, context)
+        if cache_key is not None:
+            self.output_cache.put(cache_key, planner_output)
+
+    def _output_cache_key(self, original_query: str, context: Dict[str, Any]) -> Optional[str]:
+        # Only deterministic (temperature 0) outputs are cacheable.
+        if self.output_cache is None or self.config.planner_temperature != 0:
+            return None
+        return self.output_cache.key(
+            self.config.planner_model, original_query, str(context.get("revised_query") or original_query)
+        )
+
     def _generate_planner_output(self, original_query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Call the planner LLM and parse revised_query + coherence fields."""
         model = self._get_planner_model()
+        response = model.invoke(self._planner_prompt(original_query, context))
+        return self._parse_planner_response(response)
+
+    async def _agenerate_planner_output(self, original_query: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        model = self._get_planner_model()
+        response = await model.ainvoke(self._planner_prompt(original_query, context))
+        return self._parse_planner_response(response)
+
+    def _planner_prompt(self, original_query: str, context: Dict[str, Any]):
         payload = {
             "original_query": original_query,
             "current_revised_query": context.get("revised_query") or original_query,
         }
-        prompt = planner_prompts.build_planner_prompt(payload_json=json.dumps(payload))
-        response = model.invoke(prompt)
+        return planner_prompts.build_planner_prompt(payload_json=json.dumps(payload))
+
+    def _parse_planner_response(self, response) -> Dict[str, Any]:
         raw = str(getattr(response, "content", "")).strip()
         if raw.startswith("```"):
             raw = raw.strip("`")
@@ -87,11 +233,13 @@ class PlannerAI:
         }
 
     def _get_planner_model(self):
-        """Lazily construct the planner chat model."""
+        """Lazily fetch the planner chat model from the process-wide client registry."""
         if self._planner_model is not None:
             return self._planner_model
 
-        from langchain_openai import ChatOpenAI
-
-        self._planner_model = ChatOpenAI(model=self.config.planner_model, temperature=self.config.planner_temperature)
+        # Shared across per-request planners so calls reuse pooled keep-alive connections.
+        registry = get_llm_client_registry(self.config)
+        self._planner_model = registry.chat_model(
+            self.config.planner_model, self.config.planner_temperature, stage="planner"
+        )
         return self._planner_model
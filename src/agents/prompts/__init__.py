@@ -1,7 +1,16 @@
 """Prompt builders for planner and specialist LLM calls."""
 
+from .caching import STAGE_PREFIXES, estimated_prefix_tokens, prefix_fingerprint, prompt_cache_key
 from .planner import build_planner_prompt
 from .reflection import build_reflection_prompt
 from .synthesis import build_synthesis_prompt
 
-__all__ = ["build_planner_prompt", "build_reflection_prompt", "build_synthesis_prompt"]
+__all__ = [
+    "STAGE_PREFIXES",
+    "build_planner_prompt",
+    "build_reflection_prompt",
+    "build_synthesis_prompt",
+    "estimated_prefix_tokens",
+    "prefix_fingerprint",
+    "prompt_cache_key",
+]
@@ -0,0 +1,35 @@
+"""Prefix-cache layout shared by the prompt builders.
+
+Provider prefix caching (e.g. OpenAI, from 1024 prompt tokens) only reuses
+the longest byte-identical prompt prefix. Every builder therefore emits:
+1. the stage's static system prompt (a module constant, never formatted), then
+2. one human message whose template starts with a static header, with all
+   per-request values after it, largest last (evidence JSON, answer).
+
+`prompt_cache_key(stage)` names the prefix by content hash. Requests that
+share a prefix are routed to the same provider cache, and editing a prompt
+changes the key.
+"""
+
+import hashlib
+
+from . import planner, reflection, synthesis
+
+STAGE_PREFIXES = {
+    "planner": planner.PLANNER_SYSTEM_PROMPT,
+    "synthesis": synthesis.SYNTHESIS_SYSTEM_PROMPT,
+    "reflection": reflection.REFLECTION_SYSTEM_PROMPT,
+}
+
+
+def prefix_fingerprint(stage: str) -> str:
+    return hashlib.sha1(STAGE_PREFIXES[stage].encode("utf-8")).hexdigest()[:12]
+
+
+def prompt_cache_key(stage: str) -> str:
+    return f"sg-budget-{stage}-{prefix_fingerprint(stage)}"
+
+
+def estimated_prefix_tokens(stage: str) -> int:
+    """~4 characters per token; prefixes under the provider minimum are never cached."""
+    return (len(STAGE_PREFIXES[stage]) + 3) // 4
@@ -1,12 +1,15 @@
 """CLI entrypoint for quick local debugging without the API/UI."""
 
 import argparse
+from pathlib import Path
 from typing import Optional, Sequence
 
 from dotenv import load_dotenv
 
 from .core.config import AgentConfig
 from .core.manager import Manager
+from .planner.cache import PlannerOutputCache
+from .planner.prefilter import CoherencePrefilter
 from .planner.service import PlannerAI
 from .specialists.service import MCPReadinessError, Specialists
 from .core.types import UserQuery
@@ -34,7 +37,21 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parser.parse_args(argv)
 
     config = apply_cli_overrides(AgentConfig.from_env(), args)
-    planner = PlannerAI(config)
+    planner_cache = None
+    if config.planner_cache_enabled:
+        planner_cache = PlannerOutputCache(
+            config.planner_cache_path,
+            ttl_seconds=config.planner_cache_ttl_seconds,
+            max_entries=config.planner_cache_max_entries,
+        )
+    coherence_prefilter = None
+    if config.coherence_prefilter_enabled:
+        coherence_prefilter = CoherencePrefilter.from_artifact(
+            Path("artifacts") / "bm25_model.pkl",
+            min_vocab_ratio=config.coherence_prefilter_min_vocab_ratio,
+            min_idf_mass=config.coherence_prefilter_min_idf_mass,
+        )
+    planner = PlannerAI(config, output_cache=planner_cache, coherence_prefilter=coherence_prefilter)
     manager = Manager(config)
 
     try:
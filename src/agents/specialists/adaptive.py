@@ -0,0 +1,179 @@
+"""Adaptive hybrid retrieval: skip or shrink the weaker search source per query.
+
+Paths (recorded on the HitBatch as `retrieval_path` and logged):
+- `hybrid`: both sources at full top_k (adaptive disabled, or no decisive signal)
+- `dense_only`: the BM25 query vector is (nearly) empty or carries little IDF
+  mass (only common terms), so sparse is skipped
+- `sparse_only`: exact-term query whose sparse top hit is well separated; dense skipped
+- `sparse_then_dense`: exact-term query, but sparse results were ambiguous
+- `dense_then_sparse_shrunk`: dense top hit well separated; sparse runs at a reduced limit
+
+Saved latency is estimated from an EWMA of full-limit search latency per source.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PATH_HYBRID = "hybrid"
+PATH_DENSE_ONLY = "dense_only"
+PATH_SPARSE_ONLY = "sparse_only"
+PATH_SPARSE_THEN_DENSE = "sparse_then_dense"
+PATH_DENSE_THEN_SPARSE_SHRUNK = "dense_then_sparse_shrunk"
+RETRIEVAL_PATHS = (
+    PATH_HYBRID,
+    PATH_DENSE_ONLY,
+    PATH_SPARSE_ONLY,
+    PATH_SPARSE_THEN_DENSE,
+    PATH_DENSE_THEN_SPARSE_SHRUNK,
+)
+
+
+@dataclass(frozen=True)
+class AdaptiveRetrievalPolicy:
+    """Thresholds for choosing a retrieval path (values come from AgentConfig)."""
+
+    sparse_min_coverage: float = 0.5  # below this share of in-vocab query terms, sparse is skipped
+    sparse_min_mass: float = 1.0  # below this summed query idf (only common terms), sparse is skipped
+    sparse_decisive_idf: float = 0.8  # rarest term idf / corpus max idf that marks an exact-term query
+    sparse_decisive_max_terms: int = 6  # exact-term queries are short ("GSTV U-Save")
+    score_gap: float = 0.2  # relative top-1 vs top-2 gap that makes a result set decisive
+    shrink_ratio: float = 0.5  # share of top_k kept for a shrunk secondary source
+
+    def sparse_is_decisive(self, signal) -> bool:
+        return (
+            signal.total_terms <= self.sparse_decisive_max_terms
+            and signal.coverage >= 0.999
+            and signal.max_idf_ratio >= self.sparse_decisive_idf
+        )
+
+    def sparse_is_weak(self, signal) -> bool:
+        return (
+            signal.matched_terms == 0
+            or signal.coverage < self.sparse_min_coverage
+            or signal.mass < self.sparse_min_mass
+        )
+
+    def is_separated(self, results: Sequence[Any]) -> bool:
+        """True when the top hit clearly beats the runner-up (relative score gap)."""
+        if not results:
+            return False
+        top = float(getattr(results[0], "score", 0.0))
+        if len(results) == 1:
+            return top > 0
+        runner_up = float(getattr(results[1], "score", 0.0))
+        return top > 0 and (top - runner_up) / top >= self.score_gap
+
+    def shrunk_limit(self, top_k: int) -> int:
+        return max(1, int(round(top_k * self.shrink_ratio)))
+
+
+class AdaptiveRetrievalStats:
+    """Thread-safe path counters plus EWMA search latency for saved-latency estimates."""
+
+    def __init__(self, alpha: float = 0.2):
+        self._alpha = alpha
+        self._lock = threading.Lock()
+        self._paths = {path: 0 for path in RETRIEVAL_PATHS}
+        self._ewma_ms: dict[str, Optional[float]] = {"dense": None, "sparse": None}
+        self._saved_ms = 0.0
+
+    def observe_search(self, source: str, elapsed_ms: float) -> None:
+        """Record a full-limit search latency for `source` ("dense" or "sparse")."""
+        with self._lock:
+            previous = self._ewma_ms[source]
+            self._ewma_ms[source] = elapsed_ms if previous is None else (
+                self._alpha * elapsed_ms + (1 - self._alpha) * previous
+            )
+
+    def record_path(
+        self,
+        path: str,
+        *,
+        skipped: Sequence[str] = (),
+        shrunk: Optional[tuple[str, float]] = None,
+    ) -> float:
+        """Count a path; return the estimated latency saved versus a full hybrid search."""
+        with self._lock:
+            self._paths[path] += 1
+            saved = sum(self._ewma_ms[source] or 0.0 for source in skipped)
+            if shrunk is not None:
+                source, elapsed_ms = shrunk
+                saved += max(0.0, (self._ewma_ms[source] or elapsed_ms) - elapsed_ms)
+            self._saved_ms += saved
+        logger.info("adaptive retrieval path=%s skipped=%s est_saved_ms=%.1f", path, list(skipped), saved)
+        return saved
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            queries = sum(self._paths.values())
+            return {
+                "paths": dict(self._paths),
+                "ewma_dense_ms": self._ewma_ms["dense"],
+                "ewma_sparse_ms": self._ewma_ms["sparse"],
+                "estimated_saved_ms_total": self._saved_ms,
+                "estimated_saved_ms_per_query": (self._saved_ms / queries) if queries else 0.0,
+            }
+
+
+def search_adaptively(
+    *,
+    top_k: int,
+    dense_search: Callable[[int], Optional[list]],
+    sparse_search: Callable[[int], Optional[list]],
+    policy: Optional[AdaptiveRetrievalPolicy] = None,
+    stats: Optional[AdaptiveRetrievalStats] = None,
+    signal=None,
+) -> tuple[str, list, list]:
+    """Run dense/sparse searches along the chosen path; returns (path, dense_hits, sparse_hits).
+
+    Search callables take a limit and return one query's results, or None when
+    they had nothing to search (e.g. an empty sparse vector).
+    """
+    full_limit = max(1, int(top_k))
+
+    def timed(source: str, search: Callable[[int], Optional[list]], limit: int) -> tuple[list, float]:
+        started = time.perf_counter()
+        results = search(limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        if results is None:
+            return [], 0.0
+        if stats is not None and limit == full_limit:
+            stats.observe_search(source, elapsed_ms)
+        return results, elapsed_ms
+
+    skipped: tuple[str, ...] = ()
+    shrunk = None
+    if policy is None or signal is None:
+        path = PATH_HYBRID
+        dense_hits, _ = timed("dense", dense_search, full_limit)
+        sparse_hits, _ = timed("sparse", sparse_search, full_limit)
+    elif policy.sparse_is_weak(signal):
+        path, skipped = PATH_DENSE_ONLY, ("sparse",)
+        dense_hits, _ = timed("dense", dense_search, full_limit)
+        sparse_hits = []
+    elif policy.sparse_is_decisive(signal):
+        sparse_hits, _ = timed("sparse", sparse_search, full_limit)
+        if policy.is_separated(sparse_hits):
+            path, skipped = PATH_SPARSE_ONLY, ("dense",)
+            dense_hits = []
+        else:
+            path = PATH_SPARSE_THEN_DENSE
+            dense_hits, _ = timed("dense", dense_search, full_limit)
+    else:
+        dense_hits, _ = timed("dense", dense_search, full_limit)
+        if policy.is_separated(dense_hits):
+            path = PATH_DENSE_THEN_SPARSE_SHRUNK
+            sparse_hits, elapsed_ms = timed("sparse", sparse_search, policy.shrunk_limit(full_limit))
+            shrunk = ("sparse", elapsed_ms)
+        else:
+            path = PATH_HYBRID
+            sparse_hits, _ = timed("sparse", sparse_search, full_limit)
+
+    if stats is not None:
+        stats.record_path(path, skipped=skipped, shrunk=shrunk)
+    return path, dense_hits, sparse_hits
@@ -0,0 +1,87 @@
+"""Cascade reranking: cheap pre-pruning, then batched cross-encoder scoring with early exit.
+
+Stage 1 orders candidates by a cheap score and prunes the tail. The cheap
+score is the retrieval-stage merged score (RRF over dense similarity and BM25,
+plus recency), or a small prefilter cross-encoder when one is configured.
+
+Stage 2 scores survivors with the full cross-encoder in cheap-score order,
+`batch_size` pairs at a time. It stops once the top-`stable_top_n` set did not
+change over the last batch and the weakest member of that set beats the best
+score in that batch by `stability_margin`. Candidates further down the cheap
+order are then unlikely to enter the set.
+
+Rows that were pruned or never scored keep a NaN raw score; rerank orders
+them after every scored row (see `_order_by_rerank_scores` in rerank.py).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from ..core.hit_batch import HitBatch
+from .scoring import rank_descending
+
+
+@dataclass(frozen=True)
+class CascadePolicy:
+    """Cascade knobs (values come from AgentConfig)."""
+
+    keep_ratio: float = 0.5  # share of candidates that survive the cheap stage
+    min_keep: int = 16  # never prune below this many survivors
+    batch_size: int = 8  # full cross-encoder pairs per stage-2 step
+    stable_top_n: int = 8  # size of the set that must be stable (synthesis evidence)
+    stability_margin: float = 0.5  # raw cross-encoder score margin for early exit
+
+    def survivors(self, candidate_count: int) -> int:
+        keep = max(self.min_keep, self.stable_top_n, math.ceil(candidate_count * self.keep_ratio))
+        return min(candidate_count, keep)
+
+
+@dataclass
+class CascadeOutcome:
+    raw_scores: np.ndarray  # float64 per candidate row, NaN when not scored
+    pruned: int  # rows dropped by the cheap stage
+    scored: int  # rows scored by the full cross-encoder
+    early_exit: bool
+
+
+def cascade_scores(
+    candidates: HitBatch,
+    *,
+    policy: CascadePolicy,
+    score_rows: Callable[[Sequence[int]], np.ndarray],
+    cheap_scores: Optional[np.ndarray] = None,
+) -> CascadeOutcome:
+    """Run the cascade over one query's candidates.
+
+    `score_rows` returns full cross-encoder raw scores for the given rows.
+    `cheap_scores` overrides the stage-1 score (e.g. prefilter model output).
+    """
+    size = len(candidates)
+    raw_scores = np.full(size, np.nan)
+    if not size:
+        return CascadeOutcome(raw_scores=raw_scores, pruned=0, scored=0, early_exit=False)
+
+    cheap = candidates.merged_scores if cheap_scores is None else np.asarray(cheap_scores, dtype=np.float64)
+    survivors = rank_descending(cheap)[: policy.survivors(size)]
+    pruned = size - len(survivors)
+
+    previous_top: Optional[frozenset] = None
+    scored = 0
+    for start in range(0, len(survivors), max(1, policy.batch_size)):
+        rows = survivors[start : start + max(1, policy.batch_size)]
+        batch_scores = np.asarray(score_rows(rows.tolist()), dtype=np.float64).reshape(-1)
+        raw_scores[rows] = batch_scores
+        scored += len(rows)
+        if scored < policy.stable_top_n or scored >= len(survivors):
+            continue
+        scored_rows = survivors[:scored]
+        ranked = scored_rows[rank_descending(raw_scores[scored_rows])][: policy.stable_top_n]
+        top = frozenset(ranked.tolist())
+        weakest = float(raw_scores[ranked[-1]])
+        if top == previous_top and weakest - float(batch_scores.max()) >= policy.stability_margin:
+            return CascadeOutcome(raw_scores=raw_scores, pruned=pruned, scored=scored, early_exit=True)
+        previous_top = top
+    return CascadeOutcome(raw_scores=raw_scores, pruned=pruned, scored=scored, early_exit=False)
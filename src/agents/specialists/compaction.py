@@ -0,0 +1,98 @@
+"""Collapse overlapping neighbour chunks before rerank.
+
+Ingestion chunks each document into overlapping word windows (see
+`chunk_text` in src/vector_db/load_data.py), so retrieval often returns
+c{i} and c{i+1} of the same document together. Scoring both with the
+cross-encoder wastes rerank pairs and duplicates synthesis evidence.
+
+Per `doc_id`, rows whose `[chunk_start, chunk_end)` word spans overlap are
+clustered (a cluster never spans more than `max_span_words`, so a long run
+of retrieved neighbours is not collapsed into one row); the best-scoring row
+represents the cluster. With `merge_spans=True` the representative's text is
+widened to the union span so neighbouring context is kept once.
+Rows without offsets are passed through unchanged.
+"""
+
+from collections import defaultdict
+
+from ..core.hit_batch import MISSING_OFFSET, HitBatch
+
+
+def _merge_span_texts(batch: HitBatch, rows: list[int]) -> str:
+    """Union of overlapping word windows, skipping the overlap already emitted."""
+    ordered = sorted(rows, key=lambda row: int(batch.chunk_starts[row]))
+    words = batch.texts[ordered[0]].split()
+    covered_end = int(batch.chunk_ends[ordered[0]])
+    for row in ordered[1:]:
+        end = int(batch.chunk_ends[row])
+        if end <= covered_end:
+            continue
+        skip = covered_end - int(batch.chunk_starts[row])
+        words.extend(batch.texts[row].split()[max(0, skip):])
+        covered_end = end
+    return " ".join(words)
+
+
+def compact_overlapping_chunks(
+    batch: HitBatch,
+    *,
+    merge_spans: bool = False,
+    max_span_words: int = 800,
+) -> HitBatch:
+    """Keep one representative per cluster of overlapping same-document chunks.
+
+    Output keeps the input (score) order of the surviving representatives.
+    """
+    if len(batch) < 2:
+        return batch
+
+    by_doc: dict[str, list[int]] = defaultdict(list)
+    for row, doc_id in enumerate(batch.doc_ids):
+        if doc_id and batch.chunk_starts[row] != MISSING_OFFSET and batch.chunk_ends[row] != MISSING_OFFSET:
+            by_doc[doc_id].append(row)
+
+    dropped: set[int] = set()
+    merged: dict[int, tuple[str, int, int]] = {}
+    for rows in by_doc.values():
+        if len(rows) < 2:
+            continue
+        rows.sort(key=lambda row: int(batch.chunk_starts[row]))
+        clusters: list[list[int]] = [[rows[0]]]
+        cluster_start = int(batch.chunk_starts[rows[0]])
+        cluster_end = int(batch.chunk_ends[rows[0]])
+        for row in rows[1:]:
+            start, end = int(batch.chunk_starts[row]), int(batch.chunk_ends[row])
+            too_wide = max(end, cluster_end) - cluster_start > max_span_words
+            if start < cluster_end and not too_wide:
+                clusters[-1].append(row)
+                cluster_end = max(cluster_end, end)
+            else:
+                clusters.append([row])
+                cluster_start, cluster_end = start, end
+        for cluster in clusters:
+            if len(cluster) < 2:
+                continue
+            # Scores are distinct floats in practice; ties fall to the earlier (higher-ranked) row.
+            best = min(cluster, key=lambda row: (-float(batch.scores[row]), row))
+            dropped.update(row for row in cluster if row != best)
+            if merge_spans:
+                merged[best] = (
+                    _merge_span_texts(batch, cluster),
+                    min(int(batch.chunk_starts[row]) for row in cluster),
+                    max(int(batch.chunk_ends[row]) for row in cluster),
+                )
+
+    if not dropped:
+        return batch
+    kept = [row for row in range(len(batch)) if row not in dropped]
+    compacted = batch.take(kept)  # take() copies every column, so in-place edits below are safe
+    if merged:
+        position = {row: idx for idx, row in enumerate(kept)}
+        for row, (text, start, end) in merged.items():
+            idx = position[row]
+            compacted.texts[idx] = text
+            compacted.chunk_starts[idx] = start
+            compacted.chunk_ends[idx] = end
+    compacted.compacted_rows = batch.compacted_rows + len(dropped)
+    return compacted
+
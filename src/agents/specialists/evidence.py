@@ -0,0 +1,148 @@
+"""Token-budgeted evidence packing for the synthesis prompt.
+
+Synthesis used to send the first 8 reranked hits as full ~400-word chunks
+with float scores, whatever their relevance. The packer walks the reranked
+hits in rank order. It keeps only the query-relevant sentences of each chunk
+(sentences sharing the most query terms, in their original order; the lead
+sentence when none match). Sentences already packed from an overlapping
+chunk are skipped. Packing stops once the token budget is filled. Rank order
+comes from the rerank scores, so the scores themselves are not sent.
+
+Token counts are estimates (~4 characters per token for English BPE
+tokenizers), applied the same way to the packed and the legacy evidence JSON,
+so per-request savings are comparable.
+"""
+
+import json
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Sequence, Union
+
+from ..core.hit_batch import HitBatch
+from ..core.types import RetrievalHit
+
+LEGACY_EVIDENCE_ROWS = 8  # full chunks sent before packing
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+|\n+")
+_TERM = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it my of on or the to was what when "
+    "which who will with".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _terms(text: str) -> set[str]:
+    return {term for term in _TERM.findall(text.lower()) if term not in _STOPWORDS}
+
+
+def _normalize_sentence(sentence: str) -> str:
+    return " ".join(_TERM.findall(sentence.lower()))
+
+
+def legacy_evidence(hits: Union[HitBatch, Sequence[RetrievalHit]]) -> list[dict[str, Any]]:
+    """Unpacked evidence: the first 8 hits as full chunks with scores."""
+    batch = HitBatch.coerce(hits)
+    return [
+        {"source_path": batch.source_paths[idx], "text": batch.texts[idx], "score": float(batch.scores[idx])}
+        for idx in range(min(LEGACY_EVIDENCE_ROWS, len(batch)))
+    ]
+
+
+@dataclass
+class PackedEvidence:
+    items: list[dict[str, str]]  # {"source_path", "text"} in rank order
+    prompt_tokens: int
+    baseline_tokens: int  # legacy evidence JSON for the same hits
+    chunks_used: int
+    sentences_kept: int
+    duplicate_sentences: int
+
+
+class EvidencePacker:
+    """Fills a token budget with query-relevant sentences from reranked hits."""
+
+    def __init__(self, *, token_budget: int = 2000, max_sentences_per_chunk: int = 4):
+        self.token_budget = token_budget
+        self.max_sentences_per_chunk = max_sentences_per_chunk
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._prompt_tokens = 0
+        self._baseline_tokens = 0
+        self._chunks_used = 0
+        self._duplicate_sentences = 0
+
+    def pack(
+        self, original_query: str, revised_query: str, hits: Union[HitBatch, Sequence[RetrievalHit]]
+    ) -> PackedEvidence:
+        batch = HitBatch.coerce(hits)
+        query_terms = _terms(original_query) | _terms(revised_query)
+        seen: set[str] = set()
+        items: list[dict[str, str]] = []
+        used = kept_total = duplicates = 0
+        for row in range(len(batch)):
+            sentences = [sentence.strip() for sentence in _SENTENCE_SPLIT.split(batch.texts[row] or "")]
+            sentences = [sentence for sentence in sentences if sentence]
+            kept = []
+            for idx in self._relevant_sentences(sentences, query_terms):
+                key = _normalize_sentence(sentences[idx])
+                if key in seen:
+                    duplicates += 1
+                    continue
+                kept.append(sentences[idx])
+            if not kept:
+                continue
+            item = {"source_path": batch.source_paths[row], "text": " ".join(kept)}
+            # Trim the lowest-placed sentences until the item fits; the first item always keeps one.
+            while len(kept) > 1 and used + estimate_tokens(json.dumps(item)) > self.token_budget:
+                kept.pop()
+                item["text"] = " ".join(kept)
+            cost = estimate_tokens(json.dumps(item))
+            if items and used + cost > self.token_budget:
+                break
+            items.append(item)
+            seen.update(_normalize_sentence(sentence) for sentence in kept)
+            kept_total += len(kept)
+            used += cost
+        packed = PackedEvidence(
+            items=items,
+            prompt_tokens=estimate_tokens(json.dumps(items)),
+            baseline_tokens=estimate_tokens(json.dumps(legacy_evidence(batch))),
+            chunks_used=len(items),
+            sentences_kept=kept_total,
+            duplicate_sentences=duplicates,
+        )
+        with self._lock:
+            self._requests += 1
+            self._prompt_tokens += packed.prompt_tokens
+            self._baseline_tokens += packed.baseline_tokens
+            self._chunks_used += packed.chunks_used
+            self._duplicate_sentences += duplicates
+        return packed
+
+    def _relevant_sentences(self, sentences: list[str], query_terms: set[str]) -> list[int]:
+        """Indices of the best query-overlap sentences, in text order (lead sentence when none overlap)."""
+        overlaps = [(len(_terms(sentence) & query_terms), idx) for idx, sentence in enumerate(sentences)]
+        ranked = sorted((item for item in overlaps if item[0] > 0), key=lambda item: (-item[0], item[1]))
+        chosen = sorted(idx for _, idx in ranked[: self.max_sentences_per_chunk])
+        return chosen or ([0] if sentences else [])
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            requests = self._requests
+            return {
+                "requests": requests,
+                "token_budget": self.token_budget,
+                "avg_prompt_tokens": (self._prompt_tokens / requests) if requests else 0.0,
+                "avg_baseline_tokens": (self._baseline_tokens / requests) if requests else 0.0,
+                "prompt_tokens_saved_total": self._baseline_tokens - self._prompt_tokens,
+                "prompt_tokens_saved_per_request": (
+                    (self._baseline_tokens - self._prompt_tokens) / requests if requests else 0.0
+                ),
+                "avg_chunks_used": (self._chunks_used / requests) if requests else 0.0,
+                "duplicate_sentences_dropped": self._duplicate_sentences,
+            }
@@ -0,0 +1,55 @@
+"""Per-period retrieval fan-out for comparison questions.
+
+A question like "How did healthcare priorities change before vs after COVID?"
+retrieved as one search is dominated by whichever period matches best. The
+planner splits such questions into `year_slices`; each slice is retrieved with
+its own FY scope and a share of `top_k`, and the slice results are interleaved
+by rank so every period reaches rerank (the global `top_k` is unchanged).
+"""
+
+from typing import Sequence
+
+from ..core.hit_batch import HitBatch
+from ..core.types import RetrieveContextPayload
+
+
+def slice_quotas(top_k: int, slice_count: int) -> list[int]:
+    """Split `top_k` across slices (earlier slices take the remainder; each gets >= 1)."""
+    size, remainder = divmod(max(1, int(top_k)), slice_count)
+    return [max(1, size + (1 if idx < remainder else 0)) for idx in range(slice_count)]
+
+
+def slice_contexts(retrieve_context: RetrieveContextPayload) -> list[RetrieveContextPayload]:
+    """One retrieve context per year slice, each scoped to that slice's years."""
+    contexts: list[RetrieveContextPayload] = []
+    for years in retrieve_context.get("year_slices", []):
+        context: RetrieveContextPayload = {
+            key: value for key, value in retrieve_context.items() if key != "year_slices"
+        }  # type: ignore[assignment]
+        context["requested_years"] = list(years)
+        contexts.append(context)
+    return contexts
+
+
+def interleave_slices(batches: Sequence[HitBatch], year_expr=None) -> HitBatch:
+    """Round-robin rows across slice batches by rank, dropping repeated chunk_ids."""
+    combined = HitBatch.concat(batches, year_expr=year_expr)
+    offsets = []
+    offset = 0
+    for batch in batches:
+        offsets.append(offset)
+        offset += len(batch)
+
+    order: list[int] = []
+    seen: set[str] = set()
+    for rank in range(max((len(batch) for batch in batches), default=0)):
+        for batch, start in zip(batches, offsets):
+            if rank >= len(batch):
+                continue
+            row = start + rank
+            chunk_id = combined.chunk_ids[row]
+            if chunk_id in seen:
+                continue
+            seen.add(chunk_id)
+            order.append(row)
+    return combined.take(order)
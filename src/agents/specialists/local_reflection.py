@@ -0,0 +1,171 @@
+"""Local evidence-coverage reflection in front of the reflection LLM call.
+
+Reflection used to be a full LLM round trip after synthesis, only to produce
+a confidence score and two notes. `LocalReflectionScorer` scores the answer
+against the reranked hits with cheap lexical signals:
+- `citation_grounding`: share of `(source_path)` citations in the answer that
+  name a retrieved hit (0 when nothing is cited).
+- `sentence_support`: share of answer statements (3+ content terms) whose
+  terms mostly appear in a single hit.
+- `year_coverage`: share of the financial years requested in the query that
+  appear among the hits (1 when the query names none).
+
+The weighted score is used as the confidence only when it is clearly high or
+clearly low. Anything in between goes to the LLM as before. Calibrate the band
+against LLM confidences with `python -m scripts.calibrate_local_reflection`.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence, Union
+
+from ..core.hit_batch import MISSING_YEAR, HitBatch
+from ..core.types import ReflectionResult, RetrievalHit
+from ..planner.analyzer import analyze_query
+
+SUPPORT_HIT_LIMIT = 20  # statements are matched against the top reranked hits only
+_WEIGHTS = {"sentence_support": 0.5, "citation_grounding": 0.3, "year_coverage": 0.2}
+
+_STATEMENT_SPLIT = re.compile(r"(?<=[.!?;])\s+|\n+")
+_CITATION = re.compile(r"\(([^()\s]+[/.][^()\s]+)\)")
+_TERM = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it its may my not of on or that the "
+    "their this to was what when which who will with".split()
+)
+
+
+def _terms(text: str) -> set[str]:
+    return {term for term in _TERM.findall(text.lower()) if term not in _STOPWORDS}
+
+
+@dataclass(frozen=True)
+class ReflectionSignals:
+    citation_grounding: float
+    sentence_support: float
+    year_coverage: float
+    cited_sources: int
+    statements: int
+    missing_years: tuple[int, ...]
+    evidence_count: int
+
+    @property
+    def score(self) -> float:
+        if not self.evidence_count:
+            return 0.0
+        return sum(weight * getattr(self, name) for name, weight in _WEIGHTS.items())
+
+
+class LocalReflectionScorer:
+    """Scores answers against their evidence; decides locally only outside the uncertain band."""
+
+    def __init__(
+        self,
+        *,
+        high_threshold: float = 0.8,
+        low_threshold: float = 0.3,
+        support_overlap: float = 0.5,
+        corpus_earliest_fy: int = 2016,
+        corpus_latest_fy: int = 2025,
+    ):
+        self.high_threshold = high_threshold
+        self.low_threshold = low_threshold
+        self.support_overlap = support_overlap  # share of a statement's terms one hit must contain
+        self.corpus_earliest_fy = corpus_earliest_fy
+        self.corpus_latest_fy = corpus_latest_fy
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "local_ok": 0, "local_low_coverage": 0, "llm_fallbacks": 0}
+
+    def signals(
+        self, original_query: str, revised_query: str, answer: str, hits: Union[HitBatch, Sequence[RetrievalHit]]
+    ) -> ReflectionSignals:
+        batch = HitBatch.coerce(hits)
+        hit_paths = set(batch.source_paths)
+        cited = {match.group(1) for match in _CITATION.finditer(answer)}
+        statements = [terms for terms in map(_terms, _STATEMENT_SPLIT.split(answer)) if len(terms) >= 3]
+        hit_terms = [_terms(text or "") for text in batch.texts[:SUPPORT_HIT_LIMIT]]
+        supported = sum(
+            1
+            for terms in statements
+            if any(len(terms & evidence) >= self.support_overlap * len(terms) for evidence in hit_terms)
+        )
+        requested = self._requested_years(original_query, revised_query)
+        hit_years = {int(year) for year in batch.financial_years if year != MISSING_YEAR}
+        missing = tuple(year for year in requested if year not in hit_years)
+        return ReflectionSignals(
+            citation_grounding=len(cited & hit_paths) / len(cited) if cited else 0.0,
+            sentence_support=supported / len(statements) if statements else 0.0,
+            year_coverage=1.0 - len(missing) / len(requested) if requested else 1.0,
+            cited_sources=len(cited & hit_paths),
+            statements=len(statements),
+            missing_years=missing,
+            evidence_count=len(batch),
+        )
+
+    def reflect(
+        self, original_query: str, revised_query: str, answer: str, hits: Union[HitBatch, Sequence[RetrievalHit]]
+    ) -> Optional[ReflectionResult]:
+        """Local reflection when the score is clearly high or low; None defers to the LLM."""
+        signals = self.signals(original_query, revised_query, answer, hits)
+        score = signals.score
+        if score >= self.high_threshold:
+            outcome = "local_ok"
+        elif score <= self.low_threshold:
+            outcome = "local_low_coverage"
+        else:
+            outcome = "llm_fallbacks"
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts[outcome] += 1
+        if outcome == "llm_fallbacks":
+            return None
+        return self._result(signals, ok=outcome == "local_ok")
+
+    def estimate(
+        self, original_query: str, revised_query: str, answer: str, hits: Union[HitBatch, Sequence[RetrievalHit]]
+    ) -> ReflectionResult:
+        """Local reflection whatever the band, for when the LLM call cannot fit the request deadline."""
+        signals = self.signals(original_query, revised_query, answer, hits)
+        return self._result(signals, ok=signals.score > self.low_threshold)
+
+    def _result(self, signals: ReflectionSignals, *, ok: bool) -> ReflectionResult:
+        score = signals.score
+        applicability_note = (
+            f"{signals.sentence_support:.0%} of answer statements are supported by retrieved evidence; "
+            f"{signals.cited_sources} retrieved source(s) cited."
+        )
+        if signals.missing_years:
+            years = ", ".join(f"FY{year}" for year in signals.missing_years)
+            uncertainty_note = f"No retrieved evidence for {years}; verify those years."
+        elif not ok:
+            uncertainty_note = "Much of the answer is not directly supported by retrieved evidence; verify scope and year details."
+        else:
+            uncertainty_note = "Eligibility and amounts still depend on individual circumstances."
+        return ReflectionResult(
+            reason="ok" if ok else "low_coverage",
+            confidence=max(0.0, min(score, 1.0)),
+            comments=f"{applicability_note} {uncertainty_note}",
+            applicability_note=applicability_note,
+            uncertainty_note=uncertainty_note,
+        )
+
+    def _requested_years(self, original_query: str, revised_query: str) -> list[int]:
+        scope = analyze_query(
+            f"{original_query}\n{revised_query}",
+            corpus_earliest_fy=self.corpus_earliest_fy,
+            corpus_latest_fy=self.corpus_latest_fy,
+        )
+        return scope.years
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        requests = counts["requests"]
+        local = counts["local_ok"] + counts["local_low_coverage"]
+        return {
+            **counts,
+            "high_threshold": self.high_threshold,
+            "low_threshold": self.low_threshold,
+            "llm_calls_saved_rate": (local / requests) if requests else 0.0,
+        }
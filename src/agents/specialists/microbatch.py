@@ -0,0 +1,145 @@
+"""Cross-request micro-batching for the cross-encoder.
+
+Concurrent `/ask` threads each rerank a few dozen pairs. Calling
+`CrossEncoder.predict` per request makes torch intra-op threads contend and
+pays per-call overhead N times. `MicroBatchScheduler` wraps the model with the
+same `predict(pairs)` interface. A single dispatcher thread collects pending
+pairs from all callers for up to `max_wait_ms` (or until `max_batch_pairs`),
+runs them through the model, and routes each caller's slice of scores back.
+`max_batch_pairs` also caps a single forward pass. A caller with more pairs
+than that (e.g. `/ask/batch` `rerank_many`) runs alone, split into passes of
+at most `max_batch_pairs`.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+import numpy as np
+
+HISTOGRAM_BOUNDS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+def _bucket(value: int) -> str:
+    for bound in HISTOGRAM_BOUNDS:
+        if value <= bound:
+            return f"<={bound}"
+    return f">{HISTOGRAM_BOUNDS[-1]}"
+
+
+@dataclass
+class _PendingPredict:
+    pairs: list
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatchScheduler:
+    """Drop-in `predict(pairs)` wrapper that batches concurrent callers into one forward pass."""
+
+    def __init__(self, model, *, max_wait_ms: float = 4.0, max_batch_pairs: int = 256):
+        self.model = model
+        self.max_wait_seconds = max_wait_ms / 1000.0
+        self.max_batch_pairs = max_batch_pairs
+        self._queue: deque[_PendingPredict] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._pending_pairs = 0
+        self._peak_pending_pairs = 0
+        self._batches = 0
+        self._pairs = 0
+        self._batch_pairs_histogram: dict[str, int] = {}
+        self._batch_requests_histogram: dict[str, int] = {}
+        self._queue_depth_histogram: dict[str, int] = {}
+
+    def predict(self, pairs: Sequence[Any], **_ignored) -> np.ndarray:
+        """Score `pairs`; blocks until the batch containing them has run."""
+        if not pairs:
+            return np.empty(0)
+        pending = _PendingPredict(pairs=list(pairs))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Rerank scheduler is closed.")
+            self._queue.append(pending)
+            self._pending_pairs += len(pending.pairs)
+            self._peak_pending_pairs = max(self._peak_pending_pairs, self._pending_pairs)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch_loop, name="rerank-microbatch", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return pending.future.result()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                # Hold the first caller briefly so concurrent callers can join its forward pass.
+                deadline = time.monotonic() + self.max_wait_seconds
+                while self._pending_pairs < self.max_batch_pairs and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                queue_depth = len(self._queue)
+                batch: list[_PendingPredict] = []
+                size = 0
+                # The first caller always runs; if it alone exceeds max_batch_pairs, `_run_batch` splits it.
+                while self._queue and (not batch or size + len(self._queue[0].pairs) <= self.max_batch_pairs):
+                    pending = self._queue.popleft()
+                    batch.append(pending)
+                    size += len(pending.pairs)
+                self._pending_pairs -= size
+            self._run_batch(batch, size, queue_depth)
+
+    def _run_batch(self, batch: list[_PendingPredict], size: int, queue_depth: int) -> None:
+        try:
+            pairs = [pair for pending in batch for pair in pending.pairs]
+            step = max(1, self.max_batch_pairs)
+            scores = np.concatenate(
+                [
+                    np.asarray(self.model.predict(chunk, batch_size=len(chunk)), dtype=np.float64).reshape(-1)
+                    for chunk in (pairs[start : start + step] for start in range(0, len(pairs), step))
+                ]
+            )
+        except Exception as exc:
+            for pending in batch:
+                pending.future.set_exception(exc)
+            return
+        offset = 0
+        for pending in batch:
+            pending.future.set_result(scores[offset : offset + len(pending.pairs)])
+            offset += len(pending.pairs)
+        with self._cond:
+            self._batches += 1
+            self._pairs += size
+            for histogram, value in (
+                (self._batch_pairs_histogram, size),
+                (self._batch_requests_histogram, len(batch)),
+                (self._queue_depth_histogram, queue_depth),
+            ):
+                label = _bucket(value)
+                histogram[label] = histogram.get(label, 0) + 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "pending_pairs": self._pending_pairs,
+                "peak_pending_pairs": self._peak_pending_pairs,
+                "batches": self._batches,
+                "avg_batch_pairs": (self._pairs / self._batches) if self._batches else 0.0,
+                "batch_pairs_histogram": dict(self._batch_pairs_histogram),
+                "batch_requests_histogram": dict(self._batch_requests_histogram),
+                "queue_depth_histogram": dict(self._queue_depth_histogram),
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
@@ -0,0 +1,111 @@
+"""Cross-encoder wrapper that caches passage token ids across reranks.
+
+`CrossEncoder.predict` re-tokenizes every (query, chunk) pair, so the same
+~400-word chunks are tokenized from scratch on every request. This wrapper
+keeps truncated passage input ids in a bounded LRU keyed by
+(tokenizer, passage text hash). At rerank time only the query is tokenized;
+its ids are joined with the cached passage ids using the tokenizer's own
+special-token layout and `longest_first` truncation (as `predict` does). The
+result then goes through the same model forward pass and activation as
+`CrossEncoder.predict`.
+
+Keys hash the passage text instead of using chunk_id. The predict surface
+(micro-batching, inference workers) only carries (query, text) pairs, and
+span merging can widen a chunk's text under the same chunk_id.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Sequence
+
+import numpy as np
+
+
+def truncate_longest_first(query_ids: list[int], passage_ids: list[int], budget: int) -> tuple[list[int], list[int]]:
+    """Trim the longer sequence one token at a time until both fit `budget` (HF `longest_first`)."""
+    query_len, passage_len = len(query_ids), len(passage_ids)
+    while query_len + passage_len > budget and (query_len or passage_len):
+        if passage_len >= query_len:
+            passage_len -= 1
+        else:
+            query_len -= 1
+    return query_ids[:query_len], passage_ids[:passage_len]
+
+
+class PretokenizedCrossEncoder:
+    """`predict(pairs)` over a sentence-transformers CrossEncoder with a passage token-id cache."""
+
+    def __init__(self, cross_encoder, *, max_entries: int = 20000):
+        self.cross_encoder = cross_encoder
+        self.tokenizer = cross_encoder.tokenizer
+        self.tokenizer_name = getattr(self.tokenizer, "name_or_path", type(self.tokenizer).__name__)
+        self.max_length = int(getattr(cross_encoder, "max_length", None) or min(self.tokenizer.model_max_length, 512))
+        self.max_entries = max_entries
+        self._special_tokens = self.tokenizer.num_special_tokens_to_add(pair=True)
+        self._passages: OrderedDict[tuple[str, str], list[int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def predict(self, pairs: Sequence[Any], batch_size: int = 32, **_ignored) -> np.ndarray:
+        if not pairs:
+            return np.empty(0)
+        query_ids: dict[str, list[int]] = {}
+        features = []
+        for query, text in pairs:
+            if query not in query_ids:
+                query_ids[query] = self.tokenizer(query, add_special_tokens=False)["input_ids"]
+            features.append(self._pair_features(query_ids[query], self._passage_ids(text)))
+        scores = []
+        for start in range(0, len(features), max(1, batch_size)):
+            scores.extend(self._forward(features[start : start + max(1, batch_size)]))
+        return np.asarray(scores, dtype=np.float64)
+
+    def _passage_ids(self, text: str) -> list[int]:
+        key = (self.tokenizer_name, hashlib.sha1(text.encode("utf-8")).hexdigest())
+        with self._lock:
+            cached = self._passages.get(key)
+            if cached is not None:
+                self._passages.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+        # Passages never keep more than the whole window minus special tokens.
+        ids = self.tokenizer(text, add_special_tokens=False)["input_ids"][: self.max_length - self._special_tokens]
+        with self._lock:
+            self._passages[key] = ids
+            while len(self._passages) > self.max_entries:
+                self._passages.popitem(last=False)
+        return ids
+
+    def _pair_features(self, query_ids: list[int], passage_ids: list[int]) -> dict[str, list[int]]:
+        query_ids, passage_ids = truncate_longest_first(query_ids, passage_ids, self.max_length - self._special_tokens)
+        features = {"input_ids": self.tokenizer.build_inputs_with_special_tokens(query_ids, passage_ids)}
+        if "token_type_ids" in self.tokenizer.model_input_names:
+            features["token_type_ids"] = self.tokenizer.create_token_type_ids_from_sequences(query_ids, passage_ids)
+        return features
+
+    def _forward(self, features: list[dict[str, list[int]]]) -> list[float]:
+        import torch
+
+        model = self.cross_encoder.model
+        inputs = self.tokenizer.pad(features, padding=True, return_tensors="pt")
+        inputs = {name: tensor.to(model.device) for name, tensor in inputs.items()}
+        with torch.inference_mode():
+            logits = model(**inputs, return_dict=True).logits
+            logits = self.cross_encoder.activation_fn(logits)
+        if logits.shape[-1] == 1:
+            logits = logits.squeeze(-1)
+        return logits.float().cpu().tolist()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._passages),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            }
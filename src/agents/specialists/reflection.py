@@ -1,8 +1,9 @@
 """Reflection helper for structured answer quality evaluation."""
 
 import json
-from typing import Callable, Sequence
+from typing import Awaitable, Callable, Sequence, Union
 
+from ..core.hit_batch import HitBatch
 from ..core.types import ReflectionResult, RetrievalHit
 from ..prompts import reflection as reflection_prompts
 
@@ -21,18 +22,41 @@ def reflect_answer(
     original_query: str,
     revised_query: str,
     answer: str,
-    hits: Sequence[RetrievalHit],
+    hits: Union[HitBatch, Sequence[RetrievalHit]],
     guard_output: Callable[[str, str], str],
 ) -> ReflectionResult:
-    prompt = reflection_prompts.build_reflection_prompt(
+    prompt = _build_prompt(original_query, revised_query, answer, hits)
+    response = model.invoke(prompt)
+    raw = guard_output(str(getattr(response, "content", "")).strip(), "reflect")
+    return _reflection_from_raw(raw)
+
+
+async def areflect_answer(
+    *,
+    model,
+    original_query: str,
+    revised_query: str,
+    answer: str,
+    hits: Union[HitBatch, Sequence[RetrievalHit]],
+    guard_output: Callable[[str, str], Awaitable[str]],
+) -> ReflectionResult:
+    """`reflect_answer` with `ainvoke` and an awaitable output guard."""
+    prompt = _build_prompt(original_query, revised_query, answer, hits)
+    response = await model.ainvoke(prompt)
+    raw = await guard_output(str(getattr(response, "content", "")).strip(), "reflect")
+    return _reflection_from_raw(raw)
+
+
+def _build_prompt(original_query: str, revised_query: str, answer: str, hits: Union[HitBatch, Sequence[RetrievalHit]]):
+    return reflection_prompts.build_reflection_prompt(
         original_query=original_query,
         revised_query=revised_query,
         answer=answer,
         evidence_count=len(hits),
     )
-    response = model.invoke(prompt)
-    raw = str(getattr(response, "content", "")).strip()
-    raw = guard_output(raw, "reflect")
+
+
+def _reflection_from_raw(raw: str) -> ReflectionResult:
     payload = _parse_json(raw)
     reason = str(payload.get("reason", "ok"))
     if reason not in {"low_coverage", "ok"}:
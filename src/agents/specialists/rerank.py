@@ -1,14 +1,19 @@
 """Reranking helpers for retrieval hits."""
 
-from datetime import UTC, datetime
-from typing import Sequence
+from typing import Optional, Sequence, Union
 
+import numpy as np
+
+from ..core.hit_batch import HitBatch
 from ..core.types import RetrievalHit
+from .cascade import CascadePolicy, cascade_scores
+from .score_cache import RerankScoreCache
+from .scoring import minmax_normalize, rank_descending, recency_multipliers
 
 
 def rerank_hits(
     query: str,
-    hits: Sequence[RetrievalHit],
+    hits: Union[HitBatch, Sequence[RetrievalHit]],
     top_n: int,
     rerank_tool_name: str,
     cross_encoder,
@@ -16,52 +21,227 @@ def rerank_hits(
     recent_year_window: int = 5,
     corpus_latest_fy: int = 2025,
     rerank_recency_boost: float = 0.05,
-) -> list[RetrievalHit]:
+    score_cache: Optional[RerankScoreCache] = None,
+    cache_model: str = "",
+    corpus_version: str = "",
+    cascade_policy: Optional[CascadePolicy] = None,
+    prefilter_encoder=None,
+) -> HitBatch:
     """Rerank retrieval hits with a cross-encoder and optional recency boost.
 
     Defaults are fallbacks; production values are passed in from AgentConfig
     (defined in src/agents/core/config.py).
     """
+    return rerank_many_hits(
+        queries=[query],
+        hits_per_query=[hits],
+        top_n=top_n,
+        rerank_tool_name=rerank_tool_name,
+        cross_encoder=cross_encoder,
+        candidate_limit=candidate_limit,
+        recent_year_window=recent_year_window,
+        corpus_latest_fy=corpus_latest_fy,
+        rerank_recency_boost=rerank_recency_boost,
+        score_cache=score_cache,
+        cache_model=cache_model,
+        corpus_version=corpus_version,
+        cascade_policy=cascade_policy,
+        prefilter_encoder=prefilter_encoder,
+    )[0]
+
+
+def rerank_many_hits(
+    *,
+    queries: Sequence[str],
+    hits_per_query: Sequence[Union[HitBatch, Sequence[RetrievalHit]]],
+    top_n: int,
+    rerank_tool_name: str,
+    cross_encoder,
+    candidate_limit: int = 100,
+    recent_year_window: int = 5,
+    corpus_latest_fy: int = 2025,
+    rerank_recency_boost: float = 0.05,
+    score_cache: Optional[RerankScoreCache] = None,
+    cache_model: str = "",
+    corpus_version: str = "",
+    cascade_policy: Optional[CascadePolicy] = None,
+    prefilter_encoder=None,
+) -> list[HitBatch]:
+    """Rerank several queries' candidates with one shared cross-encoder predict call.
+
+    Pairs from every query are concatenated so the cross-encoder fills its
+    internal batches across queries; scores are split back per query before
+    the per-query normalization and recency boost. With a `score_cache`, only
+    pairs without a cached raw score are sent to `predict`. With a
+    `cascade_policy`, each query is reranked by the cascade in cascade.py instead.
+    """
     if cross_encoder is None:
         raise RuntimeError("Cross-encoder is required for reranking and could not be loaded.")
-    candidates = list(hits[: max(1, candidate_limit)])
-    if not candidates:
-        return []
-    pairs = [(query, item.text) for item in candidates]
-    raw_scores = [float(score) for score in cross_encoder.predict(pairs)]
-    ranked = sorted(zip(candidates, raw_scores), key=lambda row: row[1], reverse=True)
-    raw_scores = [score for _, score in ranked]
-    min_score = min(raw_scores)
-    max_score = max(raw_scores)
-    span = max_score - min_score
-    if span <= 1e-6:
-        normalized = {item.chunk_id: 0.5 for item, _ in ranked}
-    else:
-        normalized = {item.chunk_id: (score - min_score) / span for item, score in ranked}
-
-    current_year = int(corpus_latest_fy or datetime.now(UTC).year)
-    window = max(1, int(recent_year_window))
-    boost = max(0.0, min(1.0, float(rerank_recency_boost)))
-
-    score_map = {}
-    for item, score in ranked:
-        norm = normalized.get(item.chunk_id, 0.0)
-        fy = item.metadata.get("financial_year")
-        if isinstance(fy, int):
-            delta = max(0, current_year - fy)
-            if delta < window:
-                tier = (window - delta) / window
-                norm *= 1.0 + (boost * tier)
-        score_map[item.chunk_id] = norm
-    reranked = sorted([item for item, _ in ranked], key=lambda item: score_map.get(item.chunk_id, 0.0), reverse=True)
-
-    return [
-        RetrievalHit(
-            chunk_id=item.chunk_id,
-            source_path=item.source_path,
-            text=item.text,
-            score=float(score_map.get(item.chunk_id, item.score)),
-            metadata={**item.metadata, "tool": rerank_tool_name},
-        )
-        for item in reranked[:top_n]
+    candidates_per_query = [HitBatch.coerce(hits)[: max(1, candidate_limit)] for hits in hits_per_query]
+    pairs = [
+        (query, text)
+        for query, candidates in zip(queries, candidates_per_query)
+        for text in candidates.texts
     ]
+    if cascade_policy is not None:
+        return [
+            _cascade_rerank(
+                query,
+                candidates,
+                top_n=top_n,
+                rerank_tool_name=rerank_tool_name,
+                cross_encoder=cross_encoder,
+                cascade_policy=cascade_policy,
+                prefilter_encoder=prefilter_encoder,
+                recent_year_window=recent_year_window,
+                corpus_latest_fy=corpus_latest_fy,
+                rerank_recency_boost=rerank_recency_boost,
+                score_cache=score_cache,
+                cache_model=cache_model,
+                corpus_version=corpus_version,
+            )
+            for query, candidates in zip(queries, candidates_per_query)
+        ]
+    keys = (
+        [
+            _cache_key(query, candidates, row, cache_model, corpus_version)
+            for query, candidates in zip(queries, candidates_per_query)
+            for row in range(len(candidates))
+        ]
+        if score_cache is not None
+        else None
+    )
+    raw_scores, hit_flags = _score_pairs(pairs, cross_encoder, score_cache, keys)
+    bounds = np.cumsum([0] + [len(candidates) for candidates in candidates_per_query])
+    cached_per_query = [int(hit_flags[start:end].sum()) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    reranked: list[HitBatch] = []
+    offset = 0
+    for candidates, cached_pairs in zip(candidates_per_query, cached_per_query):
+        size = len(candidates)
+        batch = _order_by_rerank_scores(
+            candidates,
+            raw_scores[offset : offset + size],
+            top_n=top_n,
+            rerank_tool_name=rerank_tool_name,
+            recent_year_window=recent_year_window,
+            corpus_latest_fy=corpus_latest_fy,
+            rerank_recency_boost=rerank_recency_boost,
+        )
+        batch.rerank_cached_pairs = cached_pairs
+        reranked.append(batch)
+        offset += size
+    return reranked
+
+
+def _cache_key(query: str, candidates: HitBatch, row: int, cache_model: str, corpus_version: str) -> tuple:
+    chunk_key = (candidates.chunk_ids[row], int(candidates.chunk_starts[row]), int(candidates.chunk_ends[row]))
+    return RerankScoreCache.key(cache_model, query, chunk_key, corpus_version)
+
+
+def _score_pairs(
+    pairs: Sequence[tuple[str, str]],
+    cross_encoder,
+    score_cache: Optional[RerankScoreCache],
+    keys: Optional[Sequence[tuple]],
+    new_request: bool = True,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Raw cross-encoder scores for `pairs`, plus a mask of the ones served from the cache."""
+    if not pairs:
+        return np.empty(0), np.zeros(0, dtype=bool)
+    if score_cache is None or keys is None:
+        scores = np.asarray(cross_encoder.predict(list(pairs)), dtype=np.float64).reshape(-1)
+        return scores, np.zeros(len(pairs), dtype=bool)
+    cached = score_cache.lookup(keys, new_request=new_request)
+    hit_flags = np.asarray([score is not None for score in cached], dtype=bool)
+    scores = np.asarray([np.nan if score is None else score for score in cached], dtype=np.float64)
+    missing = np.flatnonzero(~hit_flags).tolist()
+    if missing:
+        predicted = np.asarray(cross_encoder.predict([pairs[idx] for idx in missing]), dtype=np.float64).reshape(-1)
+        scores[missing] = predicted
+        score_cache.store([keys[idx] for idx in missing], predicted.tolist())
+    return scores, hit_flags
+
+
+def _cascade_rerank(
+    query: str,
+    candidates: HitBatch,
+    *,
+    top_n: int,
+    rerank_tool_name: str,
+    cross_encoder,
+    cascade_policy: CascadePolicy,
+    prefilter_encoder,
+    recent_year_window: int,
+    corpus_latest_fy: int,
+    rerank_recency_boost: float,
+    score_cache: Optional[RerankScoreCache],
+    cache_model: str,
+    corpus_version: str,
+) -> HitBatch:
+    cached_pairs = 0
+    first_batch = True
+
+    def score_rows(rows: Sequence[int]) -> np.ndarray:
+        nonlocal cached_pairs, first_batch
+        keys = (
+            [_cache_key(query, candidates, row, cache_model, corpus_version) for row in rows]
+            if score_cache is not None
+            else None
+        )
+        # One cache "request" per rerank call, however many stage-2 batches it takes.
+        scores, hit_flags = _score_pairs(
+            [(query, candidates.texts[row]) for row in rows],
+            cross_encoder,
+            score_cache,
+            keys,
+            new_request=first_batch,
+        )
+        first_batch = False
+        cached_pairs += int(hit_flags.sum())
+        return scores
+
+    cheap_scores = None
+    if prefilter_encoder is not None and len(candidates):
+        cheap_scores = prefilter_encoder.predict([(query, text) for text in candidates.texts])
+    outcome = cascade_scores(candidates, policy=cascade_policy, score_rows=score_rows, cheap_scores=cheap_scores)
+    batch = _order_by_rerank_scores(
+        candidates,
+        outcome.raw_scores,
+        top_n=top_n,
+        rerank_tool_name=rerank_tool_name,
+        recent_year_window=recent_year_window,
+        corpus_latest_fy=corpus_latest_fy,
+        rerank_recency_boost=rerank_recency_boost,
+    )
+    batch.rerank_cached_pairs = cached_pairs
+    batch.rerank_cascade = {"pruned": outcome.pruned, "scored": outcome.scored, "early_exit": outcome.early_exit}
+    return batch
+
+
+def _order_by_rerank_scores(
+    candidates: HitBatch,
+    raw_scores: np.ndarray,
+    *,
+    top_n: int,
+    rerank_tool_name: str,
+    recent_year_window: int,
+    corpus_latest_fy: int,
+    rerank_recency_boost: float,
+) -> HitBatch:
+    if not len(candidates):
+        return candidates.with_scores(candidates.scores, tool=rerank_tool_name)
+    # Rows the cascade did not score (NaN) follow every scored row, in candidate order, with score 0.
+    scored = np.flatnonzero(~np.isnan(raw_scores))
+    unscored = np.flatnonzero(np.isnan(raw_scores))
+    final_scores = np.zeros(len(candidates))
+    # Order by raw cross-encoder score first so recency ties keep cross-encoder order.
+    by_raw = scored[rank_descending(raw_scores[scored])]
+    final_scores[scored] = minmax_normalize(raw_scores[scored]) * recency_multipliers(
+        candidates.financial_years[scored],
+        corpus_latest_fy=corpus_latest_fy,
+        recent_year_window=recent_year_window,
+        boost=rerank_recency_boost,
+    )
+    order = np.concatenate([by_raw[rank_descending(final_scores[by_raw])], unscored])[:top_n]
+    return candidates.with_scores(final_scores, tool=rerank_tool_name).take(order)
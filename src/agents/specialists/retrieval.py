@@ -1,18 +1,33 @@
 """Retrieval helpers for hybrid Milvus search and year-aware filtering.
 
 Pipeline:
-- build optional FY filter
-- run dense + sparse searches
-- merge with RRF, then apply recency tier boost
-- return hits with traceable metadata
+- build optional FY scope (FY partitions when available, else a scalar filter)
+  plus an optional doc_type filter (both inferred by planner/analyzer.py when
+  the client sends no scope)
+- run dense + sparse searches (optionally adaptive: skip/shrink the weaker source)
+- merge with RRF, then apply recency tier boost (vectorized over the batch)
+- return a columnar HitBatch with traceable metadata
 """
 
-from datetime import UTC, datetime
-from typing import Any, Optional
+import json
+from typing import Optional, Sequence
 
+import numpy as np
+
+from ..core.hit_batch import MISSING_RANK, HitBatch
 from ..core.types import RetrieveContextPayload
-from ..core.types import RetrievalHit
-from ..mcp.client import search_collection_dense, search_collection_sparse
+from ..mcp.client import (
+    search_collection_dense,
+    search_collection_dense_many,
+    search_collection_sparse,
+    search_collection_sparse_many,
+)
+from .adaptive import AdaptiveRetrievalPolicy, AdaptiveRetrievalStats, search_adaptively
+from .scoring import rank_descending, recency_multipliers, rrf_scores
+
+
+def requested_years_from_context(retrieve_context: RetrieveContextPayload) -> list[int]:
+    return sorted({int(year) for year in retrieve_context.get("requested_years", []) if str(year).isdigit()})
 
 
 def build_year_filter_expr(
@@ -23,13 +38,26 @@ def build_year_filter_expr(
     if not fy_filtering_enabled:
         return None
 
-    requested_years = [int(year) for year in retrieve_context.get("requested_years", []) if str(year).isdigit()]
-    if not requested_years:
+    years = requested_years_from_context(retrieve_context)
+    if not years:
         return None
-    years = sorted(set(requested_years))
     return f"financial_year in [{', '.join(str(year) for year in years)}]"
 
 
+def build_doc_type_filter_expr(retrieve_context: RetrieveContextPayload) -> Optional[str]:
+    doc_types = sorted({str(doc_type) for doc_type in retrieve_context.get("doc_types", []) if doc_type})
+    if not doc_types:
+        return None
+    return f"doc_type in [{', '.join(json.dumps(doc_type) for doc_type in doc_types)}]"
+
+
+def combine_filter_exprs(*exprs: Optional[str]) -> Optional[str]:
+    present = [expr for expr in exprs if expr]
+    if len(present) <= 1:
+        return present[0] if present else None
+    return " and ".join(f"({expr})" for expr in present)
+
+
 def run_retrieve(
     *,
     query: str,
@@ -45,32 +73,196 @@ def run_retrieve(
     retrieve_recency_boost: float,
     merge_strategy: str,
     rrf_k: int,
-) -> list[RetrievalHit]:
-    query_vector = embedder.encode([query], normalize_embeddings=True)[0].astype("float32").tolist()
+    partition_names: Optional[list[str]] = None,
+    adaptive_policy: Optional[AdaptiveRetrievalPolicy] = None,
+    adaptive_stats: Optional[AdaptiveRetrievalStats] = None,
+    query_vector: Optional[list[float]] = None,
+    include_text: bool = True,
+) -> HitBatch:
+    """Run hybrid search; `partition_names` (FY partitions) replaces the scalar year filter when given.
+
+    With `adaptive_policy`, the weaker source may be skipped or shrunk per query
+    (see specialists/adaptive.py); the chosen path is kept on the batch.
+    `query_vector` lets fan-out callers embed once and share it across slices.
+    `include_text=False` leaves texts empty for later hydration from the docstore.
+    """
     sparse_query_vector = bm25_encoder.encode_queries([query])[0] if bm25_encoder is not None else {}
     year_expr = build_year_filter_expr(
         retrieve_context,
         fy_filtering_enabled=fy_filtering_enabled,
     )
 
-    dense_limit = max(1, int(top_k))
-    sparse_limit = max(1, int(top_k))
-    dense_results = search_collection_dense(collection, query_vector=query_vector, top_k=dense_limit, year_expr=year_expr)
-    sparse_results = (
-        search_collection_sparse(
+    # Partitions already scope the search to the requested years; year_expr is kept for trace metadata.
+    search_expr = combine_filter_exprs(
+        None if partition_names else year_expr,
+        build_doc_type_filter_expr(retrieve_context),
+    )
+
+    if merge_strategy != "rrf":
+        raise ValueError(f"Unsupported merge_strategy: {merge_strategy}")
+
+    def dense_search(limit: int):
+        # Embedding is part of the dense cost, so it is skipped along with the search.
+        dense_vector = query_vector
+        if dense_vector is None:
+            dense_vector = embedder.encode([query], normalize_embeddings=True)[0].astype("float32").tolist()
+        results = search_collection_dense(
+            collection,
+            query_vector=dense_vector,
+            top_k=limit,
+            year_expr=search_expr,
+            partition_names=partition_names,
+            output_text=include_text,
+        )
+        return results[0] if results else []
+
+    def sparse_search(limit: int):
+        if not sparse_query_vector:
+            return None
+        results = search_collection_sparse(
             collection,
             sparse_query_vector=sparse_query_vector,
-            top_k=sparse_limit,
-            year_expr=year_expr,
+            top_k=limit,
+            year_expr=search_expr,
+            partition_names=partition_names,
+            output_text=include_text,
         )
-        if sparse_query_vector
-        else [[]]
+        return results[0] if results else []
+
+    signal = (
+        bm25_encoder.query_signal(query)
+        if adaptive_policy is not None and hasattr(bm25_encoder, "query_signal")
+        else None
+    )
+    path, dense_hits, sparse_hits = search_adaptively(
+        top_k=top_k,
+        dense_search=dense_search,
+        sparse_search=sparse_search,
+        policy=adaptive_policy,
+        stats=adaptive_stats,
+        signal=signal,
     )
 
+    batch = merge_search_results(
+        dense_hits=dense_hits,
+        sparse_hits=sparse_hits,
+        retrieve_tool_name=retrieve_tool_name,
+        year_expr=year_expr,
+        recent_year_window=recent_year_window,
+        corpus_latest_fy=corpus_latest_fy,
+        retrieve_recency_boost=retrieve_recency_boost,
+        rrf_k=rrf_k,
+    )
+    batch.retrieval_path = path
+    return batch
+
+
+def run_retrieve_many(
+    *,
+    queries: Sequence[str],
+    top_k: int,
+    retrieve_contexts: Sequence[RetrieveContextPayload],
+    collection,
+    embedder,
+    bm25_encoder,
+    retrieve_tool_name: str,
+    fy_filtering_enabled: bool,
+    recent_year_window: int,
+    corpus_latest_fy: int,
+    retrieve_recency_boost: float,
+    merge_strategy: str,
+    rrf_k: int,
+    partition_names: Optional[Sequence[Optional[list[str]]]] = None,
+    include_text: bool = True,
+) -> list[HitBatch]:
+    """Batched variant of run_retrieve: one embedding pass and nq>1 searches per FY scope.
+
+    Always hybrid: nq>1 searches already amortize per-call latency, so adaptive
+    skipping is applied only on the single-query path.
+    """
     if merge_strategy != "rrf":
         raise ValueError(f"Unsupported merge_strategy: {merge_strategy}")
+    queries = list(queries)
+    if not queries:
+        return []
+
+    dense_vectors = embedder.encode(queries, normalize_embeddings=True)
+    sparse_vectors = bm25_encoder.encode_queries(queries) if bm25_encoder is not None else [{} for _ in queries]
+    scopes = list(partition_names) if partition_names is not None else [None] * len(queries)
+    year_exprs = [
+        build_year_filter_expr(retrieve_context, fy_filtering_enabled=fy_filtering_enabled)
+        for retrieve_context in retrieve_contexts
+    ]
+
+    # Milvus applies one filter/partition set per search call, so group queries by FY scope.
+    groups: dict[tuple[Optional[str], tuple[str, ...]], list[int]] = {}
+    for idx, (year_expr, partitions) in enumerate(zip(year_exprs, scopes)):
+        search_expr = combine_filter_exprs(
+            None if partitions else year_expr,
+            build_doc_type_filter_expr(retrieve_contexts[idx]),
+        )
+        groups.setdefault((search_expr, tuple(partitions or ())), []).append(idx)
+
+    limit = max(1, int(top_k))
+    dense_hits: list = [[] for _ in queries]
+    sparse_hits: list = [[] for _ in queries]
+    for (search_expr, partitions), members in groups.items():
+        partition_list = list(partitions) or None
+        dense_results = search_collection_dense_many(
+            collection,
+            query_vectors=[dense_vectors[idx].astype("float32").tolist() for idx in members],
+            top_k=limit,
+            year_expr=search_expr,
+            partition_names=partition_list,
+            output_text=include_text,
+        )
+        for idx, results in zip(members, dense_results):
+            dense_hits[idx] = results
+        sparse_members = [idx for idx in members if sparse_vectors[idx]]
+        if not sparse_members:
+            continue
+        sparse_results = search_collection_sparse_many(
+            collection,
+            sparse_query_vectors=[sparse_vectors[idx] for idx in sparse_members],
+            top_k=limit,
+            year_expr=search_expr,
+            partition_names=partition_list,
+            output_text=include_text,
+        )
+        for idx, results in zip(sparse_members, sparse_results):
+            sparse_hits[idx] = results
 
-    merged: dict[str, dict[str, Any]] = {}
+    return [
+        merge_search_results(
+            dense_hits=dense_hits[idx],
+            sparse_hits=sparse_hits[idx],
+            retrieve_tool_name=retrieve_tool_name,
+            year_expr=year_exprs[idx],
+            recent_year_window=recent_year_window,
+            corpus_latest_fy=corpus_latest_fy,
+            retrieve_recency_boost=retrieve_recency_boost,
+            rrf_k=rrf_k,
+        )
+        for idx in range(len(queries))
+    ]
+
+
+def merge_search_results(
+    *,
+    dense_hits,
+    sparse_hits,
+    retrieve_tool_name: str,
+    year_expr: Optional[str],
+    recent_year_window: int,
+    corpus_latest_fy: int,
+    retrieve_recency_boost: float,
+    rrf_k: int,
+) -> HitBatch:
+    """Dedupe dense + sparse result lists by chunk_id, then score them with RRF + recency."""
+    row_of: dict[str, int] = {}
+    entities: list[dict] = []
+    ranks = {"dense": [], "sparse": []}
+    scores = {"dense": [], "sparse": []}
 
     def add_source(source_results, source_name: str) -> None:
         for rank_idx, item in enumerate(source_results, start=1):
@@ -78,59 +270,48 @@ def run_retrieve(
             chunk_id = entity.get("chunk_id", "")
             if not chunk_id:
                 continue
-            source_score = float(getattr(item, "score", 0.0))
-            row = merged.setdefault(
-                chunk_id,
-                {
-                    "entity": entity,
-                    "merged_score": 0.0,
-                    "sources": set(),
-                },
-            )
-            row["sources"].add(source_name)
-            row[f"{source_name}_rank"] = rank_idx
-            row[f"{source_name}_score"] = source_score
-            row["merged_score"] += 1.0 / (rrf_k + rank_idx)
-
-    add_source(dense_results[0] if dense_results else [], "dense")
-    add_source(sparse_results[0] if sparse_results else [], "sparse")
-
-    current_year = int(corpus_latest_fy or datetime.now(UTC).year)
-    window = max(1, int(recent_year_window))
-    boost = max(0.0, min(1.0, float(retrieve_recency_boost)))
+            row = row_of.get(chunk_id)
+            if row is None:
+                row = row_of[chunk_id] = len(entities)
+                entities.append(entity)
+                for name in ranks:
+                    ranks[name].append(MISSING_RANK)
+                    scores[name].append(np.nan)
+            ranks[source_name][row] = rank_idx
+            scores[source_name][row] = float(getattr(item, "score", 0.0))
+
+    add_source(dense_hits, "dense")
+    add_source(sparse_hits, "sparse")
+
+    dense_ranks = np.asarray(ranks["dense"], dtype=np.int64)
+    sparse_ranks = np.asarray(ranks["sparse"], dtype=np.int64)
+    financial_years = [entity.get("financial_year") for entity in entities]
 
+    merged = rrf_scores(dense_ranks, rrf_k) + rrf_scores(sparse_ranks, rrf_k)
+    batch = HitBatch.from_columns(
+        chunk_ids=[entity.get("chunk_id", "") for entity in entities],
+        source_paths=[entity.get("source_path", "") for entity in entities],
+        texts=[entity.get("text", "") for entity in entities],
+        doc_types=[entity.get("doc_type") for entity in entities],
+        financial_years=financial_years,
+        scores=merged,
+        dense_ranks=dense_ranks,
+        dense_scores=scores["dense"],
+        sparse_ranks=sparse_ranks,
+        sparse_scores=scores["sparse"],
+        doc_ids=[entity.get("doc_id") for entity in entities],
+        chunk_starts=[entity.get("chunk_start") for entity in entities],
+        chunk_ends=[entity.get("chunk_end") for entity in entities],
+        tool=retrieve_tool_name,
+        year_expr=year_expr,
+    )
     # Apply a tiered recency boost at the merge stage (no hard exclusion).
-    for row in merged.values():
-        fy = row["entity"].get("financial_year")
-        if isinstance(fy, int):
-            delta = max(0, current_year - fy)
-            if delta < window:
-                tier = (window - delta) / window
-                row["merged_score"] *= 1.0 + (boost * tier)
-
-    ranked = sorted(merged.values(), key=lambda row: row["merged_score"], reverse=True)
-    hits: list[RetrievalHit] = []
-    for row in ranked:
-        entity = row["entity"]
-        hits.append(
-            RetrievalHit(
-                chunk_id=entity.get("chunk_id", ""),
-                source_path=entity.get("source_path", ""),
-                text=entity.get("text", ""),
-                score=float(row["merged_score"]),
-                metadata={
-                    "provider": "mcp-local",
-                    "tool": retrieve_tool_name,
-                    "doc_type": entity.get("doc_type"),
-                    "financial_year": entity.get("financial_year"),
-                    "year_expr": year_expr,
-                    "retrieval_sources": sorted(row["sources"]),
-                    "dense_rank": row.get("dense_rank"),
-                    "dense_score": row.get("dense_score"),
-                    "sparse_rank": row.get("sparse_rank"),
-                    "sparse_score": row.get("sparse_score"),
-                    "merged_score": row["merged_score"],
-                },
-            )
-        )
-    return hits
+    merged = merged * recency_multipliers(
+        batch.financial_years,
+        corpus_latest_fy=corpus_latest_fy,
+        recent_year_window=recent_year_window,
+        boost=retrieve_recency_boost,
+    )
+    batch.scores = merged
+    batch.merged_scores = merged.copy()
+    return batch.take(rank_descending(merged))
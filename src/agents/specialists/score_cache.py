@@ -0,0 +1,85 @@
+"""Bounded cache of raw cross-encoder scores.
+
+Repeated and refined questions (and the frontend's FY toggle, which re-asks
+the same question under a different filter) re-rank many of the same
+(query, chunk) pairs. Raw cross-encoder scores depend only on the model, the
+query text, and the chunk text, so they are cached per
+(model, normalized query, chunk_id + word span, corpus version) and only
+unseen pairs go through `predict`. Normalization and the recency boost are
+applied after lookup, so cached scores never bake in per-request settings.
+
+The word span is part of the chunk key because span merging during
+compaction (specialists/compaction.py) widens a chunk's text under the same
+chunk_id.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive query key."""
+    return " ".join(query.lower().split())
+
+
+class RerankScoreCache:
+    """Thread-safe LRU of raw cross-encoder scores with hit-rate accounting."""
+
+    def __init__(self, *, max_entries: int):
+        self.max_entries = max_entries
+        self._scores: OrderedDict[Hashable, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._requests = 0
+
+    @staticmethod
+    def key(model: str, query: str, chunk_key: Hashable, corpus_version: str) -> tuple:
+        return (model, normalize_query(query), chunk_key, corpus_version)
+
+    def lookup(self, keys: Sequence[Hashable], *, new_request: bool = True) -> list[Optional[float]]:
+        """Cached score per key (None for a miss).
+
+        `new_request=False` continues the previous request (cascade stage-2 batches).
+        """
+        with self._lock:
+            scores: list[Optional[float]] = []
+            for key in keys:
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                scores.append(score)
+            hits = sum(score is not None for score in scores)
+            self._hits += hits
+            self._misses += len(scores) - hits
+            self._requests += int(new_request)
+        logger.info("rerank score cache pairs=%d saved=%d", len(keys), hits)
+        return scores
+
+    def store(self, keys: Sequence[Hashable], scores: Sequence[float]) -> None:
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._scores[key] = float(score)
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._scores),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "pairs_saved_total": self._hits,
+                "pairs_saved_per_request": (self._hits / self._requests) if self._requests else 0.0,
+            }
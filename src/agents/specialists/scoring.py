@@ -0,0 +1,51 @@
+"""Vectorized scoring helpers shared by retrieval merge and rerank.
+
+Formulas are documented in docs/agents/scoring.md.
+"""
+
+from datetime import UTC, datetime
+
+import numpy as np
+
+from ..core.hit_batch import MISSING_RANK, MISSING_YEAR
+
+
+def rrf_scores(ranks: np.ndarray, rrf_k: int) -> np.ndarray:
+    """Per-list RRF contribution: 1 / (k + rank), 0 when the list did not return the hit."""
+    ranks = np.asarray(ranks, dtype=np.float64)
+    return np.where(ranks != MISSING_RANK, 1.0 / (rrf_k + ranks), 0.0)
+
+
+def recency_multipliers(
+    financial_years: np.ndarray,
+    *,
+    corpus_latest_fy: int,
+    recent_year_window: int,
+    boost: float,
+) -> np.ndarray:
+    """Tiered multiplicative recency boost (1.0 outside the recent window)."""
+    current_year = int(corpus_latest_fy or datetime.now(UTC).year)
+    window = max(1, int(recent_year_window))
+    boost = max(0.0, min(1.0, float(boost)))
+    years = np.asarray(financial_years, dtype=np.int64)
+    delta = np.maximum(0, current_year - years)
+    in_window = (years != MISSING_YEAR) & (delta < window)
+    tier = (window - delta) / window
+    return np.where(in_window, 1.0 + (boost * tier), 1.0)
+
+
+def minmax_normalize(scores: np.ndarray) -> np.ndarray:
+    """Per-query min-max normalization; a flat score list maps to 0.5."""
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.size == 0:
+        return scores
+    min_score = scores.min()
+    span = scores.max() - min_score
+    if span <= 1e-6:
+        return np.full(scores.shape, 0.5)
+    return (scores - min_score) / span
+
+
+def rank_descending(scores: np.ndarray) -> np.ndarray:
+    """Indices that sort `scores` high-to-low, keeping input order for ties."""
+    return np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable")
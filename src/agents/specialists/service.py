@@ -1,20 +1,48 @@
 """Specialist facade for retrieval, rerank, synthesis, and reflection."""
 
+import asyncio
+import hashlib
+import logging
 import os
 import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Any, Callable, Iterator, Optional, Sequence, TypeVar, Union
 
+import numpy as np
 from langsmith.run_helpers import traceable
 
+from src.vector_db.docstore import ChunkDocstore
+
 from ..core.config import AgentConfig
+from ..core.hit_batch import HitBatch, trace_hit_outputs
 from ..core.types import ReflectionResult, RetrievalHit, RetrieveContextPayload
 from ..guardrails.service import GuardrailsService, GuardrailsViolationError
+from ..mcp.client import fetch_chunk_texts
+from ..mcp.inference import InferenceWorkerPool, RemoteCrossEncoder, RemoteEmbedder
+from ..mcp.llm_clients import get_llm_client_registry, llm_client_stats, llm_usage_stats
+from ..mcp.partitions import YearPartitionLoader
+from ..mcp.pool import MilvusConnectionPool
 from ..mcp.tools import missing_tool_names, resolve_tool_names
-from .reflection import reflect_answer
-from .rerank import rerank_hits
-from .retrieval import run_retrieve
-from .synthesis import synthesize_answer
+from .adaptive import AdaptiveRetrievalPolicy, AdaptiveRetrievalStats
+from .cascade import CascadePolicy
+from .compaction import compact_overlapping_chunks
+from .evidence import EvidencePacker
+from .local_reflection import LocalReflectionScorer
+from .fanout import interleave_slices, slice_contexts, slice_quotas
+from .microbatch import MicroBatchScheduler
+from .pretokenized import PretokenizedCrossEncoder
+from .reflection import areflect_answer, reflect_answer
+from .rerank import rerank_hits, rerank_many_hits
+from .retrieval import build_year_filter_expr, requested_years_from_context, run_retrieve, run_retrieve_many
+from .score_cache import RerankScoreCache
+from .synthesis import asynthesize_answer, stream_synthesis, synthesize_answer
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
 
 
 class MCPReadinessError(RuntimeError):
@@ -28,11 +56,60 @@ class Specialists:
         self.config = config
         self._tool_names = resolve_tool_names(config)
         self._collection = None
+        self._collection_lock = threading.Lock()
+        self._partition_loader: Optional[YearPartitionLoader] = None
         self._embedder = None
+        self._inference_pool: Optional[InferenceWorkerPool] = None
+        self._inference_lock = threading.Lock()
         self._bm25_encoder = None
         self._cross_encoder = None
+        self._prefilter_encoder = None
         self._synthesis_model = None
         self._reflection_model = None
+        self._corpus_version: Optional[str] = None
+        self._docstore: Optional[ChunkDocstore] = None
+        self._docstore_checked = False
+        self._docstore_lock = threading.Lock()
+        self._evidence_packer: Optional[EvidencePacker] = None
+        if config.evidence_packing_enabled:
+            self._evidence_packer = EvidencePacker(
+                token_budget=config.evidence_token_budget,
+                max_sentences_per_chunk=config.evidence_max_sentences_per_chunk,
+            )
+        self._local_reflection: Optional[LocalReflectionScorer] = None
+        if config.local_reflection_enabled:
+            self._local_reflection = LocalReflectionScorer(
+                high_threshold=config.local_reflection_high_threshold,
+                low_threshold=config.local_reflection_low_threshold,
+                support_overlap=config.local_reflection_support_overlap,
+                corpus_earliest_fy=config.corpus_earliest_fy,
+                corpus_latest_fy=config.corpus_latest_fy,
+            )
+        self._offload_executor: Optional[ThreadPoolExecutor] = None
+        self._offload_lock = threading.Lock()
+        self._rerank_cache: Optional[RerankScoreCache] = None
+        if config.rerank_cache_enabled:
+            self._rerank_cache = RerankScoreCache(max_entries=config.rerank_cache_max_entries)
+        self._cascade_policy: Optional[CascadePolicy] = None
+        if config.cascade_rerank_enabled:
+            self._cascade_policy = CascadePolicy(
+                keep_ratio=config.cascade_keep_ratio,
+                min_keep=config.cascade_min_keep,
+                batch_size=config.cascade_batch_size,
+                stable_top_n=config.cascade_stable_top_n,
+                stability_margin=config.cascade_stability_margin,
+            )
+        self._adaptive_policy: Optional[AdaptiveRetrievalPolicy] = None
+        self._adaptive_stats: Optional[AdaptiveRetrievalStats] = None
+        if config.adaptive_retrieval_enabled:
+            self._adaptive_policy = AdaptiveRetrievalPolicy(
+                sparse_min_coverage=config.adaptive_sparse_min_coverage,
+                sparse_min_mass=config.adaptive_sparse_min_mass,
+                sparse_decisive_idf=config.adaptive_sparse_decisive_idf,
+                score_gap=config.adaptive_score_gap,
+                shrink_ratio=config.adaptive_shrink_ratio,
+            )
+            self._adaptive_stats = AdaptiveRetrievalStats()
         self._guardrails = GuardrailsService(config)
         self.validate_ready()
 
@@ -62,20 +139,54 @@ class Specialists:
                 self._get_collection()
                 self._get_embedder()
                 self._get_bm25_encoder()
+                self._get_docstore()
                 self._get_cross_encoder()
+                if self.config.cascade_rerank_enabled:
+                    self._get_prefilter_encoder()
                 self._get_synthesis_model()
                 self._get_reflection_model()
                 self._guardrails.warm_up()
             except Exception as exc:
                 raise MCPReadinessError(f"Strict readiness check failed: {exc}") from exc
 
-    @traceable(name="specialists.mcp.retrieve", run_type="tool")
-    def retrieve(self, query: str, top_k: int, retrieve_context: Optional[RetrieveContextPayload] = None) -> list[RetrievalHit]:
+    @property
+    def corpus_version(self) -> str:
+        """Corpus identity for cache scoping: AGENT_CORPUS_VERSION, else a hash of the BM25 artifact.
+
+        Ingestion rewrites the BM25 artifact, so its hash changes whenever the corpus does.
+        """
+        if self._corpus_version is None:
+            if self.config.corpus_version:
+                self._corpus_version = self.config.corpus_version
+            else:
+                artifact_path = Path("artifacts") / "bm25_model.pkl"
+                digest = hashlib.sha256(artifact_path.read_bytes()).hexdigest() if artifact_path.exists() else "unknown"
+                self._corpus_version = digest[:16]
+        return self._corpus_version
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """L2-normalized query embedding from the already-loaded retrieval embedder."""
+        return np.asarray(self._get_embedder().encode([query], normalize_embeddings=True)[0], dtype=np.float32)
+
+    @traceable(name="specialists.mcp.retrieve", run_type="tool", process_outputs=trace_hit_outputs)
+    def retrieve(self, query: str, top_k: int, retrieve_context: Optional[RetrieveContextPayload] = None) -> HitBatch:
         guarded_query = self._guardrails.guard_input(query)
+        retrieve_context = retrieve_context or {}
+        if self.config.fanout_enabled and len(retrieve_context.get("year_slices", [])) >= 2:
+            return self._retrieve_fanout(guarded_query, top_k, retrieve_context)
+        return self._retrieve_guarded(guarded_query, top_k, retrieve_context)
+
+    def _retrieve_guarded(
+        self,
+        guarded_query: str,
+        top_k: int,
+        retrieve_context: RetrieveContextPayload,
+        query_vector: Optional[list[float]] = None,
+    ) -> HitBatch:
         return run_retrieve(
             query=guarded_query,
             top_k=top_k,
-            retrieve_context=retrieve_context or {},
+            retrieve_context=retrieve_context,
             collection=self._get_collection(),
             embedder=self._get_embedder(),
             bm25_encoder=self._get_bm25_encoder(),
@@ -86,14 +197,102 @@ class Specialists:
             retrieve_recency_boost=self.config.retrieve_recency_boost,
             merge_strategy=self.config.hybrid_merge_strategy,
             rrf_k=self.config.hybrid_rrf_k,
+            partition_names=self._resolve_partitions(retrieve_context),
+            adaptive_policy=self._adaptive_policy,
+            adaptive_stats=self._adaptive_stats,
+            query_vector=query_vector,
+            include_text=self._get_docstore() is None,
+        )
+
+    def _retrieve_fanout(self, guarded_query: str, top_k: int, retrieve_context: RetrieveContextPayload) -> HitBatch:
+        """Concurrent per-slice retrievals with split top_k quotas, interleaved by rank."""
+        contexts = slice_contexts(retrieve_context)
+        quotas = slice_quotas(top_k, len(contexts))
+        # Embed once; every slice searches with the same query vector.
+        query_vector = self.embed_query(guarded_query).tolist()
+
+        def search_slice(quota: int, context: RetrieveContextPayload) -> HitBatch:
+            return self._retrieve_guarded(guarded_query, quota, context, query_vector)
+
+        # Extra slices share the bounded offload pool; the first runs on this thread.
+        futures = [self._get_offload_executor().submit(search_slice, *item) for item in zip(quotas[1:], contexts[1:])]
+        batches = [search_slice(quotas[0], contexts[0])]
+        for future, item in zip(futures, zip(quotas[1:], contexts[1:])):
+            # A slice still queued behind a busy pool (possibly behind this request's own stage) runs inline.
+            batches.append(search_slice(*item) if future.cancel() else future.result())
+        merged = interleave_slices(
+            batches,
+            year_expr=build_year_filter_expr(retrieve_context, fy_filtering_enabled=self.config.fy_filtering_enabled),
+        )
+        merged.retrieval_path = f"fanout[{len(contexts)}]"
+        return merged
+
+    @traceable(name="specialists.mcp.retrieve_many", run_type="tool", process_outputs=trace_hit_outputs)
+    def retrieve_many(
+        self,
+        queries: Sequence[str],
+        top_k: int,
+        retrieve_contexts: Optional[Sequence[Optional[RetrieveContextPayload]]] = None,
+    ) -> list[Union[HitBatch, GuardrailsViolationError]]:
+        """Retrieve for many queries with one embedding pass and nq>1 searches.
+
+        Guardrail input blocks are per query: a blocked query gets its
+        GuardrailsViolationError in its result slot instead of failing the batch.
+        """
+        contexts = [dict(context or {}) for context in (retrieve_contexts or [None] * len(queries))]
+        results: list[Union[HitBatch, GuardrailsViolationError]] = []
+        allowed: list[int] = []
+        guarded_queries: list[str] = []
+        for idx, query in enumerate(queries):
+            try:
+                guarded_queries.append(self._guardrails.guard_input(query))
+            except GuardrailsViolationError as exc:
+                results.append(exc)
+                continue
+            results.append(HitBatch.empty(tool=self._tool_names["retrieve"]))
+            allowed.append(idx)
+        # Comparison questions keep their per-period fan-out; the rest share nq>1 searches.
+        fanout = [
+            position
+            for position, idx in enumerate(allowed)
+            if self.config.fanout_enabled and len(contexts[idx].get("year_slices", [])) >= 2
+        ]
+        for position in fanout:
+            idx = allowed[position]
+            results[idx] = self._retrieve_fanout(guarded_queries[position], top_k, contexts[idx])
+        guarded_queries = [query for position, query in enumerate(guarded_queries) if position not in fanout]
+        allowed = [idx for position, idx in enumerate(allowed) if position not in fanout]
+        if not allowed:
+            return results
+
+        collection = self._get_collection()
+        batches = run_retrieve_many(
+            queries=guarded_queries,
+            top_k=top_k,
+            retrieve_contexts=[contexts[idx] for idx in allowed],
+            collection=collection,
+            embedder=self._get_embedder(),
+            bm25_encoder=self._get_bm25_encoder(),
+            retrieve_tool_name=self._tool_names["retrieve"],
+            fy_filtering_enabled=self.config.fy_filtering_enabled,
+            recent_year_window=self.config.recent_year_window,
+            corpus_latest_fy=self.config.corpus_latest_fy,
+            retrieve_recency_boost=self.config.retrieve_recency_boost,
+            merge_strategy=self.config.hybrid_merge_strategy,
+            rrf_k=self.config.hybrid_rrf_k,
+            partition_names=[self._resolve_partitions(contexts[idx]) for idx in allowed],
+            include_text=self._get_docstore() is None,
         )
+        for idx, batch in zip(allowed, batches):
+            results[idx] = batch
+        return results
 
-    @traceable(name="specialists.mcp.rerank", run_type="tool")
-    def rerank(self, query: str, hits: Sequence[RetrievalHit], top_n: int) -> list[RetrievalHit]:
+    @traceable(name="specialists.mcp.rerank", run_type="tool", process_outputs=trace_hit_outputs)
+    def rerank(self, query: str, hits: Union[HitBatch, Sequence[RetrievalHit]], top_n: int) -> HitBatch:
         cross_encoder = self._get_cross_encoder()
         return rerank_hits(
             query=query,
-            hits=hits,
+            hits=self._prepare_rerank_candidates(hits),
             top_n=top_n,
             rerank_tool_name=self._tool_names["rerank"],
             cross_encoder=cross_encoder,
@@ -101,6 +300,30 @@ class Specialists:
             recent_year_window=self.config.recent_year_window,
             corpus_latest_fy=self.config.corpus_latest_fy,
             rerank_recency_boost=self.config.rerank_recency_boost,
+            **self._rerank_cache_kwargs(),
+            **self._cascade_kwargs(),
+        )
+
+    @traceable(name="specialists.mcp.rerank_many", run_type="tool", process_outputs=trace_hit_outputs)
+    def rerank_many(
+        self,
+        queries: Sequence[str],
+        hits_per_query: Sequence[Union[HitBatch, Sequence[RetrievalHit]]],
+        top_n: int,
+    ) -> list[HitBatch]:
+        """Rerank many queries with shared cross-encoder batches."""
+        return rerank_many_hits(
+            queries=queries,
+            hits_per_query=[self._prepare_rerank_candidates(hits) for hits in hits_per_query],
+            top_n=top_n,
+            rerank_tool_name=self._tool_names["rerank"],
+            cross_encoder=self._get_cross_encoder(),
+            candidate_limit=self.config.rerank_candidate_limit,
+            recent_year_window=self.config.recent_year_window,
+            corpus_latest_fy=self.config.corpus_latest_fy,
+            rerank_recency_boost=self.config.rerank_recency_boost,
+            **self._rerank_cache_kwargs(),
+            **self._cascade_kwargs(),
         )
 
     @traceable(name="specialists.mcp.synthesize", run_type="llm")
@@ -108,7 +331,7 @@ class Specialists:
         self,
         original_query: str,
         revised_query: str,
-        hits: Sequence[RetrievalHit],
+        hits: Union[HitBatch, Sequence[RetrievalHit]],
     ) -> str:
         model = self._get_synthesis_model()
         return synthesize_answer(
@@ -117,10 +340,38 @@ class Specialists:
             revised_query=revised_query,
             hits=hits,
             guard_output=self._guardrails.guard_output,
+            evidence_packer=self._evidence_packer,
+        )
+
+    @traceable(name="specialists.mcp.synthesize_stream", run_type="llm")
+    def synthesize_stream(
+        self,
+        original_query: str,
+        revised_query: str,
+        hits: Union[HitBatch, Sequence[RetrievalHit]],
+    ) -> Iterator[str]:
+        """Answer text in output-guarded windows, as the synthesis model streams."""
+        yield from stream_synthesis(
+            model=self._get_synthesis_model(),
+            original_query=original_query,
+            revised_query=revised_query,
+            hits=hits,
+            guard_output=self._guardrails.guard_output,
+            window_chars=self.config.stream_guard_window_chars,
+            evidence_packer=self._evidence_packer,
         )
 
     @traceable(name="specialists.mcp.reflect", run_type="llm")
-    def reflect(self, original_query: str, revised_query: str, answer: str, hits: Sequence[RetrievalHit]) -> ReflectionResult:
+    def reflect(
+        self,
+        original_query: str,
+        revised_query: str,
+        answer: str,
+        hits: Union[HitBatch, Sequence[RetrievalHit]],
+    ) -> ReflectionResult:
+        local = self._local_reflect(original_query, revised_query, answer, hits)
+        if local is not None:
+            return local
         model = self._get_reflection_model()
         return reflect_answer(
             model=model,
@@ -131,22 +382,238 @@ class Specialists:
             guard_output=self._guardrails.guard_output,
         )
 
+    async def run_blocking(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run blocking work (Milvus search, model inference, guardrails) off the event loop.
+
+        Uses a bounded executor (AGENT_ASYNC_OFFLOAD_WORKERS) so async requests
+        waiting on LLM calls hold no threads, while blocking stages still queue.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_offload_executor(), partial(fn, *args, **kwargs))
+
+    @traceable(name="specialists.mcp.asynthesize", run_type="llm")
+    async def asynthesize(
+        self,
+        original_query: str,
+        revised_query: str,
+        hits: Union[HitBatch, Sequence[RetrievalHit]],
+    ) -> str:
+        return await asynthesize_answer(
+            model=self._get_synthesis_model(),
+            original_query=original_query,
+            revised_query=revised_query,
+            hits=hits,
+            guard_output=self._aguard_output,
+            evidence_packer=self._evidence_packer,
+        )
+
+    @traceable(name="specialists.mcp.areflect", run_type="llm")
+    async def areflect(
+        self,
+        original_query: str,
+        revised_query: str,
+        answer: str,
+        hits: Union[HitBatch, Sequence[RetrievalHit]],
+    ) -> ReflectionResult:
+        local = self._local_reflect(original_query, revised_query, answer, hits)
+        if local is not None:
+            return local
+        return await areflect_answer(
+            model=self._get_reflection_model(),
+            original_query=original_query,
+            revised_query=revised_query,
+            answer=answer,
+            hits=hits,
+            guard_output=self._aguard_output,
+        )
+
+    def estimate_reflection(
+        self,
+        original_query: str,
+        revised_query: str,
+        answer: str,
+        hits: Union[HitBatch, Sequence[RetrievalHit]],
+    ) -> ReflectionResult:
+        """Local evidence-coverage reflection, used when the reflection LLM call would overrun the request deadline."""
+        scorer = self._local_reflection or LocalReflectionScorer(
+            support_overlap=self.config.local_reflection_support_overlap,
+            corpus_earliest_fy=self.config.corpus_earliest_fy,
+            corpus_latest_fy=self.config.corpus_latest_fy,
+        )
+        return scorer.estimate(original_query, revised_query, answer, hits)
+
+    def _local_reflect(
+        self,
+        original_query: str,
+        revised_query: str,
+        answer: str,
+        hits: Union[HitBatch, Sequence[RetrievalHit]],
+    ) -> Optional[ReflectionResult]:
+        if self._local_reflection is None:
+            return None
+        return self._local_reflection.reflect(original_query, revised_query, answer, hits)
+
+    async def _aguard_output(self, text: str, stage: str) -> str:
+        return await self.run_blocking(self._guardrails.guard_output, text, stage)
+
+    def _get_offload_executor(self) -> ThreadPoolExecutor:
+        if self._offload_executor is None:
+            with self._offload_lock:
+                if self._offload_executor is None:
+                    self._offload_executor = ThreadPoolExecutor(
+                        max_workers=self.config.async_offload_workers, thread_name_prefix="specialists-offload"
+                    )
+        return self._offload_executor
+
+    def _rerank_cache_kwargs(self) -> dict[str, Any]:
+        if self._rerank_cache is None:
+            return {}
+        return {
+            "score_cache": self._rerank_cache,
+            "cache_model": self.config.cross_encoder_model,
+            "corpus_version": self.corpus_version,
+        }
+
+    def _cascade_kwargs(self) -> dict[str, Any]:
+        if self._cascade_policy is None:
+            return {}
+        return {"cascade_policy": self._cascade_policy, "prefilter_encoder": self._get_prefilter_encoder()}
+
+    def prepare_without_rerank(self, hits: Union[HitBatch, Sequence[RetrievalHit]], top_n: int) -> HitBatch:
+        """Evidence in retrieval order when rerank is skipped: compacted, capped to top_n, then hydrated."""
+        return self._hydrate_texts(self._compact(HitBatch.coerce(hits))[: max(1, top_n)])
+
+    def _prepare_rerank_candidates(self, hits: Union[HitBatch, Sequence[RetrievalHit]]) -> HitBatch:
+        """Compact overlapping neighbours, cap to the rerank candidate limit, then hydrate text.
+
+        Only rows that reach the cross-encoder are read from the docstore.
+        """
+        batch = self._compact(HitBatch.coerce(hits))
+        return self._hydrate_texts(batch[: max(1, self.config.rerank_candidate_limit)])
+
+    def _compact(self, batch: HitBatch) -> HitBatch:
+        if not self.config.compaction_enabled:
+            return batch
+        if self.config.compaction_merge_spans:
+            batch = self._hydrate_texts(batch)  # merged spans are built from member texts
+        # Drop overlapping neighbour chunks before they cost cross-encoder pairs and evidence tokens.
+        return compact_overlapping_chunks(
+            batch,
+            merge_spans=self.config.compaction_merge_spans,
+            max_span_words=self.config.compaction_max_span_words,
+        )
+
+    def _hydrate_texts(self, batch: HitBatch) -> HitBatch:
+        """Fill empty texts from the docstore; ids it does not know are re-fetched from Milvus."""
+        docstore = self._get_docstore()
+        missing = [row for row, text in enumerate(batch.texts) if not text]
+        if docstore is None or not missing:
+            return batch
+        texts = list(batch.texts)
+        unknown = []
+        for row, text in zip(missing, docstore.get_many([batch.chunk_ids[row] for row in missing])):
+            if text is None:
+                unknown.append(row)
+            texts[row] = text or ""
+        if unknown:
+            # A docstore older than the collection: fall back to Milvus text rather than empty evidence.
+            chunk_ids = [batch.chunk_ids[row] for row in unknown]
+            logger.warning("docstore missing %d chunk(s), re-fetching from Milvus: %s", len(chunk_ids), chunk_ids[:5])
+            fetched = fetch_chunk_texts(self._get_collection(), chunk_ids)
+            for row in unknown:
+                texts[row] = fetched.get(batch.chunk_ids[row], "")
+        return replace(batch, texts=texts)
+
+    def stats(self) -> dict[str, Any]:
+        """Runtime metrics for `GET /stats` (Milvus/inference/LLM pools, FY partitions, adaptive paths, rerank cache/batching)."""
+        collection = self._collection
+        cross_encoder = self._cross_encoder
+        base_encoder = cross_encoder.model if isinstance(cross_encoder, MicroBatchScheduler) else cross_encoder
+        return {
+            "milvus_pool": collection.stats() if isinstance(collection, MilvusConnectionPool) else None,
+            "loaded_fy_partitions": self._partition_loader.loaded_years if self._partition_loader is not None else None,
+            "adaptive_retrieval": self._adaptive_stats.stats() if self._adaptive_stats is not None else None,
+            "rerank_cache": self._rerank_cache.stats() if self._rerank_cache is not None else None,
+            "rerank_scheduler": cross_encoder.stats() if isinstance(cross_encoder, MicroBatchScheduler) else None,
+            "rerank_token_cache": base_encoder.stats() if isinstance(base_encoder, PretokenizedCrossEncoder) else None,
+            "inference_workers": self._inference_pool.stats() if self._inference_pool is not None else None,
+            "llm_clients": llm_client_stats(),
+            "llm_usage": llm_usage_stats(),
+            "evidence_packing": self._evidence_packer.stats() if self._evidence_packer is not None else None,
+            "local_reflection": self._local_reflection.stats() if self._local_reflection is not None else None,
+        }
+
     def _get_collection(self):
         if self._collection is not None:
             return self._collection
-
-        from pymilvus import Collection, connections
-
-        connections.connect(uri=os.getenv("MILVUS_URI"), token=os.getenv("MILVUS_TOKEN"))
-        collection = Collection(self.config.milvus_collection)
-        collection.load()
-        self._collection = collection
+        with self._collection_lock:
+            if self._collection is None:
+                self._collection = self._open_collection()
         return self._collection
 
+    def _open_collection(self):
+        # Pooled aliases so concurrent API threads don't share one gRPC channel.
+        collection = MilvusConnectionPool(
+            collection_name=self.config.milvus_collection,
+            uri=os.getenv("MILVUS_URI"),
+            token=os.getenv("MILVUS_TOKEN"),
+            size=self.config.milvus_pool_size,
+            max_in_flight=self.config.milvus_max_in_flight,
+            acquire_timeout_seconds=self.config.mcp_timeout_seconds,
+            consistency_level=self.config.milvus_consistency_level,
+        )
+        loader = (
+            YearPartitionLoader(collection, load_all_when_unscoped=self.config.fy_partitions_unscoped_load_all)
+            if self.config.fy_partitions_enabled
+            else None
+        )
+        if loader is not None and loader.partitioned:
+            # Hot years load now; older FY partitions load on first request that needs them.
+            loader.load_hot(
+                corpus_latest_fy=self.config.corpus_latest_fy,
+                recent_year_window=self.config.recent_year_window,
+            )
+            self._partition_loader = loader
+        else:
+            collection.load()
+        return collection
+
+    def _resolve_partitions(self, retrieve_context: RetrieveContextPayload) -> Optional[list[str]]:
+        if self._partition_loader is None:
+            return None
+        requested_years = requested_years_from_context(retrieve_context) if self.config.fy_filtering_enabled else []
+        return self._partition_loader.resolve(requested_years)
+
+    def _get_inference_pool(self) -> Optional[InferenceWorkerPool]:
+        """Worker processes for embed/score calls; None keeps inference in the API process."""
+        if not self.config.inference_workers or self._inference_pool is not None:
+            return self._inference_pool
+        with self._inference_lock:
+            if self._inference_pool is None:
+                self._inference_pool = InferenceWorkerPool(
+                    embedding_model=self.config.embedding_model,
+                    cross_encoder_model=self.config.cross_encoder_model,
+                    workers=self.config.inference_workers,
+                    threads_per_worker=self.config.inference_threads_per_worker,
+                    max_in_flight=self.config.inference_max_in_flight,
+                    timeout_seconds=self.config.mcp_timeout_seconds,
+                    acquire_timeout_seconds=self.config.inference_acquire_timeout_seconds,
+                    score_batch_size=self.config.inference_score_batch_size,
+                    pretokenize_max_entries=(
+                        self.config.rerank_pretokenize_max_entries if self.config.rerank_pretokenize_enabled else 0
+                    ),
+                )
+        return self._inference_pool
+
     def _get_embedder(self):
         if self._embedder is not None:
             return self._embedder
 
+        pool = self._get_inference_pool()
+        if pool is not None:
+            self._embedder = RemoteEmbedder(pool)
+            return self._embedder
+
         from sentence_transformers import SentenceTransformer
 
         self._embedder = SentenceTransformer(self.config.embedding_model, device="cpu")
@@ -163,24 +630,60 @@ class Specialists:
             self._bm25_encoder = pickle.load(handle)
         return self._bm25_encoder
 
+    def _get_docstore(self) -> Optional[ChunkDocstore]:
+        """Memory-mapped chunk texts; None (text comes from Milvus) when disabled or not built yet."""
+        if self._docstore_checked:
+            return self._docstore
+        with self._docstore_lock:
+            if not self._docstore_checked:
+                path = Path(self.config.docstore_path)
+                if self.config.docstore_enabled and ChunkDocstore.exists(path):
+                    self._docstore = ChunkDocstore(path)
+                self._docstore_checked = True
+        return self._docstore
+
     def _get_cross_encoder(self):
         if self._cross_encoder is not None:
             return self._cross_encoder
 
+        pool = self._get_inference_pool()
+        if pool is not None:
+            cross_encoder = RemoteCrossEncoder(pool)
+        else:
+            from sentence_transformers import CrossEncoder
+
+            cross_encoder = CrossEncoder(self.config.cross_encoder_model, device="cpu")
+            if self.config.rerank_pretokenize_enabled:
+                cross_encoder = PretokenizedCrossEncoder(
+                    cross_encoder, max_entries=self.config.rerank_pretokenize_max_entries
+                )
+        if self.config.rerank_microbatch_enabled:
+            # Concurrent requests share forward passes instead of contending for torch threads.
+            cross_encoder = MicroBatchScheduler(
+                cross_encoder,
+                max_wait_ms=self.config.rerank_microbatch_max_wait_ms,
+                max_batch_pairs=self.config.rerank_microbatch_max_pairs,
+            )
+        self._cross_encoder = cross_encoder
+        return self._cross_encoder
+
+    def _get_prefilter_encoder(self):
+        """Small cascade stage-1 cross-encoder; None means stage 1 uses retrieval scores."""
+        if self._prefilter_encoder is not None or not self.config.cascade_prefilter_model:
+            return self._prefilter_encoder
+
         from sentence_transformers import CrossEncoder
 
-        self._cross_encoder = CrossEncoder(self.config.cross_encoder_model, device="cpu")
-        return self._cross_encoder
+        self._prefilter_encoder = CrossEncoder(self.config.cascade_prefilter_model, device="cpu")
+        return self._prefilter_encoder
 
     def _get_synthesis_model(self):
         if self._synthesis_model is not None:
             return self._synthesis_model
 
-        from langchain_openai import ChatOpenAI
-
-        self._synthesis_model = ChatOpenAI(
-            model=self.config.synthesis_model,
-            temperature=self.config.synthesis_temperature,
+        registry = get_llm_client_registry(self.config)
+        self._synthesis_model = registry.chat_model(
+            self.config.synthesis_model, self.config.synthesis_temperature, stage="synthesis"
         )
         return self._synthesis_model
 
@@ -188,10 +691,8 @@ class Specialists:
         if self._reflection_model is not None:
             return self._reflection_model
 
-        from langchain_openai import ChatOpenAI
-
-        self._reflection_model = ChatOpenAI(
-            model=self.config.reflection_model,
-            temperature=self.config.reflection_temperature,
+        registry = get_llm_client_registry(self.config)
+        self._reflection_model = registry.chat_model(
+            self.config.reflection_model, self.config.reflection_temperature, stage="reflection"
         )
         return self._reflection_model
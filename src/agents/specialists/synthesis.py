@@ -1,10 +1,38 @@
 """Synthesis helper for evidence-grounded answer generation."""
 
 import json
-from typing import Callable, Optional, Sequence
+import re
+from typing import Awaitable, Callable, Iterator, Optional, Sequence, Union
 
+from ..core.hit_batch import HitBatch
 from ..core.types import RetrievalHit
 from ..prompts import synthesis as synthesis_prompts
+from .evidence import EvidencePacker, legacy_evidence
+
+_SENTENCE_END = re.compile(r"[.!?:;]\s|\n")
+
+
+def _build_prompt(
+    original_query: str,
+    revised_query: str,
+    hits: Union[HitBatch, Sequence[RetrievalHit]],
+    evidence_packer: Optional[EvidencePacker] = None,
+):
+    if evidence_packer is None:
+        evidence = legacy_evidence(hits)
+    else:
+        evidence = evidence_packer.pack(original_query, revised_query, hits).items
+    return synthesis_prompts.build_synthesis_prompt(
+        original_query=original_query,
+        revised_query=revised_query,
+        evidence_json=json.dumps(evidence),
+    )
+
+
+def _content_text(content) -> str:
+    if isinstance(content, list):
+        return "\n".join(str(item) for item in content)
+    return str(content)
 
 
 def synthesize_answer(
@@ -12,20 +40,96 @@ def synthesize_answer(
     model,
     original_query: str,
     revised_query: str,
-    hits: Sequence[RetrievalHit],
+    hits: Union[HitBatch, Sequence[RetrievalHit]],
     guard_output: Callable[[str, str], str],
+    evidence_packer: Optional[EvidencePacker] = None,
 ) -> str:
-    evidence = [{"source_path": hit.source_path, "text": hit.text, "score": hit.score} for hit in hits[:8]]
-    prompt = synthesis_prompts.build_synthesis_prompt(
-        original_query=original_query,
-        revised_query=revised_query,
-        evidence_json=json.dumps(evidence),
-    )
+    prompt = _build_prompt(original_query, revised_query, hits, evidence_packer)
     response = model.invoke(prompt)
-    content = getattr(response, "content", "")
-    if isinstance(content, list):
-        content = "\n".join(str(item) for item in content)
-    text = str(content).strip()
+    return guard_output(_answer_text(response), "synthesize")
+
+
+async def asynthesize_answer(
+    *,
+    model,
+    original_query: str,
+    revised_query: str,
+    hits: Union[HitBatch, Sequence[RetrievalHit]],
+    guard_output: Callable[[str, str], Awaitable[str]],
+    evidence_packer: Optional[EvidencePacker] = None,
+) -> str:
+    """`synthesize_answer` with `ainvoke` and an awaitable output guard."""
+    prompt = _build_prompt(original_query, revised_query, hits, evidence_packer)
+    response = await model.ainvoke(prompt)
+    return await guard_output(_answer_text(response), "synthesize")
+
+
+def _answer_text(response) -> str:
+    text = _content_text(getattr(response, "content", "")).strip()
     if not text:
         raise RuntimeError("Synthesis tool returned empty response.")
-    return guard_output(text, "synthesize")
+    return text
+
+
+def _window_cut(buffer: str, window_chars: int) -> int:
+    """End offset of the next releasable window (0 = keep buffering).
+
+    Windows end on a sentence boundary once `window_chars` have accumulated, or
+    on whitespace at 2x `window_chars` when the model writes one long sentence.
+    """
+    if len(buffer) < window_chars:
+        return 0
+    boundaries = [match.end() for match in _SENTENCE_END.finditer(buffer)]
+    if boundaries and boundaries[-1] >= window_chars // 2:
+        return boundaries[-1]
+    if len(buffer) >= 2 * window_chars:
+        space = buffer.rfind(" ", 0, 2 * window_chars)
+        return space + 1 if space > 0 else 2 * window_chars
+    return 0
+
+
+def stream_synthesis(
+    *,
+    model,
+    original_query: str,
+    revised_query: str,
+    hits: Union[HitBatch, Sequence[RetrievalHit]],
+    guard_output: Callable[[str, str], str],
+    window_chars: int = 160,
+    evidence_packer: Optional[EvidencePacker] = None,
+) -> Iterator[str]:
+    """Yield answer text in guarded windows as the model streams tokens.
+
+    Each window is checked by the output guardrail together with the tail of
+    the previous window, so content split across a boundary is still seen.
+    A blocked window raises before it is yielded. Joined windows equal the
+    full answer.
+    """
+    prompt = _build_prompt(original_query, revised_query, hits, evidence_packer)
+    buffer = ""
+    previous_tail = ""
+    emitted = False
+
+    def release(window: str) -> str:
+        nonlocal previous_tail
+        guard_output(previous_tail + window, "synthesize")
+        previous_tail = window[-window_chars:]
+        return window
+
+    for chunk in model.stream(prompt):
+        buffer += _content_text(getattr(chunk, "content", chunk))
+        cut = _window_cut(buffer, window_chars)
+        while cut:
+            window, buffer = buffer[:cut], buffer[cut:]
+            if not emitted:
+                window = window.lstrip()
+            if window:
+                emitted = True
+                yield release(window)
+            cut = _window_cut(buffer, window_chars)
+    tail = buffer.rstrip() if emitted else buffer.strip()
+    if tail:
+        emitted = True
+        yield release(tail)
+    if not emitted:
+        raise RuntimeError("Synthesis tool returned empty response.")
@@ -5,12 +5,12 @@ from pathlib import Path
 
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from src.agents.specialists.service import MCPReadinessError
 
-from .schemas import AskRequest, AskResponse, HealthResponse
+from .schemas import AskBatchRequest, AskRequest, AskResponse, HealthResponse, StatsResponse
 from .service import AgentAPIService
 
 FRONTEND_DIR = Path(__file__).resolve().parents[2] / "frontend"
@@ -49,19 +49,55 @@ def create_app(service: AgentAPIService | None = None) -> FastAPI:
     def health(agent_service: AgentAPIService = Depends(get_service)) -> HealthResponse:
         return agent_service.health()
 
+    @app.get("/stats", response_model=StatsResponse)
+    def stats(agent_service: AgentAPIService = Depends(get_service)) -> StatsResponse:
+        return agent_service.stats()
+
     @app.post("/ask", response_model=AskResponse)
-    def ask(
+    async def ask(
         payload: AskRequest,
         agent_service: AgentAPIService = Depends(get_service),
     ) -> AskResponse:
         try:
-            return agent_service.ask(payload)
+            # Async path: the request holds no worker thread while waiting on LLM calls.
+            return await agent_service.aask(payload)
         except MCPReadinessError as exc:
             raise HTTPException(status_code=503, detail=f"MCP readiness failed: {exc}") from exc
         except Exception as exc:
             # Avoid leaking internal error details to clients.
             raise HTTPException(status_code=500, detail="Internal server error.") from exc
 
+    @app.post("/ask/stream")
+    def ask_stream(
+        payload: AskRequest,
+        agent_service: AgentAPIService = Depends(get_service),
+    ) -> StreamingResponse:
+        try:
+            events = agent_service.ask_stream(payload)
+        except MCPReadinessError as exc:
+            raise HTTPException(status_code=503, detail=f"MCP readiness failed: {exc}") from exc
+        # SSE: plan/evidence/token events as each stage finishes, then one result event.
+        return StreamingResponse(
+            events,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.post("/ask/batch")
+    def ask_batch(
+        payload: AskBatchRequest,
+        agent_service: AgentAPIService = Depends(get_service),
+    ) -> StreamingResponse:
+        try:
+            results = agent_service.ask_batch(payload)
+        except MCPReadinessError as exc:
+            raise HTTPException(status_code=503, detail=f"MCP readiness failed: {exc}") from exc
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        # NDJSON: one AskBatchResult per line, flushed as each query finishes.
+        lines = (result.model_dump_json() + "\n" for result in results)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
     return app
 
 
@@ -0,0 +1,88 @@
+"""Semantic answer cache for near-duplicate `/ask` questions."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable
+
+import numpy as np
+
+from .schemas import AskResponse
+
+
+@dataclass
+class _CacheEntry:
+    scope: Hashable
+    vector: np.ndarray
+    response: AskResponse
+    created_at: float
+
+
+class SemanticAnswerCache:
+    """Bounded LRU of answers keyed by query embedding, looked up by cosine similarity.
+
+    Entries only match within the same scope (requested years, corpus version,
+    retrieval overrides). Query vectors are expected to be L2-normalized, so the
+    dot product is the cosine similarity.
+    """
+
+    def __init__(self, *, max_entries: int, threshold: float, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def lookup(self, vector: np.ndarray, scope: Hashable) -> AskResponse | None:
+        now = time.monotonic()
+        with self._lock:
+            self._drop_expired(now)
+            candidates = [(entry_id, entry) for entry_id, entry in self._entries.items() if entry.scope == scope]
+            if candidates:
+                similarities = np.stack([entry.vector for _, entry in candidates]) @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    entry_id, entry = candidates[best]
+                    self._entries.move_to_end(entry_id)
+                    self._hits += 1
+                    return entry.response.model_copy(update={"cached": True})
+            self._misses += 1
+            return None
+
+    def store(self, vector: np.ndarray, scope: Hashable, response: AskResponse) -> None:
+        with self._lock:
+            self._entries[self._next_id] = _CacheEntry(
+                scope=scope,
+                vector=np.asarray(vector, dtype=np.float32),
+                response=response,
+                created_at=time.monotonic(),
+            )
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            }
+
+    def _drop_expired(self, now: float) -> None:
+        expired = [entry_id for entry_id, entry in self._entries.items() if now - entry.created_at > self.ttl_seconds]
+        for entry_id in expired:
+            del self._entries[entry_id]
+            self._evictions += 1
@@ -19,9 +19,47 @@ class AskResponse(BaseModel):
     final_reason: str | None = None
     applicability_note: str | None = None
     uncertainty_note: str | None = None
+    cached: bool = False  # True when served from the semantic answer cache
 
 
 class HealthResponse(BaseModel):
     status: Literal["ok", "degraded"]
     mcp_ready: bool
     message: str
+
+
+class StatsResponse(BaseModel):
+    mcp_ready: bool
+    milvus_pool: dict | None = None  # None until the first search opens the pool
+    loaded_fy_partitions: list[int] | None = None
+    adaptive_retrieval: dict | None = None  # None when AGENT_ADAPTIVE_RETRIEVAL_ENABLED=false
+    rerank_cache: dict | None = None  # None when AGENT_RERANK_CACHE_ENABLED=false
+    rerank_token_cache: dict | None = None  # in-process cross-encoder only; workers keep their own caches
+    inference_workers: dict | None = None  # None when AGENT_INFERENCE_WORKERS=0 (in-process inference)
+    rerank_scheduler: dict | None = None  # None until the cross-encoder loads, or when micro-batching is off
+    evidence_packing: dict | None = None  # None when AGENT_EVIDENCE_PACKING_ENABLED=false
+    local_reflection: dict | None = None  # None when AGENT_LOCAL_REFLECTION_ENABLED=false
+    llm_clients: dict | None = None  # None until the first planner/synthesis/reflection model is built
+    llm_usage: dict | None = None  # per-stage prompt/cached/completion tokens from LLM responses
+    semantic_cache: dict | None = None  # None when AGENT_SEMANTIC_CACHE_ENABLED=false
+    planner_cache: dict | None = None  # None when AGENT_PLANNER_CACHE_ENABLED=false
+
+
+class AskBatchItem(BaseModel):
+    query: str
+    requested_years: list[int] | None = None
+
+
+class AskBatchRequest(BaseModel):
+    queries: list[AskBatchItem]
+    top_k: int | None = None
+    top_n: int | None = None
+
+
+class AskBatchResult(BaseModel):
+    """One NDJSON line of a `/ask/batch` stream; `index` refers to the request order."""
+
+    index: int
+    query: str
+    result: AskResponse | None = None
+    error: str | None = None
@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import json
+from pathlib import Path
+from typing import Iterator
+
 from dotenv import load_dotenv
 
 from src.agents.core.config import AgentConfig
 from src.agents.core.manager import Manager
 from src.agents.core.types import UserQuery
+from src.agents.planner.cache import PlannerOutputCache
+from src.agents.planner.prefilter import CoherencePrefilter
 from src.agents.planner.service import PlannerAI
 from src.agents.specialists.service import MCPReadinessError, Specialists
 
-from .schemas import AskRequest, AskResponse, HealthResponse
+from .cache import SemanticAnswerCache
+from .schemas import AskBatchRequest, AskBatchResult, AskRequest, AskResponse, HealthResponse, StatsResponse
 from .security import assess_prompt_injection
 
 
@@ -22,6 +29,27 @@ class AgentAPIService:
         self.base_config = AgentConfig.from_env()
         self._specialists: Specialists | None = None
         self._startup_error: str | None = None
+        self._answer_cache: SemanticAnswerCache | None = None
+        if self.base_config.semantic_cache_enabled:
+            self._answer_cache = SemanticAnswerCache(
+                max_entries=self.base_config.semantic_cache_max_entries,
+                threshold=self.base_config.semantic_cache_threshold,
+                ttl_seconds=self.base_config.semantic_cache_ttl_seconds,
+            )
+        self._planner_cache: PlannerOutputCache | None = None
+        if self.base_config.planner_cache_enabled:
+            self._planner_cache = PlannerOutputCache(
+                self.base_config.planner_cache_path,
+                ttl_seconds=self.base_config.planner_cache_ttl_seconds,
+                max_entries=self.base_config.planner_cache_max_entries,
+            )
+        self._coherence_prefilter: CoherencePrefilter | None = None
+        if self.base_config.coherence_prefilter_enabled:
+            self._coherence_prefilter = CoherencePrefilter.from_artifact(
+                Path("artifacts") / "bm25_model.pkl",
+                min_vocab_ratio=self.base_config.coherence_prefilter_min_vocab_ratio,
+                min_idf_mass=self.base_config.coherence_prefilter_min_idf_mass,
+            )
         self._initialize_specialists()
 
     def _initialize_specialists(self) -> None:
@@ -37,35 +65,187 @@ class AgentAPIService:
             return HealthResponse(status="degraded", mcp_ready=False, message=self._startup_error or "not ready")
         return HealthResponse(status="ok", mcp_ready=True, message="ready")
 
+    def stats(self) -> StatsResponse:
+        specialist_stats = self._specialists.stats() if self._specialists is not None else {}
+        return StatsResponse(
+            mcp_ready=self._specialists is not None,
+            semantic_cache=self._answer_cache.stats() if self._answer_cache is not None else None,
+            planner_cache=self._planner_cache.stats() if self._planner_cache is not None else None,
+            **specialist_stats,
+        )
+
     def ask(self, payload: AskRequest) -> AskResponse:
         assessment = assess_prompt_injection(payload.query)
         if assessment.blocked:
-            return AskResponse(
-                answer=(
-                    "Sorry, I can’t process this request because it appears to contain "
-                    "instruction or security override patterns. Please rephrase your "
-                    "question as a normal budget query."
-                ),
-                confidence=0.0,
-                state_history=["blocked"],
-                final_reason="prompt_injection_detected",
-            )
+            return self._blocked_response()
 
         if self._specialists is None:
             raise MCPReadinessError(self._startup_error or "MCP is not ready.")
 
         config = self._config_with_overrides(payload)
-        planner = PlannerAI(config)
+        planner = self._planner(config)
+        cached, cache_key = self._lookup_answer_cache(payload, config, planner)
+        if cached is not None:
+            return cached
+
         manager = Manager(config)
-        context = {}
-        if payload.requested_years:
-            context["requested_years"] = payload.requested_years
-        user_query = UserQuery(query=payload.query, context=context or None)
         result = manager.run(
-            user_query=user_query,
+            user_query=self._user_query(payload.query, payload.requested_years),
             planner=planner,
             specialists=self._specialists,
         )
+        return self._finish_response(result, cache_key)
+
+    async def aask(self, payload: AskRequest) -> AskResponse:
+        """`ask` for the async `/ask` handler: no thread is held while LLM calls are in flight."""
+        if assess_prompt_injection(payload.query).blocked:
+            return self._blocked_response()
+        if self._specialists is None:
+            raise MCPReadinessError(self._startup_error or "MCP is not ready.")
+
+        config = self._config_with_overrides(payload)
+        planner = self._planner(config)
+        cached, cache_key = None, None
+        if self._answer_cache is not None:
+            # The cache lookup embeds the query (model inference), so it runs off the event loop.
+            cached, cache_key = await self._specialists.run_blocking(self._lookup_answer_cache, payload, config, planner)
+        if cached is not None:
+            return cached
+
+        result = await Manager(config).arun(
+            user_query=self._user_query(payload.query, payload.requested_years),
+            planner=planner,
+            specialists=self._specialists,
+        )
+        return self._finish_response(result, cache_key)
+
+    def ask_stream(self, payload: AskRequest) -> Iterator[str]:
+        """Validate eagerly, then return server-sent events: plan, evidence, token..., result.
+
+        The `result` event carries the same AskResponse as `/ask`; clients should
+        treat its `answer` as authoritative (e.g. a guardrail block mid-stream
+        replaces the streamed text with the safe reply).
+        """
+        if assess_prompt_injection(payload.query).blocked:
+            return iter([self._sse("result", self._blocked_response().model_dump())])
+        if self._specialists is None:
+            raise MCPReadinessError(self._startup_error or "MCP is not ready.")
+        return self._iter_stream(payload)
+
+    def _iter_stream(self, payload: AskRequest) -> Iterator[str]:
+        try:
+            config = self._config_with_overrides(payload)
+            planner = self._planner(config)
+            cached, cache_key = self._lookup_answer_cache(payload, config, planner)
+            if cached is not None:
+                yield self._sse("result", cached.model_dump())
+                return
+            events = Manager(config).run_stream(
+                user_query=self._user_query(payload.query, payload.requested_years),
+                planner=planner,
+                specialists=self._specialists,
+            )
+            for event, data in events:
+                if event == "result":
+                    yield self._sse("result", self._finish_response(data, cache_key).model_dump())
+                elif event == "token":
+                    yield self._sse("token", {"text": data})
+                else:
+                    yield self._sse(event, data)
+        except Exception:
+            # Avoid leaking internal error details to clients.
+            yield self._sse("error", {"detail": "Internal server error."})
+
+    def _sse(self, event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def _planner(self, config: AgentConfig) -> PlannerAI:
+        return PlannerAI(config, output_cache=self._planner_cache, coherence_prefilter=self._coherence_prefilter)
+
+    def _lookup_answer_cache(
+        self, payload: AskRequest, config: AgentConfig, planner: PlannerAI
+    ) -> tuple[AskResponse | None, tuple | None]:
+        """Cached response (or None) plus the (query_vector, scope) key to store a fresh answer under."""
+        if self._answer_cache is None:
+            return None, None
+        query_vector = self._specialists.embed_query(payload.query)
+        cache_scope = self._cache_scope(payload, config, planner)
+        return self._answer_cache.lookup(query_vector, cache_scope), (query_vector, cache_scope)
+
+    def _finish_response(self, result, cache_key: tuple | None) -> AskResponse:
+        response = self._to_response(result)
+        degraded = any(state.startswith("degraded:") for state in result.state_history)
+        if cache_key is not None and result.state_history[-1:] == ["success"] and not degraded:
+            self._answer_cache.store(*cache_key, response)
+        return response
+
+    def ask_batch(self, payload: AskBatchRequest) -> Iterator[AskBatchResult]:
+        """Validate a batch eagerly, then return an iterator of per-query results in completion order."""
+        if len(payload.queries) > self.base_config.batch_max_queries:
+            raise ValueError(f"Batch exceeds AGENT_BATCH_MAX_QUERIES={self.base_config.batch_max_queries}.")
+        if self._specialists is None:
+            raise MCPReadinessError(self._startup_error or "MCP is not ready.")
+        return self._iter_batch(payload)
+
+    def _iter_batch(self, payload: AskBatchRequest) -> Iterator[AskBatchResult]:
+        runnable: list[int] = []
+        for idx, item in enumerate(payload.queries):
+            if assess_prompt_injection(item.query).blocked:
+                yield AskBatchResult(index=idx, query=item.query, result=self._blocked_response())
+            else:
+                runnable.append(idx)
+        if not runnable:
+            return
+
+        config = self._config_with_overrides(payload)
+        manager = Manager(config)
+        results = manager.run_many(
+            user_queries=[
+                self._user_query(payload.queries[idx].query, payload.queries[idx].requested_years) for idx in runnable
+            ],
+            planner=self._planner(config),
+            specialists=self._specialists,
+        )
+        for position, result in results:
+            idx = runnable[position]
+            query = payload.queries[idx].query
+            if isinstance(result, Exception):
+                # Avoid leaking internal error details to clients.
+                yield AskBatchResult(index=idx, query=query, error="Internal server error.")
+            else:
+                yield AskBatchResult(index=idx, query=query, result=self._to_response(result))
+
+    def _cache_scope(self, payload: AskRequest, config: AgentConfig, planner: PlannerAI) -> tuple:
+        # Answers are only reusable for the same year/doc-type scope, corpus, and retrieval depth.
+        # Inferred scope keeps "FY2024 ..." and "FY2025 ..." paraphrases apart despite near-identical embeddings.
+        inferred = planner.analyze_scope(payload.query)
+        return (
+            tuple(sorted(set(payload.requested_years or inferred.years))),
+            tuple(inferred.doc_types),
+            self._specialists.corpus_version,
+            config.top_k,
+            config.top_n,
+        )
+
+    def _blocked_response(self) -> AskResponse:
+        return AskResponse(
+            answer=(
+                "Sorry, I can’t process this request because it appears to contain "
+                "instruction or security override patterns. Please rephrase your "
+                "question as a normal budget query."
+            ),
+            confidence=0.0,
+            state_history=["blocked"],
+            final_reason="prompt_injection_detected",
+        )
+
+    def _user_query(self, query: str, requested_years: list[int] | None) -> UserQuery:
+        context = {}
+        if requested_years:
+            context["requested_years"] = requested_years
+        return UserQuery(query=query, context=context or None)
+
+    def _to_response(self, result) -> AskResponse:
         reflection = result.reflection or {}
         return AskResponse(
             answer=result.answer,
@@ -76,7 +256,7 @@ class AgentAPIService:
             uncertainty_note=reflection.get("uncertainty_note") if isinstance(reflection, dict) else reflection.uncertainty_note,
         )
 
-    def _config_with_overrides(self, payload: AskRequest) -> AgentConfig:
+    def _config_with_overrides(self, payload: AskRequest | AskBatchRequest) -> AgentConfig:
         overrides = {
             key: value
             for key, value in {
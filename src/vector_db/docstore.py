@@ -0,0 +1,103 @@
+"""Local compressed chunk-text store that lets Milvus skip serving `text`.
+
+Every `load_data.py` run rebuilds it under `artifacts/chunk_docstore/`
+(`--omit-milvus-text` also blanks the Milvus copy). The API then retrieves
+with text omitted and hydrates only the candidates that reach rerank or the
+answer. Chunk ids the docstore does not know (a docstore older than the
+collection) are logged and re-fetched from Milvus by
+`Specialists._hydrate_texts`, so a stale docstore never yields empty evidence.
+"""
+
+import json
+import mmap
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DOCSTORE_DIRNAME = "chunk_docstore"  # under artifacts/, next to bm25_model.pkl
+TEXTS_FILENAME = "texts.bin"  # concatenated zlib-compressed UTF-8 chunk texts
+INDEX_FILENAME = "index.npy"  # int64 [row, (offset, length)] into texts.bin
+IDS_FILENAME = "chunk_ids.json"  # chunk_id per row
+
+
+def write_docstore(chunks: Iterable[Tuple[str, str]], directory: Path, level: int = 6) -> int:
+    """Write (chunk_id, text) pairs as a compressed, memory-mappable docstore.
+
+    Why this exists:
+    - Milvus does not need to serve chunk text; the API hydrates text locally,
+      only for candidates that reach rerank.
+
+    Files are written to temp names and swapped in, so a running API that
+    re-opens the docstore never sees a half-written index.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    chunk_ids: List[str] = []
+    index: List[Tuple[int, int]] = []
+    offset = 0
+
+    texts_tmp = directory / f"{TEXTS_FILENAME}.tmp"
+    with open(texts_tmp, "wb") as handle:
+        for chunk_id, text in chunks:
+            blob = zlib.compress(text.encode("utf-8"), level)
+            handle.write(blob)
+            index.append((offset, len(blob)))
+            chunk_ids.append(chunk_id)
+            offset += len(blob)
+
+    index_tmp = directory / f"{INDEX_FILENAME}.tmp.npy"  # np.save appends .npy to other suffixes
+    np.save(index_tmp, np.asarray(index, dtype=np.int64).reshape(-1, 2))
+    ids_tmp = directory / f"{IDS_FILENAME}.tmp"
+    ids_tmp.write_text(json.dumps(chunk_ids), encoding="utf-8")
+
+    os.replace(texts_tmp, directory / TEXTS_FILENAME)
+    os.replace(index_tmp, directory / INDEX_FILENAME)
+    os.replace(ids_tmp, directory / IDS_FILENAME)
+    return len(chunk_ids)
+
+
+class ChunkDocstore:
+    """Read-only chunk_id -> text lookup over a memory-mapped docstore.
+
+    Only the id map is held in memory; texts stay in the page cache and are
+    decompressed per lookup.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        chunk_ids = json.loads((self.directory / IDS_FILENAME).read_text(encoding="utf-8"))
+        self._rows: Dict[str, int] = {chunk_id: row for row, chunk_id in enumerate(chunk_ids)}
+        self._index = np.load(self.directory / INDEX_FILENAME, mmap_mode="r")
+        self._handle = open(self.directory / TEXTS_FILENAME, "rb")
+        size = os.fstat(self._handle.fileno()).st_size
+        # mmap rejects empty files; an empty docstore simply has no rows.
+        self._texts = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    @staticmethod
+    def exists(directory: Path) -> bool:
+        directory = Path(directory)
+        return all((directory / name).exists() for name in (TEXTS_FILENAME, INDEX_FILENAME, IDS_FILENAME))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._rows
+
+    def get(self, chunk_id: str) -> Optional[str]:
+        row = self._rows.get(chunk_id)
+        if row is None:
+            return None
+        offset, length = (int(value) for value in self._index[row])
+        return zlib.decompress(self._texts[offset : offset + length]).decode("utf-8")
+
+    def get_many(self, chunk_ids: Sequence[str]) -> List[Optional[str]]:
+        return [self.get(chunk_id) for chunk_id in chunk_ids]
+
+    def close(self) -> None:
+        if isinstance(self._texts, mmap.mmap):
+            self._texts.close()
+        self._handle.close()
@@ -21,6 +21,8 @@ from sentence_transformers import SentenceTransformer
 
 # custom BM25 encoder needed; to output format: Dict[int, float] compatible with Milvus sparse vector field
 from .sparse import BM25SparseEncoder
+from .docstore import DOCSTORE_DIRNAME, write_docstore
+from ..agents.mcp.partitions import partition_name_for_year  # one partition per financial_year, shared with the API
 
 # load env vars from .env file
 load_dotenv()
@@ -42,6 +44,7 @@ DEFAULT_EMBED_BATCH_SIZE = 32  # to control how many chunks to embed per model c
 ARTIFACTS_DIR = Path("artifacts")
 BM25_MODEL_FILENAME = "bm25_model.pkl"
 DELETE_BATCH_SIZE = 50  # Controlled delete for incremental runs and smoothen vector db traffic
+LEGACY_PARTITION = "_default"  # where rows went before FY partitions
 DENSE_INDEX_PARAMS = {"index_type": "HNSW", "metric_type": "IP", "params": {"M": 8, "efConstruction": 200}}
 SPARSE_INDEX_PARAMS = {"index_type": "SPARSE_INVERTED_INDEX", "metric_type": "IP"}
 
@@ -197,6 +200,31 @@ def ensure_collection(name: str, embedding_dim: int) -> Collection:
     return collection
 
 
+def ensure_year_partitions(collection: Collection, financial_years: List[int]) -> None:
+    """Create one partition per financial_year so the API can search/load years independently."""
+    for financial_year in sorted(set(financial_years)):
+        name = partition_name_for_year(financial_year)
+        if not collection.has_partition(name):
+            collection.create_partition(name)
+
+
+def count_legacy_partition_rows(collection: Collection) -> int:
+    """Rows an ingest before FY partitions left in `_default` (the API never searches them)."""
+    if collection.num_entities == 0:
+        return 0
+    collection.load()
+    rows = collection.query(expr="", output_fields=["count(*)"], partition_names=[LEGACY_PARTITION])
+    return int(rows[0]["count(*)"]) if rows else 0
+
+
+def group_records_by_year(chunk_records: List[Dict[str, object]]) -> Dict[int, List[int]]:
+    """Map financial_year -> record indexes (keeps original order within each year)."""
+    groups: Dict[int, List[int]] = {}
+    for idx, record in enumerate(chunk_records):
+        groups.setdefault(int(record["financial_year"]), []).append(idx)
+    return groups
+
+
 def connect_milvus() -> None:
     milvus_uri = os.getenv(ENV_MILVUS_URI)
     milvus_token = os.getenv(ENV_MILVUS_TOKEN)
@@ -228,6 +256,11 @@ def main() -> None:
         action="store_true",
         help="Drop and recreate the collection before ingest (strong idempotency)",
     )
+    parser.add_argument(
+        "--omit-milvus-text",
+        action="store_true",
+        help="Store empty text in Milvus; the API hydrates chunk text from the local docstore",
+    )
     args = parser.parse_args()
 
     data_root = Path(args.data_root)
@@ -250,6 +283,12 @@ def main() -> None:
     ARTIFACTS_DIR.mkdir(exist_ok=True)
     with open(ARTIFACTS_DIR / BM25_MODEL_FILENAME, "wb") as handle:
         pickle.dump(bm25, handle)
+    # Full rebuild every run (like BM25): ingestion always processes the whole data root.
+    stored = write_docstore(
+        ((str(record["chunk_id"]), str(record["text"])) for record in chunk_records),
+        ARTIFACTS_DIR / DOCSTORE_DIRNAME,
+    )
+    print(f"Wrote {stored} chunk texts to '{ARTIFACTS_DIR / DOCSTORE_DIRNAME}'")
 
     dense_vectors = embed_texts_local(args.embedding_model, texts, args.embedding_batch_size)
     if not dense_vectors:
@@ -270,6 +309,14 @@ def main() -> None:
         print(f"Dropping existing collection '{args.collection}' for full rebuild")
         utility.drop_collection(args.collection)
     collection = ensure_collection(args.collection, embedding_dim)
+    if not args.recreate_collection:
+        legacy_rows = count_legacy_partition_rows(collection)
+        if legacy_rows:
+            # Upserting into fy<YYYY> would duplicate these chunk_ids, and year-less queries never see `_default`.
+            raise RuntimeError(
+                f"Collection '{args.collection}' has {legacy_rows} rows in '{LEGACY_PARTITION}' from an ingest "
+                "before FY partitions; rerun with --recreate-collection to migrate them."
+            )
 
     if args.reset_docs and not args.recreate_collection:
         """If apply --reset_docs and not --recreate_collection.
@@ -293,11 +340,17 @@ def main() -> None:
         "chunk_end",
         "text",
     ]
-    payload = [[record[column] for record in chunk_records] for column in columns]  # records: list of dict from build_chunk_records()
-    payload.extend([dense_vectors, sparse_vectors])  # append the list of vectors to payload list
-
-    # Recent managed milvus (zilliz cloud) should support upsert operations
-    collection.upsert(payload)
+    year_groups = group_records_by_year(chunk_records)
+    ensure_year_partitions(collection, list(year_groups))
+    for financial_year, indexes in sorted(year_groups.items()):
+        # records: list of dict from build_chunk_records(); one upsert per FY partition
+        payload = [[chunk_records[idx][column] for idx in indexes] for column in columns]
+        if args.omit_milvus_text:
+            payload[columns.index("text")] = ["" for _ in indexes]  # text lives in the local docstore
+        payload.extend([[dense_vectors[idx] for idx in indexes], [sparse_vectors[idx] for idx in indexes]])
+
+        # Recent managed milvus (zilliz cloud) should support upsert operations
+        collection.upsert(payload, partition_name=partition_name_for_year(financial_year))
 
     collection.flush()  # flush() forces all buffered insert / upsert / delete operations to be persisted as segments on storage.
     collection.load()  # refresh memory
@@ -12,6 +12,20 @@ def _tokenize(text: str) -> List[str]:
     return _TOKEN_PATTERN.findall(text.lower())
 
 
+@dataclass
+class SparseQuerySignal:
+    """How much lexical signal a query carries against the fitted BM25 vocabulary."""
+
+    total_terms: int
+    matched_terms: int  # query tokens present in the corpus vocabulary
+    mass: float  # sum of query weights (idf * tf)
+    max_idf_ratio: float  # rarest matched term's idf / corpus max idf, in [0, 1]
+
+    @property
+    def coverage(self) -> float:
+        return self.matched_terms / self.total_terms if self.total_terms else 0.0
+
+
 @dataclass
 class BM25SparseEncoder:
     """Minimal BM25 encoder that returns sparse vectors for Milvus.
@@ -63,6 +77,19 @@ class BM25SparseEncoder:
         """Encode queries with IDF-weighted term frequency (no length normalization)."""
         return [self._encode(text, use_bm25=False) for text in texts]
 
+    def query_signal(self, text: str) -> SparseQuerySignal:
+        """Score a query's lexical signal (used by adaptive retrieval to pick a search path)."""
+        tokens = _tokenize(text)
+        matched = [self.vocab[token] for token in tokens if token in self.vocab]
+        max_corpus_idf = max(self.idf) if self.idf else 0.0
+        max_idf = max((self.idf[idx] for idx in matched), default=0.0)
+        return SparseQuerySignal(
+            total_terms=len(tokens),
+            matched_terms=len(matched),
+            mass=float(sum(self.idf[idx] for idx in matched)),
+            max_idf_ratio=(max_idf / max_corpus_idf) if max_corpus_idf else 0.0,
+        )
+
     def _encode(self, text: str, use_bm25: bool) -> Dict[int, float]:
         # Sparse dict maps vocab index -> weight, matching Milvus sparse format.
         tokens = _tokenize(text)
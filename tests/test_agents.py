@@ -1,18 +1,76 @@
+import asyncio
+import http.server
 import io
 import os
+import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import redirect_stdout
+from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
+import numpy as np
 from pydantic import ValidationError
 
 from src.agents.core.config import AgentConfig
+from src.agents.core.deadline import RequestDeadline, StageDeadlineExceeded
+from src.agents.core.hit_batch import HitBatch
 from src.agents.core.manager import Manager
+from src.agents.planner.analyzer import analyze_query
+from src.agents.planner.cache import PlannerOutputCache
+from src.agents.planner.prefilter import CoherencePrefilter
 from src.agents.planner.service import PlannerAI
 from src.agents.runtime import main as runtime_main
 from src.agents.specialists.service import GuardrailsViolationError, MCPReadinessError, Specialists
 from src.agents.core.types import ReflectionResult, RetrievalHit, UserQuery
+from src.agents.mcp.partitions import YearPartitionLoader
+from src.vector_db.docstore import ChunkDocstore, write_docstore
+from src.vector_db.sparse import BM25SparseEncoder
+from src.agents.specialists.compaction import compact_overlapping_chunks
+from src.agents.specialists.evidence import EvidencePacker, estimate_tokens
+from src.agents.specialists.microbatch import MicroBatchScheduler
+from src.agents.specialists.pretokenized import PretokenizedCrossEncoder
+from src.agents.specialists.synthesis import stream_synthesis
+from src.agents.specialists.retrieval import build_doc_type_filter_expr, build_year_filter_expr, combine_filter_exprs
+from src.agents.mcp.inference import (
+    InferencePoolSaturatedError,
+    InferenceWorkerPool,
+    RemoteCrossEncoder,
+    RemoteEmbedder,
+)
+from src.agents.mcp.llm_clients import LLMClientRegistry
+from src.agents.prompts import build_reflection_prompt, build_synthesis_prompt, prompt_cache_key
+from src.agents.mcp.pool import MilvusConnectionPool, MilvusPoolSaturatedError
+
+
+class _WorkerEmbedder:
+    def encode(self, texts, normalize_embeddings=True):
+        return [[float(len(text)), 0.0] for text in texts]
+
+
+class _WorkerCrossEncoder:
+    def predict(self, pairs, batch_size=32):
+        if any(text == "boom" for _, text in pairs):
+            raise ValueError("bad pair")
+        if any(text == "hang" for _, text in pairs):
+            time.sleep(30)
+        return [float(len(text)) for _, text in pairs]
+
+
+def _fake_inference_models():
+    return _WorkerEmbedder(), _WorkerCrossEncoder()
+
+
+class _BatchSizeEchoCrossEncoder:
+    def predict(self, pairs, batch_size=32):
+        return [float(batch_size)] * len(pairs)
+
+
+def _batch_size_echo_models():
+    return _WorkerEmbedder(), _BatchSizeEchoCrossEncoder()
 
 
 def setUpModule():
@@ -144,6 +202,50 @@ class PlannerTests(unittest.TestCase):
         self.assertEqual(retrieve_params["year_mode"], "none")
         self.assertEqual(retrieve_params["requested_years"], [])
 
+    def test_query_analyzer_infers_years_and_doc_types_when_client_sends_none(self):
+        with patch.object(
+            self.planner,
+            "_generate_planner_output",
+            return_value={"revised_query": "post-COVID annex support", "coherence": "coherent", "coherence_reason": None},
+        ):
+            plan = self.planner.build_plan(UserQuery(query="What support was listed in the annex post-COVID?"))
+        retrieve_params = plan.steps[0].params
+        self.assertEqual(retrieve_params["year_mode"], "inferred")
+        self.assertEqual(retrieve_params["requested_years"], [2022, 2023, 2024, 2025])
+        self.assertEqual(retrieve_params["doc_types"], ["annex"])
+
+    def test_comparison_question_splits_into_period_slices(self):
+        with patch.object(
+            self.planner,
+            "_generate_planner_output",
+            return_value={"revised_query": "healthcare priorities pre vs post COVID", "coherence": "coherent", "coherence_reason": None},
+        ):
+            plan = self.planner.build_plan(UserQuery(query="How did healthcare priorities change before vs after COVID?"))
+            explicit = self.planner.build_plan(
+                UserQuery(query="Compare healthcare support", context={"requested_years": [2016, 2018, 2020, 2022, 2024, 2025]})
+            )
+            single = self.planner.build_plan(UserQuery(query="What are FY2025 healthcare measures?"))
+        self.assertEqual(plan.steps[0].params["year_slices"], [[2016, 2017, 2018, 2019], [2022, 2023, 2024, 2025]])
+        self.assertEqual(explicit.steps[0].params["year_slices"], [[2016, 2018], [2020, 2022], [2024], [2025]])
+        self.assertNotIn("year_slices", single.steps[0].params)
+
+    def test_query_analyzer_parses_fy_mentions_ranges_and_spans(self):
+        cases = {
+            "What are FY2025 productivity measures?": [2025],
+            "FY20-FY22 wage support": [2020, 2021, 2022],
+            "between 2018 and 2019 and then FY2024": [2018, 2019, 2024],
+            "FY2019 and FY2023 comparisons": [2019, 2023],
+            "pre-COVID transfers": [2016, 2017, 2018, 2019],
+            "changes in the last 2 years": [2024, 2025],
+            "top 10 to 20 schemes": [],
+        }
+        for query, years in cases.items():
+            with self.subTest(query=query):
+                scope = analyze_query(query, corpus_earliest_fy=2016, corpus_latest_fy=2025)
+                self.assertEqual(scope.years, years)
+        scope = analyze_query("Budget debate round-up speech on CDC vouchers", corpus_earliest_fy=2016, corpus_latest_fy=2025)
+        self.assertEqual(scope.doc_types, ["round_up_speech"])
+
     def test_fail_fast_on_empty_revised_query(self):
         with patch.object(
             self.planner,
@@ -177,6 +279,70 @@ class PlannerTests(unittest.TestCase):
         self.assertEqual(fake_model.last_prompt, "PLANNER_PROMPT")
         self.assertEqual(mock_builder.call_count, 1)
 
+    def test_planner_output_cache_skips_llm_for_repeats_and_invalidates_on_prompt_change(self):
+        output = {"revised_query": "FY2025 SME grants", "coherence": "coherent", "coherence_reason": None}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "planner.sqlite3")
+            cache = PlannerOutputCache(path, ttl_seconds=60, max_entries=8)
+            planner = PlannerAI(self.config, output_cache=cache)
+            with patch.object(planner, "_generate_planner_output", return_value=output) as mock_llm:
+                planner.build_plan(UserQuery(query="FY2025 SME grants?"))
+                plan = planner.build_plan(UserQuery(query="  fy2025 sme   GRANTS? "))
+            self.assertEqual(mock_llm.call_count, 1)
+            self.assertEqual(plan.revised_query, "FY2025 SME grants")
+            self.assertEqual(cache.stats()["hits"], 1)
+            cache.close()
+
+            # Persisted across restarts; rows from an older prompt version are purged on open.
+            self.assertEqual(PlannerOutputCache(path, ttl_seconds=60, max_entries=8).stats()["entries"], 1)
+            with patch("src.agents.planner.cache.planner_prompt_version", return_value="edited"):
+                reopened = PlannerOutputCache(path, ttl_seconds=60, max_entries=8)
+            self.assertEqual(reopened.stats()["entries"], 0)
+            self.assertEqual(reopened.stats()["purged_stale_rows"], 1)
+
+    def test_planner_prefilter_rejects_gibberish_without_llm_call(self):
+        encoder = BM25SparseEncoder()
+        encoder.fit(
+            [
+                "what are the budget measures of SMEs",
+                "the budget of productivity grants",
+                "the cost of living",
+                "the cash payouts of seniors",
+            ]
+        )
+        planner = PlannerAI(self.config, coherence_prefilter=CoherencePrefilter(encoder))
+        output = {"revised_query": "FY2025 budget measures", "coherence": "coherent", "coherence_reason": None}
+        with patch.object(planner, "_generate_planner_output", return_value=output) as mock_llm:
+            cases = {
+                "blorb flarq 2025 ???": "prefilter:out_of_vocabulary",
+                "???": "prefilter:no_terms",
+                "the blorb of flarq": "prefilter:low_idf_mass",
+                "xkcdqwrt zzzzz": "prefilter:keyboard_mash",
+            }
+            for query, reason in cases.items():
+                with self.subTest(query=query):
+                    plan = planner.build_plan(UserQuery(query=query))
+                    self.assertEqual((plan.coherence, plan.coherence_reason), ("incoherent", reason))
+                    self.assertEqual(plan.revised_query, query)
+            self.assertEqual(mock_llm.call_count, 0)
+            deferred = (
+                "what are the budget measures?",
+                "what are blorb flarq",
+                "payouts",
+                "2025",
+                "预算措施",
+                "Bantuan untuk warga emas dalam Bajet 2025",
+                "Quelles sont les mesures du budget pour les seniors ?",
+                "Bantuan warga emas Bajet 2025",
+                "Bajet 2025 bantuan tunai",
+                "Ayuda presupuesto jubilados 2025",
+                "Hilfe Rentner Haushalt",
+                "wat iz teh bugdet mesures",
+            )
+            for query in deferred:
+                self.assertEqual(planner.build_plan(UserQuery(query=query)).coherence, "coherent")
+        self.assertEqual(mock_llm.call_count, len(deferred))
+
     def test_planner_sets_incoherent_fields(self):
         with patch.object(
             self.planner,
@@ -252,6 +418,49 @@ class ManagerTests(unittest.TestCase):
         self.assertEqual(result.state_history.count("execute_plan"), 1)
         self.assertEqual(result.final_reason, "confidence_high")
 
+    def test_manager_run_stream_emits_stage_events_and_guarded_windows(self):
+        config = AgentConfig(guardrails_enabled=False, stream_guard_window_chars=20)
+
+        class StreamingModel:
+            def stream(self, prompt):
+                for token in ["FY2025 adds ", "SkillsFuture credits. ", "Firms get ", "grants", "."]:
+                    yield SimpleNamespace(content=token)
+
+        guarded = []
+
+        def guard_output(text, stage):
+            guarded.append(text)
+            return text
+
+        class StreamingSpecialists(StyleLoopSpecialists):
+            def synthesize_stream(self, original_query, revised_query, hits):
+                yield from stream_synthesis(
+                    model=StreamingModel(),
+                    original_query=original_query,
+                    revised_query=revised_query,
+                    hits=hits,
+                    guard_output=guard_output,
+                    window_chars=config.stream_guard_window_chars,
+                )
+
+        planner = PlannerAI(config)
+        with patch.object(
+            planner,
+            "_generate_planner_output",
+            return_value={"revised_query": "query-v1", "coherence": "coherent", "coherence_reason": None},
+        ):
+            events = list(Manager(config).run_stream(UserQuery(query="FY2025 support"), planner, StreamingSpecialists()))
+
+        names = [name for name, _ in events]
+        self.assertEqual(names, ["plan", "evidence", "token", "token", "result"])
+        self.assertEqual(events[0][1]["requested_years"], [2025])
+        self.assertEqual(events[1][1], {"retrieved": 2, "reranked": 2})
+        self.assertEqual([data for name, data in events if name == "token"], ["FY2025 adds SkillsFuture credits. ", "Firms get grants."])
+        self.assertEqual(events[-1][1].answer, "FY2025 adds SkillsFuture credits. Firms get grants.")
+        self.assertEqual(events[-1][1].state_history, ["execute_plan", "success"])
+        # The second window is checked together with the tail (window_chars) of the first.
+        self.assertEqual(guarded[1], "FY2025 adds SkillsFuture credits. "[-20:] + "Firms get grants.")
+
     def test_manager_very_low_confidence_returns_success_without_answer_append(self):
         config = AgentConfig()
         manager = Manager(config)
@@ -358,6 +567,322 @@ class ManagerTests(unittest.TestCase):
         self.assertIn("couldn’t interpret the query clearly", result.answer.lower())
 
 
+    def test_manager_arun_awaits_llm_stages_and_offloads_blocking_ones(self):
+        config = AgentConfig()
+        manager = Manager(config)
+        planner = PlannerAI(config)
+        threads = {}
+
+        class AsyncSpecialists(StyleLoopSpecialists):
+            async def run_blocking(self, fn, *args, **kwargs):
+                return await asyncio.to_thread(fn, *args, **kwargs)
+
+            def retrieve(self, query, top_k, retrieve_context=None):
+                threads["retrieve"] = threading.current_thread()
+                return super().retrieve(query, top_k, retrieve_context)
+
+            async def asynthesize(self, original_query, revised_query, hits):
+                return "Async answer"
+
+            async def areflect(self, original_query, revised_query, answer, hits):
+                return ReflectionResult(reason="ok", confidence=0.9, comments="Looks good")
+
+        planner_output = {"revised_query": "query-v1", "coherence": "coherent", "coherence_reason": None}
+        with patch.object(planner, "_agenerate_planner_output", AsyncMock(return_value=planner_output)) as mock_llm:
+            result = asyncio.run(manager.arun(UserQuery(query="test query"), planner, AsyncSpecialists()))
+        mock_llm.assert_awaited_once()
+        self.assertEqual(result.answer, "Async answer")
+        self.assertEqual(result.state_history, ["execute_plan", "success"])
+        self.assertEqual(result.final_reason, "confidence_high")
+        self.assertIsNot(threads["retrieve"], threading.main_thread())
+
+    def test_manager_run_degrades_stages_that_overrun_the_request_deadline(self):
+        config = AgentConfig(
+            request_deadline_enabled=True,
+            request_deadline_seconds=2.0,
+            deadline_planner_seconds=0.05,
+            deadline_retrieve_seconds=0.5,
+            deadline_rerank_seconds=0.05,
+            deadline_synthesis_seconds=0.1,
+            deadline_reflection_seconds=5.0,
+        )
+        planner = PlannerAI(config)
+        calls = {}
+
+        class SlowSpecialists(StyleLoopSpecialists):
+            def retrieve(self, query, top_k, retrieve_context=None):
+                calls["retrieve"] = (query, top_k)
+                return super().retrieve(query, top_k, retrieve_context)
+
+            def rerank(self, query, hits, top_n):
+                time.sleep(0.3)
+                return list(reversed(hits))
+
+            def prepare_without_rerank(self, hits, top_n):
+                return list(hits[:top_n])
+
+            def reflect(self, original_query, revised_query, answer, hits):
+                raise AssertionError("reflection LLM must be skipped")
+
+            def estimate_reflection(self, original_query, revised_query, answer, hits):
+                calls["estimate_hits"] = [hit.chunk_id for hit in hits]
+                return ReflectionResult(reason="ok", confidence=0.6, comments="local estimate")
+
+        def slow_planner(original_query, context):
+            time.sleep(0.3)
+            return {"revised_query": "rewritten", "coherence": "coherent", "coherence_reason": None}
+
+        with patch.object(planner, "_generate_planner_output", side_effect=slow_planner):
+            result = Manager(config).run(UserQuery(query="FY2025 support"), planner, SlowSpecialists())
+
+        self.assertEqual(
+            result.state_history,
+            [
+                "execute_plan",
+                "degraded:planner_timeout",
+                "degraded:top_k_shrunk",
+                "degraded:rerank_timeout",
+                "degraded:reflection_skipped",
+                "success",
+            ],
+        )
+        self.assertEqual(calls["retrieve"], ("FY2025 support", max(config.top_n, config.top_k // 2)))
+        self.assertEqual(calls["estimate_hits"], ["a", "b"])  # retrieval order kept
+        self.assertEqual((result.confidence, result.final_reason), (0.6, "confidence_low_partial"))
+        self.assertLess(result.trace["deadline"]["elapsed_seconds"], 2.0)
+
+    def test_manager_rerank_timeout_still_hydrates_evidence_from_the_docstore(self):
+        config = AgentConfig(
+            guardrails_enabled=False,
+            request_deadline_enabled=True,
+            request_deadline_seconds=5.0,
+            deadline_rerank_seconds=0.05,
+            deadline_synthesis_seconds=0.1,
+            deadline_reflection_seconds=10.0,
+        )
+        planner = PlannerAI(config)
+        seen = {}
+
+        def slow_rerank(query, hits, top_n):
+            time.sleep(0.3)
+            return hits
+
+        def synthesize(original_query, revised_query, hits):
+            seen["texts"] = list(HitBatch.coerce(hits).texts)
+            return "FY2025 answer"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            write_docstore([("c1", "CDC vouchers text"), ("c2", "U-Save rebate text")], Path(tmp))
+            docstore = ChunkDocstore(Path(tmp))
+            with patch.object(Specialists, "validate_ready", return_value=None):
+                specialists = Specialists(config)
+                specialists._get_docstore = lambda: docstore
+                specialists.retrieve = lambda query, top_k, retrieve_context=None: HitBatch.from_hits(
+                    [
+                        RetrievalHit(chunk_id="c1", source_path="s1", text="", score=0.9),
+                        RetrievalHit(chunk_id="c2", source_path="s2", text="", score=0.8),
+                    ]
+                )
+                specialists.rerank = slow_rerank
+                specialists.synthesize = synthesize
+                planner_output = {"revised_query": "support", "coherence": "coherent", "coherence_reason": None}
+                with patch.object(planner, "_generate_planner_output", return_value=planner_output):
+                    result = Manager(config).run(UserQuery(query="support"), planner, specialists)
+            docstore.close()
+
+        self.assertIn("degraded:rerank_timeout", result.state_history)
+        self.assertEqual(seen["texts"], ["CDC vouchers text", "U-Save rebate text"])
+
+    def test_request_deadline_stages_share_one_bounded_pool(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        budgets = {"rerank": 0.05}
+        started = []
+
+        def stage(name, seconds):
+            started.append(name)
+            time.sleep(seconds)
+            return name
+
+        try:
+            with self.assertRaises(StageDeadlineExceeded):
+                RequestDeadline(1.0, budgets, executor=executor).run("rerank", stage, "slow", 0.3)
+            with self.assertRaises(StageDeadlineExceeded):
+                RequestDeadline(1.0, budgets, executor=executor).run("rerank", stage, "queued", 0.0)
+        finally:
+            executor.shutdown(wait=True)
+        self.assertEqual(started, ["slow"])  # the queued stage was cancelled, no extra thread spawned
+
+    def test_hydration_refetches_chunks_missing_from_a_stale_docstore_from_milvus(self):
+        class FakeCollection:
+            def __init__(self):
+                self.queries = []
+
+            def query(self, expr, output_fields):
+                self.queries.append(expr)
+                return [{"chunk_id": "c2", "text": "U-Save rebate text"}]
+
+        collection = FakeCollection()
+        with tempfile.TemporaryDirectory() as tmp:
+            write_docstore([("c1", "CDC vouchers text")], Path(tmp))
+            docstore = ChunkDocstore(Path(tmp))
+            with patch.object(Specialists, "validate_ready", return_value=None):
+                specialists = Specialists(AgentConfig(guardrails_enabled=False))
+            specialists._get_docstore = lambda: docstore
+            specialists._get_collection = lambda: collection
+            batch = HitBatch.from_hits(
+                [
+                    RetrievalHit(chunk_id="c1", source_path="s1", text="", score=0.9),
+                    RetrievalHit(chunk_id="c2", source_path="s2", text="", score=0.8),
+                ]
+            )
+            with self.assertLogs("src.agents.specialists.service", level="WARNING") as logs:
+                hydrated = specialists._hydrate_texts(batch)
+            docstore.close()
+
+        self.assertEqual(list(hydrated.texts), ["CDC vouchers text", "U-Save rebate text"])
+        self.assertEqual(collection.queries, ['chunk_id in ["c2"]'])
+        self.assertIn("c2", logs.output[0])
+
+    def test_manager_arun_ends_with_deadline_exceeded_when_synthesis_overruns(self):
+        config = AgentConfig(
+            request_deadline_enabled=True,
+            request_deadline_seconds=0.3,
+            deadline_planner_seconds=0.01,
+            deadline_retrieve_seconds=0.01,
+            deadline_rerank_seconds=0.01,
+            deadline_synthesis_seconds=0.01,
+            deadline_reflection_seconds=0.01,
+        )
+        planner = PlannerAI(config)
+
+        class SlowSynthesisSpecialists(StyleLoopSpecialists):
+            async def run_blocking(self, fn, *args, **kwargs):
+                return fn(*args, **kwargs)
+
+            async def asynthesize(self, original_query, revised_query, hits):
+                await asyncio.sleep(5)
+
+        planner_output = {"revised_query": "query-v1", "coherence": "coherent", "coherence_reason": None}
+        with patch.object(planner, "_agenerate_planner_output", AsyncMock(return_value=planner_output)):
+            result = asyncio.run(Manager(config).arun(UserQuery(query="test query"), planner, SlowSynthesisSpecialists()))
+
+        self.assertEqual(result.state_history, ["execute_plan", "degraded:synthesis_timeout", "fail"])
+        self.assertEqual((result.final_reason, result.confidence), ("deadline_exceeded", 0.0))
+        self.assertIn("deadline_exceeded", result.answer)
+
+    def test_manager_run_many_batches_retrieval_and_yields_each_result(self):
+        config = AgentConfig()
+        manager = Manager(config)
+        planner = PlannerAI(config)
+        calls = {}
+
+        class BatchSpecialists(StyleLoopSpecialists):
+            def retrieve_many(self, queries, top_k, retrieve_contexts=None):
+                calls["retrieve_many"] = list(queries)
+                return [
+                    HitBatch.from_hits(self.retrieve(query, top_k))
+                    if query != "blocked"
+                    else GuardrailsViolationError(stage="input", reason="toxic", safe_reply="safe blocked")
+                    for query in queries
+                ]
+
+            def rerank_many(self, queries, hits_per_query, top_n):
+                calls["rerank_many"] = list(queries)
+                return [hits[:top_n] for hits in hits_per_query]
+
+        def fake_output(original_query, context):
+            coherence = "incoherent" if original_query == "???" else "coherent"
+            return {"revised_query": original_query, "coherence": coherence, "coherence_reason": None}
+
+        with patch.object(planner, "_generate_planner_output", side_effect=fake_output):
+            results = dict(
+                manager.run_many(
+                    [UserQuery(query="q1"), UserQuery(query="???"), UserQuery(query="blocked"), UserQuery(query="q2")],
+                    planner,
+                    BatchSpecialists(),
+                )
+            )
+
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+        self.assertEqual(calls["retrieve_many"], ["q1", "blocked", "q2"])
+        self.assertEqual(calls["rerank_many"], ["q1", "q2"])
+        self.assertEqual(results[0].final_reason, "confidence_high")
+        self.assertEqual(results[1].final_reason, "incoherent_query")
+        self.assertEqual(results[2].final_reason, "guardrail_block")
+        self.assertEqual(results[3].state_history, ["execute_plan", "success"])
+
+    def test_manager_speculative_retrieval_reuses_or_re_retrieves_hits(self):
+        config = AgentConfig(speculative_retrieval_enabled=True, speculative_reuse_similarity=0.6)
+        manager = Manager(config)
+        planner = PlannerAI(config)
+        queries = []
+        delays = {}
+
+        class RecordingSpecialists(StyleLoopSpecialists):
+            def retrieve(self, query, top_k, retrieve_context=None):
+                queries.append(query)
+                time.sleep(delays.get(query, 0.0))
+                prefix = "r" if "revised" in query else "o"
+                return [
+                    RetrievalHit(chunk_id="shared", source_path="s1", text="alpha", score=0.9),
+                    RetrievalHit(chunk_id=f"{prefix}-only", source_path="s2", text="beta", score=0.5),
+                ]
+
+            def rerank(self, query, hits, top_n):
+                reranked.append(HitBatch.coerce(hits).chunk_ids)
+                return list(hits)
+
+        reranked = []
+
+        def run(revised_query):
+            queries.clear()
+            with patch.object(
+                planner,
+                "_generate_planner_output",
+                return_value={"revised_query": revised_query, "coherence": "coherent", "coherence_reason": None},
+            ):
+                return manager.run(UserQuery(query="budget 2024 grants"), planner, RecordingSpecialists())
+
+        result = run("budget 2024 grants")
+        self.assertEqual(queries, ["budget 2024 grants"])
+        self.assertEqual(result.trace["speculative_retrieval"]["outcome"], "reused")
+        self.assertTrue(result.trace["speculative_retrieval"]["hit"])
+
+        result = run("revised wording about enterprise support")
+        self.assertEqual(queries[-1], "revised wording about enterprise support")
+        self.assertEqual(result.trace["speculative_retrieval"]["outcome"], "re_retrieved")
+        self.assertEqual(set(reranked[-1]), {"shared", "r-only"})
+
+        manager = Manager(config.model_copy(update={"speculative_merge_diverged": True}))
+        result = run("revised wording about enterprise support")
+        self.assertEqual(result.trace["speculative_retrieval"]["outcome"], "merged")
+        self.assertEqual(set(reranked[-1]), {"shared", "r-only", "o-only"})
+
+        delays["budget 2024 grants"] = 2.0  # a stuck speculation is dropped, not waited for
+        started = time.monotonic()
+        result = run("revised wording about enterprise support")
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(result.trace["speculative_retrieval"]["outcome"], "re_retrieved")
+        self.assertEqual(set(reranked[-1]), {"shared", "r-only"})
+
+    def test_manager_starts_no_speculation_for_locally_rejected_queries(self):
+        config = AgentConfig(speculative_retrieval_enabled=True)
+        encoder = BM25SparseEncoder()
+        encoder.fit(["what are the budget measures of SMEs", "the cost of living"])
+        planner = PlannerAI(config, coherence_prefilter=CoherencePrefilter(encoder))
+
+        class RecordingSpecialists(StyleLoopSpecialists):
+            def retrieve(self, query, top_k, retrieve_context=None):
+                raise AssertionError("speculative retrieval started for a rejected query")
+
+        with patch.object(planner, "_generate_planner_output") as mock_llm:
+            result = Manager(config).run(UserQuery(query="xkcdqwrt zzzzz"), planner, RecordingSpecialists())
+
+        self.assertEqual(result.final_reason, "incoherent_query")
+        self.assertNotIn("speculative_retrieval", result.trace or {})
+        self.assertEqual(mock_llm.call_count, 0)
+
+
 class SpecialistsTests(unittest.TestCase):
     def test_specialists_rerank_and_retrieve_mapping(self):
         config = AgentConfig(guardrails_enabled=False, mcp_strict=False)
@@ -424,7 +949,7 @@ class SpecialistsTests(unittest.TestCase):
 
         captured = {"year_expr": None}
 
-        def fake_dense_search(collection, query_vector, top_k, year_expr):
+        def fake_dense_search(collection, query_vector, top_k, year_expr, partition_names=None, output_text=True):
             captured["year_expr"] = year_expr
             return [[]]
 
@@ -441,6 +966,259 @@ class SpecialistsTests(unittest.TestCase):
 
         self.assertEqual(captured["year_expr"], "financial_year in [2024, 2025]")
 
+    def test_specialists_adaptive_retrieve_skips_weaker_source_and_records_path(self):
+        config = AgentConfig(guardrails_enabled=False, adaptive_retrieval_enabled=True)
+        encoder = BM25SparseEncoder()
+        encoder.fit(["gstv u-save rebate for households", "productivity support for firms", "support for households"])
+
+        class FakeResult:
+            def __init__(self, chunk_id, score):
+                self.score = score
+                self.entity = {"chunk_id": chunk_id, "source_path": "doc.pdf", "text": chunk_id, "financial_year": 2025}
+
+        class FakeVector:
+            def astype(self, _):
+                return self
+
+            def tolist(self):
+                return [0.1, 0.2]
+
+        embed_calls = []
+
+        class FakeEmbedder:
+            def encode(self, texts, normalize_embeddings=True):
+                embed_calls.append(list(texts))
+                return [FakeVector()]
+
+        dense_limits, sparse_limits = [], []
+
+        def fake_dense_search(collection, query_vector, top_k, year_expr, partition_names=None, output_text=True):
+            dense_limits.append(top_k)
+            return [[FakeResult("dense-a", 0.9), FakeResult("dense-b", 0.5)]]
+
+        def fake_sparse_search(collection, sparse_query_vector, top_k, year_expr, partition_names=None, output_text=True):
+            sparse_limits.append(top_k)
+            return [[FakeResult("sparse-a", 12.0), FakeResult("sparse-b", 3.0)]]
+
+        with (
+            patch.object(Specialists, "validate_ready", return_value=None),
+            patch("src.agents.specialists.retrieval.search_collection_dense", side_effect=fake_dense_search),
+            patch("src.agents.specialists.retrieval.search_collection_sparse", side_effect=fake_sparse_search),
+        ):
+            specialists = Specialists(config)
+            specialists._get_embedder = lambda: FakeEmbedder()
+            specialists._get_collection = lambda: object()
+            specialists._get_bm25_encoder = lambda: encoder
+            exact = specialists.retrieve("GSTV U-Save", 10)
+            vague = specialists.retrieve("what was announced overall", 10)
+            conceptual = specialists.retrieve("support for households and firms", 10)
+            common_terms = specialists.retrieve("for support", 10)  # fully in-vocab, but little idf mass
+
+        self.assertGreater(encoder.query_signal("for support").coverage, 0.99)
+        self.assertLess(encoder.query_signal("for support").mass, config.adaptive_sparse_min_mass)
+        self.assertEqual(exact.retrieval_path, "sparse_only")
+        self.assertEqual(exact.chunk_ids, ["sparse-a", "sparse-b"])
+        self.assertEqual(vague.retrieval_path, "dense_only")
+        self.assertEqual(conceptual.retrieval_path, "dense_then_sparse_shrunk")
+        self.assertEqual(common_terms.retrieval_path, "dense_only")
+        self.assertEqual(len(embed_calls), 3)
+        self.assertEqual(dense_limits, [10, 10, 10])
+        self.assertEqual(sparse_limits, [10, 5])
+        stats = specialists.stats()["adaptive_retrieval"]
+        self.assertEqual(stats["paths"]["sparse_only"], 1)
+        self.assertEqual(stats["paths"]["dense_only"], 2)
+        self.assertEqual(stats["paths"]["dense_then_sparse_shrunk"], 1)
+
+    def test_specialists_fanout_retrieves_each_slice_with_quota_and_interleaves(self):
+        config = AgentConfig(guardrails_enabled=False, fy_partitions_enabled=False, async_offload_workers=1)
+
+        class FakeResult:
+            def __init__(self, chunk_id, score, year):
+                self.score = score
+                self.entity = {"chunk_id": chunk_id, "source_path": "doc.pdf", "text": chunk_id, "financial_year": year}
+
+        embed_calls = []
+
+        class FakeEmbedder:
+            def encode(self, texts, normalize_embeddings=True):
+                embed_calls.append(list(texts))
+                return [np.asarray([0.1, 0.2], dtype=np.float32) for _ in texts]
+
+        searches = []
+        search_lock = threading.Lock()
+
+        def fake_dense_search(collection, query_vector, top_k, year_expr, partition_names=None, output_text=True):
+            year = 2018 if "2018" in year_expr else 2024
+            with search_lock:
+                searches.append((year_expr, top_k))
+            return [[FakeResult(f"{year}-{rank}", 1.0 - rank / 10, year) for rank in range(top_k)]]
+
+        with (
+            patch.object(Specialists, "validate_ready", return_value=None),
+            patch("src.agents.specialists.retrieval.search_collection_dense", side_effect=fake_dense_search),
+            patch("src.agents.specialists.retrieval.search_collection_sparse", return_value=[[]]),
+        ):
+            specialists = Specialists(config)
+            specialists._get_embedder = lambda: FakeEmbedder()
+            specialists._get_collection = lambda: object()
+            specialists._get_bm25_encoder = lambda: None
+            # Retrieval itself occupies the only offload worker (as under Manager.arun); slices must not deadlock.
+            batch = (
+                specialists._get_offload_executor()
+                .submit(
+                    specialists.retrieve,
+                    "How did support change?",
+                    5,
+                    retrieve_context={"requested_years": [2018, 2024], "year_slices": [[2018], [2024]]},
+                )
+                .result(timeout=5)
+            )
+
+        self.assertEqual(sorted(searches), [("financial_year in [2018]", 3), ("financial_year in [2024]", 2)])
+        self.assertEqual(len(embed_calls), 1)
+        self.assertEqual(batch.chunk_ids, ["2018-0", "2024-0", "2018-1", "2024-1", "2018-2"])
+        self.assertEqual(batch.year_expr, "financial_year in [2018, 2024]")
+        self.assertEqual(batch.retrieval_path, "fanout[2]")
+
+    def test_retrieve_combines_year_and_doc_type_filters(self):
+        context = {"requested_years": [2025], "doc_types": ["annex", "budgets_statements"]}
+        expr = combine_filter_exprs(
+            build_year_filter_expr(context, fy_filtering_enabled=True),
+            build_doc_type_filter_expr(context),
+        )
+        self.assertEqual(
+            expr,
+            '(financial_year in [2025]) and (doc_type in ["annex", "budgets_statements"])',
+        )
+        self.assertEqual(combine_filter_exprs(None, build_doc_type_filter_expr({})), None)
+
+    def test_specialists_retrieve_searches_requested_fy_partitions(self):
+        config = AgentConfig(guardrails_enabled=False)
+
+        class FakeVector:
+            def astype(self, _):
+                return self
+
+            def tolist(self):
+                return [0.1, 0.2]
+
+        class FakeEmbedder:
+            def encode(self, texts, normalize_embeddings=True):
+                return [FakeVector()]
+
+        class FakeBM25:
+            def encode_queries(self, texts):
+                return [{1: 0.7}]
+
+        class FakeCollection:
+            def __init__(self):
+                self.partitions = [SimpleNamespace(name=name) for name in ("_default", "fy2019", "fy2024", "fy2025")]
+                self.load_calls = []
+
+            def load(self, partition_names=None):
+                self.load_calls.append(partition_names)
+
+        captured = {}
+
+        def fake_dense_search(collection, query_vector, top_k, year_expr, partition_names=None, output_text=True):
+            captured.update(year_expr=year_expr, partition_names=partition_names)
+            return [[]]
+
+        collection = FakeCollection()
+        with (
+            patch.object(Specialists, "validate_ready", return_value=None),
+            patch("src.agents.specialists.retrieval.search_collection_dense", side_effect=fake_dense_search),
+            patch("src.agents.specialists.retrieval.search_collection_sparse", return_value=[[]]),
+        ):
+            specialists = Specialists(config)
+            loader = YearPartitionLoader(collection)
+            loader.load_hot(corpus_latest_fy=2025, recent_year_window=5)
+            specialists._partition_loader = loader
+            specialists._get_collection = lambda: collection
+            specialists._get_embedder = lambda: FakeEmbedder()
+            specialists._get_bm25_encoder = lambda: FakeBM25()
+            hits = specialists.retrieve("query", 3, retrieve_context={"requested_years": [2019, 2025]})
+
+        self.assertEqual(collection.load_calls, [["fy2024", "fy2025"], ["fy2019"]])
+        self.assertEqual(captured["partition_names"], ["fy2019", "fy2025"])
+        self.assertIsNone(captured["year_expr"])
+        self.assertEqual(hits.year_expr, "financial_year in [2019, 2025]")
+
+    def test_unscoped_partition_resolution_searches_loaded_years_unless_load_all_is_set(self):
+        class FakeCollection:
+            def __init__(self):
+                self.partitions = [SimpleNamespace(name=name) for name in ("fy2019", "fy2021", "fy2024", "fy2025")]
+                self.load_calls = []
+
+            def load(self, partition_names=None):
+                self.load_calls.append(partition_names)
+
+        collection = FakeCollection()
+        loader = YearPartitionLoader(collection)
+        loader.load_hot(corpus_latest_fy=2025, recent_year_window=2)
+        self.assertEqual(loader.resolve([]), ["fy2024", "fy2025"])
+        loader.resolve([2021])
+        self.assertEqual(loader.resolve(None), ["fy2021", "fy2024", "fy2025"])
+        self.assertEqual(collection.load_calls, [["fy2024", "fy2025"], ["fy2021"]])
+
+        load_all = YearPartitionLoader(FakeCollection(), load_all_when_unscoped=True)
+        self.assertEqual(load_all.resolve([]), ["fy2019", "fy2021", "fy2024", "fy2025"])
+
+    def test_specialists_retrieve_many_embeds_once_and_groups_searches_by_year_scope(self):
+        config = AgentConfig(guardrails_enabled=False)
+        calls = {"encode": [], "dense": [], "sparse": []}
+
+        class FakeVector(list):
+            def astype(self, _):
+                return self
+
+            def tolist(self):
+                return list(self)
+
+        class FakeEmbedder:
+            def encode(self, texts, normalize_embeddings=True):
+                calls["encode"].append(list(texts))
+                return [FakeVector([float(idx)]) for idx, _ in enumerate(texts)]
+
+        class FakeBM25:
+            def encode_queries(self, texts):
+                return [{1: 0.7} if text != "vague" else {} for text in texts]
+
+        class FakeResult:
+            def __init__(self, chunk_id):
+                self.entity = {"chunk_id": chunk_id, "source_path": "s.pdf", "text": "t", "financial_year": 2025}
+                self.score = 0.5
+
+        def fake_dense_many(collection, query_vectors, top_k, year_expr, partition_names=None, output_text=True):
+            calls["dense"].append((len(query_vectors), year_expr))
+            return [[FakeResult(f"d{vector[0]:.0f}-{year_expr}")] for vector in query_vectors]
+
+        def fake_sparse_many(collection, sparse_query_vectors, top_k, year_expr, partition_names=None, output_text=True):
+            calls["sparse"].append((len(sparse_query_vectors), year_expr))
+            return [[FakeResult("shared")] for _ in sparse_query_vectors]
+
+        with (
+            patch.object(Specialists, "validate_ready", return_value=None),
+            patch("src.agents.specialists.retrieval.search_collection_dense_many", side_effect=fake_dense_many),
+            patch("src.agents.specialists.retrieval.search_collection_sparse_many", side_effect=fake_sparse_many),
+        ):
+            specialists = Specialists(config)
+            specialists._get_embedder = lambda: FakeEmbedder()
+            specialists._get_collection = lambda: object()
+            specialists._get_bm25_encoder = lambda: FakeBM25()
+            batches = specialists.retrieve_many(
+                ["a", "vague", "b"],
+                5,
+                retrieve_contexts=[{}, {}, {"requested_years": [2025]}],
+            )
+
+        self.assertEqual(calls["encode"], [["a", "vague", "b"]])
+        self.assertEqual(calls["dense"], [(2, None), (1, "financial_year in [2025]")])
+        self.assertEqual(calls["sparse"], [(1, None), (1, "financial_year in [2025]")])
+        self.assertEqual(batches[0].chunk_ids, ["d0-None", "shared"])
+        self.assertEqual(batches[1].chunk_ids, ["d1-None"])
+        self.assertEqual(batches[2].year_expr, "financial_year in [2025]")
+
     def test_specialists_rerank_uses_cross_encoder_scores(self):
         config = AgentConfig(guardrails_enabled=False, mcp_strict=False, rerank_candidate_limit=10)
         hits = [
@@ -459,6 +1237,37 @@ class SpecialistsTests(unittest.TestCase):
 
         self.assertEqual(reranked[0].chunk_id, "a")
 
+    def test_specialists_rerank_scores_only_uncached_pairs(self):
+        config = AgentConfig(guardrails_enabled=False, mcp_strict=False, corpus_version="v1")
+        hits = [
+            RetrievalHit(chunk_id="a", source_path="a.pdf", text="alpha text", score=0.2),
+            RetrievalHit(chunk_id="b", source_path="b.pdf", text="beta text", score=0.9),
+        ]
+
+        class CountingCrossEncoder:
+            def __init__(self):
+                self.pairs = []
+
+            def predict(self, pairs):
+                self.pairs.extend(pairs)
+                return [0.95 if text.startswith("alpha") else 0.10 for _, text in pairs]
+
+        cross_encoder = CountingCrossEncoder()
+        with patch.object(Specialists, "validate_ready", return_value=None):
+            specialists = Specialists(config)
+            specialists._get_cross_encoder = lambda: cross_encoder
+            first = specialists.rerank("Budget support", hits, 2)
+            repeat = specialists.rerank("  budget   SUPPORT ", hits[::-1], 2)
+            other = specialists.rerank("another question", hits[:1], 2)
+
+        self.assertEqual(len(cross_encoder.pairs), 3)
+        self.assertEqual(repeat.chunk_ids, first.chunk_ids)
+        self.assertEqual(repeat.rerank_cached_pairs, 2)
+        self.assertEqual(other.rerank_cached_pairs, 0)
+        stats = specialists.stats()["rerank_cache"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (2, 3, 3))
+        self.assertAlmostEqual(stats["hit_rate"], 0.4)
+
     def test_specialists_rerank_fails_when_cross_encoder_missing(self):
         config = AgentConfig(guardrails_enabled=False, mcp_strict=False, rerank_candidate_limit=10)
         hits = [
@@ -493,6 +1302,52 @@ class SpecialistsTests(unittest.TestCase):
         self.assertIn("Answer:", answer)
         self.assertEqual(reflection.reason, "ok")
 
+    def test_specialists_reflect_locally_outside_the_uncertain_band(self):
+        config = AgentConfig(guardrails_enabled=False, local_reflection_enabled=True)
+        llm_model = SimpleNamespace(
+            invoke=lambda prompt: SimpleNamespace(content='{"reason":"ok","confidence":0.6}'), calls=0
+        )
+        hits = HitBatch.from_hits(
+            [
+                RetrievalHit(
+                    chunk_id="a",
+                    source_path="fy2025/budget_statement.pdf",
+                    text="The GST Voucher U-Save rebate offsets utilities bills for HDB households in FY2025.",
+                    score=0.9,
+                    metadata={"financial_year": 2025},
+                ),
+                RetrievalHit(
+                    chunk_id="b",
+                    source_path="fy2024/annex.pdf",
+                    text="CDC vouchers of $300 go to every Singaporean household.",
+                    score=0.7,
+                    metadata={"financial_year": 2024},
+                ),
+            ]
+        )
+        grounded = (
+            "A. Short Answer: HDB households receive the GST Voucher U-Save rebate on utilities bills in FY2025.\n"
+            "Evidence:\n- (fy2025/budget_statement.pdf) U-Save rebate offsets utilities bills for HDB households."
+        )
+        ungrounded = "Retirees receive Medisave top ups and transport concessions (fy2019/other.pdf)."
+        partly = grounded + "\nRetirees receive Medisave top ups. Seniors get transport concessions and healthcare subsidies."
+
+        with patch.object(Specialists, "validate_ready", return_value=None):
+            specialists = Specialists(config)
+            specialists._get_reflection_model = lambda: llm_model
+            high = specialists.reflect("FY2025 U-Save for HDB", "GST Voucher U-Save FY2025", grounded, hits)
+            low = specialists.reflect("FY2023 retiree support", "FY2023 retiree support", ungrounded, hits)
+            deferred = specialists.reflect("FY2025 U-Save for HDB", "GST Voucher U-Save FY2025", partly, hits)
+            stats = specialists.stats()["local_reflection"]
+
+        self.assertEqual((high.reason, high.confidence), ("ok", 1.0))
+        self.assertEqual(low.reason, "low_coverage")
+        self.assertLessEqual(low.confidence, config.local_reflection_low_threshold)
+        self.assertIn("FY2023", low.uncertainty_note)
+        self.assertEqual(deferred.confidence, 0.6)  # uncertain band: the LLM answered
+        self.assertEqual((stats["local_ok"], stats["local_low_coverage"], stats["llm_fallbacks"]), (1, 1, 1))
+        self.assertAlmostEqual(stats["llm_calls_saved_rate"], 2 / 3)
+
     def test_specialists_use_prompt_builders(self):
         config = AgentConfig(guardrails_enabled=False)
 
@@ -551,6 +1406,646 @@ class SpecialistsTests(unittest.TestCase):
                     specialists.retrieve("email me at foo@example.com", 3)
 
 
+class HitBatchTests(unittest.TestCase):
+    def test_from_hits_round_trips_metadata_lazily(self):
+        hits = [
+            RetrievalHit(
+                chunk_id="a",
+                source_path="a.pdf",
+                text="alpha",
+                score=0.4,
+                metadata={"financial_year": 2024, "doc_type": "annex", "dense_rank": 2, "custom": "kept"},
+            ),
+            RetrievalHit(chunk_id="b", source_path="b.pdf", text="beta", score=0.9),
+        ]
+        batch = HitBatch.from_hits(hits)
+        self.assertEqual(len(batch), 2)
+        first = batch[0]
+        self.assertEqual(first.metadata["financial_year"], 2024)
+        self.assertEqual(first.metadata["retrieval_sources"], ["dense"])
+        self.assertEqual(first.metadata["custom"], "kept")
+        self.assertIsNone(batch[1].metadata["financial_year"])
+        self.assertEqual([hit.chunk_id for hit in batch[::-1]], ["b", "a"])
+
+    def test_rerank_applies_vectorized_recency_boost_after_normalization(self):
+        from src.agents.specialists.rerank import rerank_hits
+
+        hits = HitBatch.from_columns(
+            chunk_ids=["old", "new", "mid"],
+            source_paths=["o.pdf", "n.pdf", "m.pdf"],
+            texts=["o", "n", "m"],
+            doc_types=["annex", "annex", "annex"],
+            financial_years=[2016, 2025, None],
+            scores=[0.3, 0.2, 0.1],
+        )
+
+        class FakeCrossEncoder:
+            def predict(self, pairs):
+                return [3.0, 2.0, -2.0]
+
+        reranked = rerank_hits(
+            "q",
+            hits,
+            top_n=3,
+            rerank_tool_name="rerank",
+            cross_encoder=FakeCrossEncoder(),
+            recent_year_window=5,
+            corpus_latest_fy=2025,
+            rerank_recency_boost=0.8,
+        )
+        self.assertEqual(reranked.chunk_ids, ["new", "old", "mid"])
+        self.assertAlmostEqual(float(reranked.scores[0]), 0.8 * 1.8)
+        self.assertAlmostEqual(float(reranked.scores[1]), 1.0)
+        self.assertEqual(reranked.tool, "rerank")
+
+
+class CascadeRerankTests(unittest.TestCase):
+    def test_cascade_prunes_tail_and_stops_once_top_set_is_stable(self):
+        config = AgentConfig(
+            guardrails_enabled=False,
+            cascade_rerank_enabled=True,
+            cascade_keep_ratio=0.5,
+            cascade_min_keep=4,
+            cascade_batch_size=4,
+            cascade_stable_top_n=4,
+            rerank_candidate_limit=40,
+        )
+        batch = HitBatch.from_columns(
+            chunk_ids=[f"c{idx}" for idx in range(40)],
+            source_paths=["doc.pdf"] * 40,
+            texts=[f"text {idx}" for idx in range(40)],
+            doc_types=["annex"] * 40,
+            financial_years=[2018] * 40,
+            scores=[1.0 - idx / 100 for idx in range(40)],
+        )
+
+        class CountingCrossEncoder:
+            def __init__(self):
+                self.pairs = []
+
+            def predict(self, pairs):
+                self.pairs.extend(pairs)
+                return [10.0 - int(text.split()[1]) / 10 if int(text.split()[1]) < 4 else 0.0 for _, text in pairs]
+
+        cross_encoder = CountingCrossEncoder()
+        with patch.object(Specialists, "validate_ready", return_value=None):
+            specialists = Specialists(config)
+            specialists._get_cross_encoder = lambda: cross_encoder
+            reranked = specialists.rerank("query", batch, top_n=10)
+
+        self.assertEqual(len(cross_encoder.pairs), 8)
+        self.assertEqual(reranked.rerank_cascade, {"pruned": 20, "scored": 8, "early_exit": True})
+        self.assertEqual(reranked.chunk_ids[:4], ["c0", "c1", "c2", "c3"])
+        self.assertEqual(reranked.chunk_ids[8:], ["c8", "c9"])
+        self.assertEqual(float(reranked.scores[9]), 0.0)
+
+
+class MicroBatchSchedulerTests(unittest.TestCase):
+    def test_concurrent_predicts_share_one_forward_pass(self):
+        class RecordingModel:
+            def __init__(self):
+                self.calls = []
+
+            def predict(self, pairs, batch_size=32):
+                self.calls.append((len(pairs), batch_size))
+                return [float(text) for _, text in pairs]
+
+        model = RecordingModel()
+        scheduler = MicroBatchScheduler(model, max_wait_ms=200, max_batch_pairs=6)
+        results = {}
+
+        def caller(name, values):
+            results[name] = scheduler.predict([("query", str(value)) for value in values]).tolist()
+
+        threads = [
+            threading.Thread(target=caller, args=("a", [1, 2])),
+            threading.Thread(target=caller, args=("b", [3, 4, 5, 6])),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        scheduler.close()
+
+        self.assertEqual(results, {"a": [1.0, 2.0], "b": [3.0, 4.0, 5.0, 6.0]})
+        self.assertEqual(model.calls, [(6, 6)])
+        stats = scheduler.stats()
+        self.assertEqual(stats["batch_pairs_histogram"], {"<=8": 1})
+        self.assertEqual(stats["batch_requests_histogram"], {"<=2": 1})
+        self.assertEqual(stats["peak_pending_pairs"], 6)
+
+    def test_oversized_caller_is_split_into_capped_forward_passes(self):
+        calls = []
+
+        class RecordingModel:
+            def predict(self, pairs, batch_size=32):
+                calls.append((len(pairs), batch_size))
+                return [float(text) for _, text in pairs]
+
+        scheduler = MicroBatchScheduler(RecordingModel(), max_wait_ms=0, max_batch_pairs=4)
+        scores = scheduler.predict([("query", str(value)) for value in range(10)])
+        scheduler.close()
+
+        self.assertEqual(scores.tolist(), [float(value) for value in range(10)])
+        self.assertEqual(calls, [(4, 4), (4, 4), (2, 2)])
+
+    def test_predict_errors_reach_every_caller_in_the_batch(self):
+        class FailingModel:
+            def predict(self, pairs, batch_size=32):
+                raise RuntimeError("model crashed")
+
+        scheduler = MicroBatchScheduler(FailingModel(), max_wait_ms=0)
+        with self.assertRaisesRegex(RuntimeError, "model crashed"):
+            scheduler.predict([("query", "text")])
+        scheduler.close()
+
+
+class PretokenizedCrossEncoderTests(unittest.TestCase):
+    def test_passages_are_tokenized_once_and_truncated_longest_first(self):
+        class WordTokenizer:
+            name_or_path = "word-tokenizer"
+            model_max_length = 512
+            model_input_names = ["input_ids", "token_type_ids", "attention_mask"]
+
+            def __init__(self):
+                self.calls = []
+
+            def __call__(self, text, add_special_tokens=True):
+                self.calls.append(text)
+                return {"input_ids": [len(word) for word in text.split()]}
+
+            def num_special_tokens_to_add(self, pair=False):
+                return 3
+
+            def build_inputs_with_special_tokens(self, first, second):
+                return [101] + first + [102] + second + [102]
+
+            def create_token_type_ids_from_sequences(self, first, second):
+                return [0] * (len(first) + 2) + [1] * (len(second) + 1)
+
+        tokenizer = WordTokenizer()
+        encoder = PretokenizedCrossEncoder(SimpleNamespace(tokenizer=tokenizer, max_length=10), max_entries=8)
+        forwarded = []
+        encoder._forward = lambda features: forwarded.extend(features) or [float(len(f["input_ids"])) for f in features]
+
+        passage = "one two three four five six seven eight nine"
+        first = encoder.predict([("q one", passage), ("q one", "short")])
+        second = encoder.predict([("another query", passage)])
+
+        self.assertEqual(tokenizer.calls, ["q one", passage, "short", "another query"])
+        self.assertEqual(first.tolist(), [10.0, 6.0])
+        self.assertEqual(second.tolist(), [10.0])
+        # Budget 7: passage (cached at 7 ids) gives way until it matches the 2-id query.
+        self.assertEqual(forwarded[0]["input_ids"], [101, 1, 3, 102, 3, 3, 5, 4, 4, 102])
+        self.assertEqual(forwarded[0]["token_type_ids"], [0, 0, 0, 0, 1, 1, 1, 1, 1, 1])
+        self.assertEqual(encoder.stats()["hits"], 1)
+
+
+class EvidencePackerTests(unittest.TestCase):
+    def test_packer_keeps_relevant_sentences_dedupes_and_respects_budget(self):
+        filler = "Unrelated remarks about the weather and public holidays fill this sentence. " * 6
+        hits = [
+            RetrievalHit(
+                chunk_id="a",
+                source_path="fy2025/statement.pdf",
+                text=f"Overview of Budget 2025. {filler}SkillsFuture credits rise for mid-career workers. Closing notes.",
+                score=0.9,
+            ),
+            RetrievalHit(
+                chunk_id="b",
+                source_path="fy2025/annex.pdf",
+                text=f"SkillsFuture credits rise for mid-career workers. {filler}Grants help SMEs train workers.",
+                score=0.8,
+            ),
+            RetrievalHit(chunk_id="c", source_path="fy2024/speech.pdf", text=filler, score=0.1),
+        ]
+        packer = EvidencePacker(token_budget=10_000, max_sentences_per_chunk=2)
+        packed = packer.pack("SkillsFuture credits for workers", "SkillsFuture mid-career workers", hits)
+
+        self.assertEqual(
+            [item["text"] for item in packed.items],
+            [
+                "SkillsFuture credits rise for mid-career workers.",
+                "Grants help SMEs train workers.",
+                "Unrelated remarks about the weather and public holidays fill this sentence.",
+            ],
+        )
+        self.assertEqual(packed.duplicate_sentences, 1)
+        self.assertNotIn("score", packed.items[0])
+        self.assertLess(packed.prompt_tokens, packed.baseline_tokens)
+        self.assertGreater(packer.stats()["prompt_tokens_saved_per_request"], 0)
+
+        tight = EvidencePacker(token_budget=40, max_sentences_per_chunk=2).pack("SkillsFuture credits", "", hits)
+        self.assertEqual(len(tight.items), 1)
+        self.assertLessEqual(tight.prompt_tokens, 40 + estimate_tokens("[]"))
+
+
+class LLMClientRegistryTests(unittest.TestCase):
+    def test_registry_shares_models_and_reports_connection_reuse(self):
+        built = []
+
+        def factory(**kwargs):
+            built.append(kwargs)
+            return SimpleNamespace(**kwargs)
+
+        class OkHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        registry = LLMClientRegistry(max_connections=4, max_keepalive_connections=2, chat_model_factory=factory)
+        try:
+            planner_model = registry.chat_model("gpt-4o-mini", 0.0)
+            self.assertIs(registry.chat_model("gpt-4o-mini", 0), planner_model)
+            synthesis_model = registry.chat_model("gpt-4o-mini", 0.2)
+            self.assertEqual(len(built), 2)
+            self.assertIs(planner_model.http_client, synthesis_model.http_client)
+
+            for _ in range(3):
+                planner_model.http_client.post(f"http://127.0.0.1:{server.server_port}/v1/chat", json={})
+            stats = registry.stats()
+        finally:
+            registry.close()
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(stats["models"], ["gpt-4o-mini@0", "gpt-4o-mini@0.2"])
+        self.assertEqual((stats["requests"], stats["new_connections"], stats["reused_connections"]), (3, 1, 2))
+
+    def test_stage_models_send_prompt_cache_key_and_record_cached_tokens(self):
+        built = []
+
+        def factory(**kwargs):
+            built.append(kwargs)
+            return SimpleNamespace(
+                invoke=lambda messages: SimpleNamespace(
+                    usage_metadata={
+                        "input_tokens": 1500,
+                        "output_tokens": 80,
+                        "input_token_details": {"cache_read": 1024},
+                    }
+                ),
+                ainvoke=AsyncMock(
+                    return_value=SimpleNamespace(
+                        response_metadata={
+                            "token_usage": {
+                                "prompt_tokens": 1500,
+                                "completion_tokens": 40,
+                                "prompt_tokens_details": {"cached_tokens": 0},
+                            }
+                        }
+                    )
+                ),
+            )
+
+        registry = LLMClientRegistry(chat_model_factory=factory)
+        try:
+            synthesis_model = registry.chat_model("gpt-4o-mini", 0.2, stage="synthesis")
+            self.assertIsNot(synthesis_model, registry.chat_model("gpt-4o-mini", 0.2))
+            synthesis_model.invoke(["prompt"])
+            asyncio.run(synthesis_model.ainvoke(["prompt"]))
+            stats = registry.usage.stats()
+        finally:
+            registry.close()
+        self.assertEqual(built[0]["model_kwargs"], {"prompt_cache_key": prompt_cache_key("synthesis")})
+        self.assertEqual(built[1]["model_kwargs"], {})
+        usage = stats["synthesis"]
+        self.assertEqual((usage["calls"], usage["prompt_tokens"], usage["cached_tokens"]), (2, 3000, 1024))
+        self.assertEqual((usage["completion_tokens"], usage["cache_hit_calls"]), (120, 1))
+        self.assertAlmostEqual(usage["cached_token_share"], 1024 / 3000)
+
+    def test_prompt_prefixes_are_byte_stable_across_requests(self):
+        first = build_synthesis_prompt("CDC vouchers?", "CDC vouchers 2025", '[{"text": "a"}]')
+        second = build_synthesis_prompt("GSTV U-Save", "GST Voucher U-Save", '[{"text": "b"}]')
+        self.assertEqual(first[0], second[0])
+        self.assertEqual(first[1][1].split(": ", 1)[0], second[1][1].split(": ", 1)[0])
+        reflection = build_reflection_prompt("q", "r", "answer", 3)
+        self.assertEqual(reflection[0], build_reflection_prompt("other", "other", "other", 1)[0])
+        self.assertNotEqual(prompt_cache_key("synthesis"), prompt_cache_key("reflection"))
+
+
+class CompactionTests(unittest.TestCase):
+    def _batch(self):
+        words = [f"w{idx}" for idx in range(1200)]
+
+        def chunk(start, end):
+            return " ".join(words[start:end])
+
+        return HitBatch.from_columns(
+            chunk_ids=["doc-c1", "doc-c0", "other-c0", "doc-c3", "nooffset"],
+            source_paths=["doc.pdf", "doc.pdf", "other.pdf", "doc.pdf", "x.pdf"],
+            texts=[chunk(320, 720), chunk(0, 400), "other text", chunk(960, 1200), "no offsets"],
+            doc_types=["annex"] * 5,
+            financial_years=[2025] * 5,
+            scores=[0.9, 0.8, 0.7, 0.6, 0.5],
+            doc_ids=["doc", "doc", "other", "doc", None],
+            chunk_starts=[320, 0, 0, 960, None],
+            chunk_ends=[720, 400, 400, 1200, None],
+        )
+
+    def test_compaction_keeps_best_overlapping_neighbour(self):
+        compacted = compact_overlapping_chunks(self._batch())
+        self.assertEqual(compacted.chunk_ids, ["doc-c1", "other-c0", "doc-c3", "nooffset"])
+        self.assertEqual(compacted.compacted_rows, 1)
+        self.assertEqual(compacted[0].metadata["chunk_start"], 320)
+
+    def test_compaction_merges_union_span_when_enabled(self):
+        compacted = compact_overlapping_chunks(self._batch(), merge_spans=True)
+        self.assertEqual(compacted.chunk_ids[0], "doc-c1")
+        self.assertEqual((int(compacted.chunk_starts[0]), int(compacted.chunk_ends[0])), (0, 720))
+        self.assertEqual(compacted.texts[0], " ".join(f"w{idx}" for idx in range(720)))
+
+    def test_specialists_rerank_scores_compacted_candidates_only(self):
+        class CountingCrossEncoder:
+            def __init__(self):
+                self.pairs = []
+
+            def predict(self, pairs):
+                self.pairs.extend(pairs)
+                return [float(len(pairs) - idx) for idx in range(len(pairs))]
+
+        cross_encoder = CountingCrossEncoder()
+        with patch.object(Specialists, "validate_ready", return_value=None):
+            specialists = Specialists(AgentConfig(guardrails_enabled=False))
+            specialists._get_cross_encoder = lambda: cross_encoder
+            reranked = specialists.rerank("query", self._batch(), top_n=5)
+        self.assertEqual(len(cross_encoder.pairs), 4)
+        self.assertNotIn("doc-c0", reranked.chunk_ids)
+
+
+class DocstoreTests(unittest.TestCase):
+    def test_docstore_round_trips_compressed_texts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp) / "chunk_docstore"
+            written = write_docstore([("a-c0", "alpha text"), ("a-c1", "béta text " * 50)], directory)
+            docstore = ChunkDocstore(directory)
+            try:
+                self.assertEqual(written, 2)
+                self.assertEqual(len(docstore), 2)
+                self.assertEqual(docstore.get_many(["a-c1", "missing", "a-c0"]), ["béta text " * 50, None, "alpha text"])
+            finally:
+                docstore.close()
+
+    def test_specialists_search_without_text_and_hydrate_only_rerank_candidates(self):
+        config = AgentConfig(guardrails_enabled=False, rerank_candidate_limit=2)
+
+        class FakeResult:
+            def __init__(self, chunk_id, score):
+                self.score = score
+                self.entity = {"chunk_id": chunk_id, "source_path": "doc.pdf", "financial_year": 2025}
+
+        class FakeVector:
+            def astype(self, _):
+                return self
+
+            def tolist(self):
+                return [0.1, 0.2]
+
+        class FakeEmbedder:
+            def encode(self, texts, normalize_embeddings=True):
+                return [FakeVector()]
+
+        class RecordingDocstore:
+            def __init__(self):
+                self.requested = []
+
+            def get_many(self, chunk_ids):
+                self.requested.extend(chunk_ids)
+                return [f"text of {chunk_id}" for chunk_id in chunk_ids]
+
+        class FakeCrossEncoder:
+            def predict(self, pairs):
+                return [1.0 - idx / 10 for idx in range(len(pairs))]
+
+        output_text_flags = []
+
+        def fake_dense_search(collection, query_vector, top_k, year_expr, partition_names=None, output_text=True):
+            output_text_flags.append(output_text)
+            return [[FakeResult("c1", 0.9), FakeResult("c2", 0.8), FakeResult("c3", 0.7)]]
+
+        docstore = RecordingDocstore()
+        with (
+            patch.object(Specialists, "validate_ready", return_value=None),
+            patch("src.agents.specialists.retrieval.search_collection_dense", side_effect=fake_dense_search),
+        ):
+            specialists = Specialists(config)
+            specialists._get_embedder = lambda: FakeEmbedder()
+            specialists._get_collection = lambda: object()
+            specialists._get_bm25_encoder = lambda: None
+            specialists._get_docstore = lambda: docstore
+            specialists._get_cross_encoder = lambda: FakeCrossEncoder()
+            hits = specialists.retrieve("query", 3)
+            reranked = specialists.rerank("query", hits, top_n=2)
+
+        self.assertEqual(output_text_flags, [False])
+        self.assertEqual(hits.texts, ["", "", ""])
+        self.assertEqual(docstore.requested, ["c1", "c2"])
+        self.assertEqual(reranked.texts, ["text of c1", "text of c2"])
+
+
+class MilvusConnectionPoolTests(unittest.TestCase):
+    def _pool(self, collections, **kwargs):
+        connected: list[str] = []
+
+        def collection_factory(name, alias):
+            return collections.pop(0)
+
+        pool = MilvusConnectionPool(
+            collection_name="sg_budget_evidence",
+            uri="http://milvus",
+            token=None,
+            connect=lambda alias, uri, token, timeout: connected.append(alias),
+            disconnect=lambda alias: None,
+            collection_factory=collection_factory,
+            retryable_errors=(ConnectionError,),
+            **kwargs,
+        )
+        return pool, connected
+
+    def test_pool_reconnects_and_retries_dropped_channel(self):
+        class DroppedCollection:
+            def search(self, **kwargs):
+                raise ConnectionError("channel closed")
+
+        class HealthyCollection:
+            def __init__(self):
+                self.calls = []
+
+            def search(self, **kwargs):
+                self.calls.append(kwargs)
+                return [["ok"]]
+
+        healthy = HealthyCollection()
+        pool, connected = self._pool([DroppedCollection(), healthy], size=1, consistency_level="Strong")
+
+        self.assertEqual(pool.search(data=[[0.1]], limit=3), [["ok"]])
+        self.assertEqual(healthy.calls[0]["consistency_level"], "Strong")
+        self.assertEqual(connected, ["sg_budget_pool_0", "sg_budget_pool_0"])
+        stats = pool.stats()
+        self.assertEqual((stats["retries"], stats["reconnects"], stats["failures"]), (1, 1, 0))
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_pool_routes_load_through_reconnect_and_reconnects_a_shared_alias_once(self):
+        both_failing = threading.Barrier(2, timeout=5)
+
+        class DroppedCollection:
+            def load(self, partition_names=None):
+                raise ConnectionError("channel closed")
+
+            def search(self, **kwargs):
+                both_failing.wait()
+                raise ConnectionError("channel closed")
+
+        class HealthyCollection:
+            partitions = ["fy2025"]
+
+            def __init__(self):
+                self.loaded = []
+
+            def load(self, partition_names=None):
+                self.loaded.append(partition_names)
+
+            def search(self, **kwargs):
+                return [["ok"]]
+
+        healthy = HealthyCollection()
+        pool, connected = self._pool([DroppedCollection(), healthy], size=1, max_in_flight=2)
+        results = []
+        workers = [threading.Thread(target=lambda: results.append(pool.search(data=[[0.1]]))) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=5)
+        pool.load(partition_names=["fy2025"])
+
+        self.assertEqual(results, [[["ok"]], [["ok"]]])
+        self.assertEqual(connected, ["sg_budget_pool_0", "sg_budget_pool_0"])  # one reconnect for both failures
+        self.assertEqual(healthy.loaded, [["fy2025"]])
+        self.assertEqual(pool.partitions, ["fy2025"])
+        stats = pool.stats()
+        self.assertEqual((stats["retries"], stats["reconnects"], stats["in_flight"]), (2, 1, 0))
+
+    def test_pool_spreads_searches_and_bounds_in_flight(self):
+        release = threading.Event()
+        started = threading.Semaphore(0)
+
+        class BlockingCollection:
+            def search(self, **kwargs):
+                started.release()
+                release.wait(timeout=5)
+                return [[]]
+
+        pool, _ = self._pool(
+            [BlockingCollection(), BlockingCollection()],
+            size=2,
+            max_in_flight=2,
+            acquire_timeout_seconds=0.05,
+        )
+        workers = [threading.Thread(target=lambda: pool.search(data=[[0.1]])) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        started.acquire(timeout=5)
+        started.acquire(timeout=5)
+
+        stats = pool.stats()
+        self.assertEqual(stats["in_flight"], 2)
+        self.assertEqual(stats["saturation"], 1.0)
+        self.assertEqual(sorted(stats["in_flight_per_alias"].values()), [1, 1])
+        with self.assertRaises(MilvusPoolSaturatedError):
+            pool.search(data=[[0.1]])
+
+        release.set()
+        for worker in workers:
+            worker.join(timeout=5)
+        stats = pool.stats()
+        self.assertEqual((stats["in_flight"], stats["peak_in_flight"], stats["rejections"]), (0, 2, 1))
+
+
+class InferenceWorkerPoolTests(unittest.TestCase):
+    def test_workers_serve_embed_and_score_calls_and_report_utilisation(self):
+        pool = InferenceWorkerPool(workers=2, load_models=_fake_inference_models, start_method="fork", timeout_seconds=10)
+        try:
+            embedder, cross_encoder = RemoteEmbedder(pool), RemoteCrossEncoder(pool)
+            self.assertEqual(embedder.encode(["abc"], normalize_embeddings=True).tolist(), [[3.0, 0.0]])
+            self.assertEqual(cross_encoder.predict([("q", "ab"), ("q", "abcd")]).tolist(), [2.0, 4.0])
+            with self.assertRaisesRegex(RuntimeError, "bad pair"):
+                cross_encoder.predict([("q", "boom")])
+            stats = pool.stats()
+        finally:
+            pool.close()
+
+        self.assertEqual(len(stats["workers"]), 2)
+        self.assertEqual(sum(worker["completed"] for worker in stats["workers"]), 2)
+        self.assertEqual(sum(worker["failed"] for worker in stats["workers"]), 1)
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_scoring_uses_the_configured_batch_size_and_saturation_fails_fast(self):
+        pool = InferenceWorkerPool(
+            workers=1,
+            max_in_flight=1,
+            load_models=_batch_size_echo_models,
+            start_method="fork",
+            timeout_seconds=10,
+            acquire_timeout_seconds=0.05,
+            score_batch_size=4,
+        )
+        try:
+            self.assertEqual(pool.score([("q", str(idx)) for idx in range(10)]).tolist(), [4.0] * 10)
+            pool._semaphore.acquire()  # the only slot is taken by another caller
+            started = time.monotonic()
+            with self.assertRaises(InferencePoolSaturatedError):
+                pool.score([("q", "a")])
+            waited = time.monotonic() - started
+            pool._semaphore.release()
+            stats = pool.stats()
+        finally:
+            pool.close()
+
+        self.assertLess(waited, 1.0)
+        self.assertEqual(stats["rejections"], 1)
+
+    def test_crashed_worker_is_restarted_and_serves_the_next_call(self):
+        pool = InferenceWorkerPool(workers=1, load_models=_fake_inference_models, start_method="fork", timeout_seconds=10)
+        errors = []
+
+        def in_flight_call():
+            try:
+                pool.score([("q", "hang")])
+            except RuntimeError as exc:
+                errors.append((str(exc), time.monotonic()))
+
+        try:
+            caller = threading.Thread(target=in_flight_call)
+            caller.start()
+            while pool.stats()["in_flight"] != 1:
+                time.sleep(0.01)
+            process = pool._workers[0].process
+            process.terminate()
+            process.join(timeout=5)
+            crashed_at = time.monotonic()
+            self.assertEqual(pool.score([("q", "abc")]).tolist(), [3.0])
+            caller.join(timeout=5)
+            stats = pool.stats()
+        finally:
+            pool.close()
+
+        self.assertEqual(len(errors), 1)
+        self.assertIn("crashed", errors[0][0])
+        self.assertLess(errors[0][1] - crashed_at, 5)  # failed on restart, not after the 10s call timeout
+        self.assertEqual(stats["workers"][0]["restarts"], 1)
+        self.assertTrue(stats["workers"][0]["alive"])
+        self.assertEqual((stats["in_flight"], stats["workers"][0]["in_flight"]), (0, 0))
+
+
 class RuntimeTests(unittest.TestCase):
     def test_runtime_cli_fails_cleanly_when_mcp_not_ready(self):
         with patch("src.agents.runtime.Specialists", side_effect=MCPReadinessError("missing env vars")):